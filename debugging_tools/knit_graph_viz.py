@@ -1,14 +1,17 @@
 """A method for visualizing KnitGraphs as a graph structure, mostly for debugging"""
+from typing import Union
+
 from pyvis import network as nw
 
 from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Knit_Graph_View import Knit_Graph_View
 
 
-def visualize_knitGraph(knit_graph: Knit_Graph, display_name: str = "nx.html", height: float = 750, width: float = 1000):
+def visualize_knitGraph(knit_graph: Union[Knit_Graph, Knit_Graph_View], display_name: str = "nx.html", height: float = 750, width: float = 1000):
     """
     Runs an html file in browser to visualize the given knitgraph
     :param display_name: The html file name to display from
-    :param knit_graph: the knit graph to visualize
+    :param knit_graph: the knit graph, or a view of a region of a knit graph, to visualize
     :param height: the height of the html window
     :param width: the width of the html window
     """
@@ -0,0 +1,64 @@
+"""A benchmark comparing the memory used by different loop representations"""
+import tracemalloc
+from typing import Callable, Dict, List
+
+from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Loop import Loop
+from knit_graphs.Loop_Table import Loop_Table
+
+
+class _Dict_Loop:
+    """
+    The loop representation used before Loop had __slots__: a __dict__ per loop and its own parent list
+    """
+
+    def __init__(self, loop_id: int, yarn_id: str, is_twisted: bool = False):
+        self._is_twisted = is_twisted
+        self._loop_id: int = loop_id
+        self._yarn_id = yarn_id
+        self.parent_loops: List[_Dict_Loop] = []
+
+
+def _traced_bytes(build: Callable[[int], object], loop_count: int) -> int:
+    """
+    :param build: a function that creates loop_count loops and returns the structure that holds them
+    :param loop_count: the number of loops to create
+    :return: the number of bytes still allocated by the structure holding the loops
+    """
+    tracemalloc.start()
+    held = build(loop_count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def _dict_loops(loop_count: int) -> Dict[int, _Dict_Loop]:
+    return {loop_id: _Dict_Loop(loop_id, "yarn") for loop_id in range(0, loop_count)}
+
+
+def _slotted_loops(loop_count: int) -> Dict[int, Loop]:
+    return {loop_id: Loop(loop_id, "yarn") for loop_id in range(0, loop_count)}
+
+
+def _loop_table(loop_count: int) -> Loop_Table:
+    table = Loop_Table(Knit_Graph())
+    for loop_id in range(0, loop_count):
+        table.add_loop(Loop(loop_id, "yarn"))
+    return table
+
+
+def compare_loop_memory(loop_count: int = 100000) -> Dict[str, int]:
+    """
+    :param loop_count: the number of loops to store in each representation
+    :return: the representation names mapped to the bytes each uses to hold loop_count loops
+    """
+    return {"dict loops": _traced_bytes(_dict_loops, loop_count),
+            "slotted loops": _traced_bytes(_slotted_loops, loop_count),
+            "loop table": _traced_bytes(_loop_table, loop_count)}
+
+
+if __name__ == "__main__":
+    count = 100000
+    for representation, byte_count in compare_loop_memory(count).items():
+        print(f"{representation}: {byte_count} bytes, {byte_count / count:.1f} bytes per loop")
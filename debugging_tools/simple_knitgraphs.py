@@ -1,33 +1,53 @@
-"""A set of functions that generate simple knit-graph structures useful for debugging"""
+"""
+A set of functions that generate simple knit-graph structures useful for debugging.
+Each swatch is built a course at a time: the parents, pull directions, depths, and offsets of a course are computed
+ as columns from the loop ids of the course below it, then loaded with Knit_Graph.add_course
+"""
+from typing import List, Sequence, Union
+
 from knit_graphs.Knit_Graph import Knit_Graph, Pull_Direction
 from knit_graphs.Yarn import Yarn
 
 
+def _swatch_graph(width: int) -> Knit_Graph:
+    """
+    :param width: the number of loops in the first course
+    :return: a knit graph with one yarn on carrier 3 and a first course of width loops
+    """
+    knit_graph = Knit_Graph()
+    knit_graph.add_yarn(Yarn("yarn", knit_graph, carrier_id=3))
+    knit_graph.add_course([None] * width)
+    return knit_graph
+
+
+def _last_course(knit_graph: Knit_Graph, width: int) -> range:
+    """
+    :param knit_graph: a swatch whose courses are width loops wide
+    :param width: the width of the swatch
+    :return: the ids of the loops of the last course in yarn order
+    """
+    return range(knit_graph.last_loop_id + 1 - width, knit_graph.last_loop_id + 1)
+
+
+def _alternating(first: Pull_Direction, flips: Sequence[int]) -> List[Pull_Direction]:
+    """
+    :param first: the pull direction before any flip
+    :param flips: the number of times each loop's pull direction is flipped
+    :return: the pull direction of each loop
+    """
+    directions = (first, first.opposite())
+    return [directions[flip % 2] for flip in flips]
+
+
 def stockinette(width: int = 4, height: int = 4) -> Knit_Graph:
     """
     :param width: the number of stitches of the swatch
     :param height:  the number of courses of the swatch
     :return: a knitgraph of stockinette on one yarn of width stitches by height course
     """
-    knitGraph = Knit_Graph()
-    yarn = Yarn("yarn", knitGraph, carrier_id=3)
-    knitGraph.add_yarn(yarn)
-    first_row = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_row.append(loop_id)
-        knitGraph.add_loop(loop)
-
-    prior_row = first_row
+    knitGraph = _swatch_graph(width)
     for _ in range(1, height):
-        next_row = []
-        for parent_id in reversed(prior_row):
-            child_id, child = yarn.add_loop_to_end()
-            next_row.append(child_id)
-            knitGraph.add_loop(child)
-            knitGraph.connect_loops(parent_id, child_id)
-        prior_row = next_row
-
+        knitGraph.add_course(_last_course(knitGraph, width)[::-1])
     return knitGraph
 
 
@@ -43,36 +63,14 @@ def rib(width: int = 4, height: int = 4, rib_width: int = 1) -> Knit_Graph:
     assert height > 1
     assert rib_width <= width
 
-    knit_graph = Knit_Graph()
-    yarn = Yarn("yarn", knit_graph)
-    knit_graph.add_yarn(yarn)
-
-    # make the first set of loops on the bottom (0th) course
-    first_course = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_course.append(loop_id)
-        knit_graph.add_loop(loop)
-
-    # make new course of loops and connect them to the last course in ribs
-    prior_course = first_course
-    pd = Pull_Direction.FtB
+    knit_graph = _swatch_graph(width)
+    # the pull direction flips after every rib_width loops of a course and again at the end of each course
+    rib_flips = [loop_index // rib_width for loop_index in range(0, width)]
+    flips_per_course = width // rib_width + 1
     for row in range(1, height):
-        next_course = []
-        idx = 0
-        for parent_id in reversed(prior_course):
-            child_id, child = yarn.add_loop_to_end()
-            next_course.append(child_id)
-            knit_graph.add_loop(child)
-            idx += 1
-            knit_graph.connect_loops(parent_id, child_id, pull_direction=pd)
-            # check when we should turn knits into purls or purls into knits
-            if idx == rib_width:
-                pd = Pull_Direction.opposite(pd)
-                idx = 0
-        prior_course = next_course
-        pd = Pull_Direction.opposite(pd)
-
+        first_flip = (row - 1) * flips_per_course
+        pull_directions = _alternating(Pull_Direction.FtB, [first_flip + flips for flips in rib_flips])
+        knit_graph.add_course(_last_course(knit_graph, width)[::-1], pull_directions=pull_directions)
     return knit_graph
 
 
@@ -86,31 +84,24 @@ def seed(width: int = 4, height=4) -> Knit_Graph:
     assert width > 0
     assert height > 0
 
-    knit_graph = Knit_Graph()
-    yarn = Yarn("yarn", knit_graph)
-    knit_graph.add_yarn(yarn)
+    knit_graph = _swatch_graph(width)
+    # the pull direction flips after every loop, continuing from one course to the next
+    first = Pull_Direction.FtB if width % 2 == 1 else Pull_Direction.BtF
+    for row in range(1, height):
+        pull_directions = _alternating(first, range((row - 1) * width, row * width))
+        knit_graph.add_course(_last_course(knit_graph, width)[::-1], pull_directions=pull_directions)
+    return knit_graph
 
-    # make the first set of loops on the bottom (0th) course
-    first_course = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_course.append(loop_id)
-        knit_graph.add_loop(loop)
 
-    # make new course of loops and connect them to the last course in seeds
-    prior_course = first_course
-    pd = Pull_Direction.FtB if width % 2 == 1 else Pull_Direction.BtF
-    for _ in range(1, height):
-        next_course = []
-        for parent_id in reversed(prior_course):
-            child_id, child = yarn.add_loop_to_end()
-            next_course.append(child_id)
-            knit_graph.add_loop(child)
-            knit_graph.connect_loops(parent_id, child_id, pull_direction=pd)
-            pd = Pull_Direction.opposite(pd)
-        prior_course = next_course
+def _crossed_course(prior_course: range, columns: Sequence[int]) -> List[int]:
+    """
+    :param prior_course: the loop ids of the prior course in yarn order
+    :param columns: for each new loop, the position of its parent in the reversed prior course
+    :return: the parent id of each new loop
+    """
+    reversed_prior_course = prior_course[::-1]
+    return [reversed_prior_course[column] for column in columns]
 
-    return knit_graph
 
 def twisted_stripes(width: int = 4, height=5, left_twists: bool = True) -> Knit_Graph:
     """
@@ -120,152 +111,73 @@ def twisted_stripes(width: int = 4, height=5, left_twists: bool = True) -> Knit_
     :return: A knitgraph with repeating pattern of twisted stitches surrounded by knit wales
     """
     assert width % 4 == 0, "Pattern is 4 loops wide"
-    knitGraph = Knit_Graph()
-    yarn = Yarn("yarn", knitGraph)
-    knitGraph.add_yarn(yarn)
-
-    # Add the first course of loops
-    first_course = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_course.append(loop_id)
-        knitGraph.add_loop(loop)
-
-    def add_loop_and_knit(p_id, depth=0, parent_offset: int = 0):
-        """
-        adds a loop by knitting to the knitgraph
-        :param parent_offset: Set the offset of the parent loop in the cable. offset = parent_index - child_index
-        :param p_id: the parent loop's id
-        :param depth: the crossing-depth to knit at
-        """
-        child_id, child = yarn.add_loop_to_end()
-        next_course.append(child_id)
-        knitGraph.add_loop(child)
-        knitGraph.connect_loops(p_id, child_id, depth=depth, parent_offset=parent_offset)
-
-    if left_twists:  # set the depth for the first loop in the twist (1 means it will cross in front of other stitches)
-        twist_depth = 1
-    else:
-        twist_depth = -1
-
-    # add new courses
-    prior_course = first_course
+    knitGraph = _swatch_graph(width)
+    # the depth of the first loop in each twist (1 means it will cross in front of other stitches)
+    twist_depth = 1 if left_twists else -1
+    # on odd courses, knit before and after twists; the middle two loops of every 4 swap parents
+    swaps = [0, 1, -1, 0]
+    twist_columns = [col + swaps[col % 4] for col in range(0, width)]
+    twist_depths = [0, twist_depth, -twist_depth, 0] * (width // 4)
     for course in range(1, height):
-        next_course = []
-        reversed_prior_course = [*reversed(prior_course)]
-        for col, parent_id in enumerate(reversed_prior_course):
-            if course % 2 == 0 or col % 4 == 0 or col % 4 == 3:  # knit on even rows and before and after twists
-                add_loop_and_knit(parent_id)
-            elif col % 4 == 1:
-                next_parent_id = reversed_prior_course[col + 1]
-                add_loop_and_knit(next_parent_id, depth=twist_depth, parent_offset=1)
-                twist_depth = -1 * twist_depth  # switch depth for neighbor
-            elif col % 4 == 2:
-                next_parent_id = reversed_prior_course[col - 1]
-                add_loop_and_knit(next_parent_id, depth=twist_depth, parent_offset=-1)
-                twist_depth = -1 * twist_depth  # switch depth for next twist
-        prior_course = next_course
-
+        prior_course = _last_course(knitGraph, width)
+        if course % 2 == 0:
+            knitGraph.add_course(prior_course[::-1])
+        else:
+            knitGraph.add_course(_crossed_course(prior_course, twist_columns), depths=twist_depths,
+                                 parent_offsets=swaps * (width // 4))
     return knitGraph
 
-def both_twists(height=20) -> Knit_Graph:
+
+def lace(width: int = 4, height: int = 4):
     """
-    :param left_twists: if True, make the left leaning stitches in front, otherwise right leaning stitches in front
     :param width: the number of stitches of the swatch
     :param height:  the number of courses of the swatch
-    :return: A knitgraph with repeating pattern of twisted stitches surrounded by knit wales
+    :return: a knitgraph with k2togs and yarn-overs surrounded by knit wales
     """
-    width = 10
-    knitGraph = Knit_Graph()
-    yarn = Yarn("yarn", knitGraph)
-    knitGraph.add_yarn(yarn)
-
-    # Add the first course of loops
-    first_course = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_course.append(loop_id)
-        knitGraph.add_loop(loop)
-
-    def add_loop_and_knit(p_id, depth=0, parent_offset: int = 0):
-        """
-        adds a loop by knitting to the knitgraph
-        :param parent_offset: Set the offset of the parent loop in the cable. offset = parent_index - child_index
-        :param p_id: the parent loop's id
-        :param depth: the crossing- depth to knit at
-        """
-        child_id, child = yarn.add_loop_to_end()
-        next_course.append(child_id)
-        knitGraph.add_loop(child)
-        knitGraph.connect_loops(p_id, child_id, depth=depth, parent_offset=parent_offset)
-
-    # add new courses
-    prior_course = first_course
-    for course in range(1, height):
-        next_course = []
-        reversed_prior_course = [*reversed(prior_course)]
-        for col, parent_id in enumerate(reversed_prior_course):
-            if course % 2 == 1 or col in {0, 1, 4, 5,8, 9}:  # knit on odd rows and borders or middle
-                add_loop_and_knit(parent_id)
-            elif col == 2:
-                parent_id = reversed_prior_course[3]
-                add_loop_and_knit(parent_id, depth=-1, parent_offset=-1)
-            elif col == 3:
-                parent_id = reversed_prior_course[2]
-                add_loop_and_knit(parent_id, depth=1, parent_offset=1)
-            elif col == 6:
-                parent_id = reversed_prior_course[7]
-                add_loop_and_knit(parent_id, depth=1, parent_offset=-1)
-            elif col == 7:
-                parent_id = reversed_prior_course[6]
-                add_loop_and_knit(parent_id, depth=-1, parent_offset=1)
-        prior_course = next_course
-
+    knitGraph = _swatch_graph(width)
+    # on odd courses, every 4 columns are a knit, a yarn-over, a k2tog of the two middle parents, and a knit
+    lace_parents: List[Union[None, int, List[int]]] = []
+    lace_offsets: List[Union[int, List[int]]] = []
+    for col in range(0, width):
+        if col % 4 == 1:
+            lace_parents.append(None)
+            lace_offsets.append(0)
+        elif col % 4 == 2:
+            lace_parents.append([col, col - 1])
+            lace_offsets.append([0, -1])
+        else:
+            lace_parents.append(col)
+            lace_offsets.append(0)
+    for row in range(1, height):
+        prior_course = _last_course(knitGraph, width)
+        if row % 2 == 0:
+            knitGraph.add_course(prior_course[::-1])
+        else:
+            reversed_prior_course = prior_course[::-1]
+            parent_ids = [None if parents is None
+                          else [reversed_prior_course[col] for col in parents] if type(parents) is list
+                          else reversed_prior_course[parents] for parents in lace_parents]
+            knitGraph.add_course(parent_ids, parent_offsets=lace_offsets)
     return knitGraph
 
-def lace(width: int = 4, height: int = 4):
+def both_twists(height=20) -> Knit_Graph:
     """
+    :param left_twists: if True, make the left leaning stitches in front, otherwise right leaning stitches in front
     :param width: the number of stitches of the swatch
     :param height:  the number of courses of the swatch
-    :return: a knitgraph with k2togs and yarn-overs surrounded by knit wales
+    :return: A knitgraph with repeating pattern of twisted stitches surrounded by knit wales
     """
-    knitGraph = Knit_Graph()
-    yarn = Yarn("yarn", knitGraph)
-    knitGraph.add_yarn(yarn)
-    first_row = []
-    for _ in range(0, width):
-        loop_id, loop = yarn.add_loop_to_end()
-        first_row.append(loop_id)
-        knitGraph.add_loop(loop)
-
-    def add_loop_and_knit(p_id, offset: int = 0):
-        """
-        Knits a loop into the graph
-        :param p_id: the id of the parent loop being knit through
-        :return: the id of the child loop created
-        """
-        c_id, c = yarn.add_loop_to_end()
-        next_row.append(c_id)
-        knitGraph.add_loop(c)
-        knitGraph.connect_loops(p_id, c_id, pull_direction=Pull_Direction.BtF, parent_offset=offset)
-        return c_id
-
-    prior_row = first_row
-    for row in range(1, height):
-        next_row = []
-        prior_parent_id = -1
-        reversed_prior_row = [*reversed(prior_row)]
-        for col, parent_id in enumerate(reversed_prior_row):
-            if row % 2 == 0 or col % 4 == 0 or col % 4 == 3:  # knit on even rows and before and after twists
-                add_loop_and_knit(parent_id)
-            elif col % 4 == 1:
-                child_id, child = yarn.add_loop_to_end()
-                knitGraph.add_loop(child)
-                next_row.append(child_id)  # yarn over
-                prior_parent_id = parent_id
-            elif col % 4 == 2:
-                child_id = add_loop_and_knit(parent_id)
-                knitGraph.connect_loops(prior_parent_id, child_id, parent_offset=-1)
-        prior_row = next_row
-
+    width = 10
+    knitGraph = _swatch_graph(width)
+    # on even courses, knit the borders and middle; columns 2 and 3 and columns 6 and 7 swap parents
+    twist_columns = [0, 1, 3, 2, 4, 5, 7, 6, 8, 9]
+    twist_depths = [0, 0, -1, 1, 0, 0, 1, -1, 0, 0]
+    twist_offsets = [0, 0, -1, 1, 0, 0, -1, 1, 0, 0]
+    for course in range(1, height):
+        prior_course = _last_course(knitGraph, width)
+        if course % 2 == 1:
+            knitGraph.add_course(prior_course[::-1])
+        else:
+            knitGraph.add_course(_crossed_course(prior_course, twist_columns), depths=twist_depths,
+                                 parent_offsets=twist_offsets)
     return knitGraph
@@ -0,0 +1,30 @@
+"""Helpers for the fixed-width columns that back the storage of a knit graph"""
+from array import array
+from typing import Union
+
+Column = Union[array, memoryview]
+
+
+def writable_column(column: Column) -> array:
+    """
+    Columns loaded from a file are read-only memoryviews over the mapped file.
+    Storage copies them into arrays the first time the knit graph is modified
+    :param column: an array or a memoryview of a column
+    :return: the column if it is an array, otherwise an array holding a copy of the column
+    """
+    if isinstance(column, array):
+        return column
+    copy = array(column.format)
+    copy.frombytes(column.cast("B"))
+    return copy
+
+
+def copy_column(column: Column) -> array:
+    """
+    Columns shared between forks of a knit graph, or with a loaded file, are copied before a graph modifies them
+    :param column: an array or a memoryview of a column
+    :return: an array holding a copy of the column
+    """
+    if isinstance(column, array):
+        return column[:]
+    return writable_column(column)
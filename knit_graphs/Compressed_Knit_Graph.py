@@ -0,0 +1,213 @@
+"""A knit graph that stores a repeated block of courses once and expands it on demand"""
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Pull_Direction import Pull_Direction
+
+
+class Compressed_Knit_Graph:
+    """
+    A class to represent a knit graph whose courses repeat, such as most KnitSpeak patterns, without creating every loop.
+    The explicit prefix graph ends with one copy of the repeated block: its last stride loops.
+    The block is repeated repeat_count more times, and then the first tail_loop_count loops of the block are repeated
+     once more for patterns that stop part way through a repeat.
+    Each repeat of a loop has the id of the loop in the block plus a multiple of the stride,
+     and its parents are the parents of the block loop shifted by the same multiple of the stride.
+    The explicit loops are only created when expand() is called
+    ...
+
+    Attributes
+    ----------
+    prefix: Knit_Graph
+        The explicit knit graph, ending with one copy of the repeated block
+    stride: int
+        The number of loops in the repeated block, the difference between the ids of a loop and its next repeat
+    repeat_count: int
+        The number of repeats of the block after the copy in the prefix
+    tail_loop_count: int
+        The number of loops from the start of the block that are repeated after the last full repeat
+    """
+
+    def __init__(self, prefix: Knit_Graph, stride: int = 0, repeat_count: int = 0, tail_loop_count: int = 0):
+        """
+        :param prefix: the explicit knit graph that ends with one copy of the repeated block
+        :param stride: the number of loops at the end of the prefix that form the repeated block
+        :param repeat_count: the number of times the block repeats after the prefix
+        :param tail_loop_count: the number of loops of the block repeated after the last full repeat
+        """
+        assert 0 <= stride <= len(prefix.loops), f"The repeated block of {stride} loops is larger than the prefix"
+        assert 0 <= tail_loop_count < max(stride, 1), f"A tail of {tail_loop_count} loops is not part of a repeat"
+        assert stride > 0 or repeat_count == 0, "Only a block of loops can be repeated"
+        self.prefix: Knit_Graph = prefix
+        self.stride: int = stride
+        self.repeat_count: int = repeat_count
+        self.tail_loop_count: int = tail_loop_count
+        self._expanded: Optional[Knit_Graph] = None
+
+    @staticmethod
+    def repeats_block(knit_graph: Knit_Graph, stride: int) -> bool:
+        """
+        :param knit_graph: a knit graph with at least two copies of a block of loops at its end
+        :param stride: the number of loops in the block
+        :return: True if the last stride loops of the knit graph are the stride loops before them shifted by stride:
+         the same stitches, twists, and yarn, with every parent shifted by the stride
+        """
+        block_start = knit_graph.last_loop_id + 1 - stride
+        if stride <= 0 or block_start - stride < 0 or len(knit_graph.loops) != knit_graph.last_loop_id + 1:
+            return False
+        block = range(block_start, block_start + stride)
+        prior_block = range(block_start - stride, block_start)
+        loops = knit_graph.loops
+        if loops.loop_twists[block.start:block.stop] != loops.loop_twists[prior_block.start:prior_block.stop] \
+                or loops.loop_yarns[block.start:block.stop] != loops.loop_yarns[prior_block.start:prior_block.stop]:
+            return False
+        stitches = knit_graph.stitches.edges_into(block)
+        prior_stitches = knit_graph.stitches.edges_into(prior_block)
+        if stitches.child_starts != prior_stitches.child_starts or stitches.offsets != prior_stitches.offsets \
+                or stitches.pull_directions != prior_stitches.pull_directions \
+                or stitches.depths != prior_stitches.depths:
+            return False
+        return all(parent_id == prior_parent_id + stride
+                   for parent_id, prior_parent_id in zip(stitches.parent_ids, prior_stitches.parent_ids))
+
+    @property
+    def block_start(self) -> int:
+        """
+        :return: the id of the first loop of the copy of the repeated block in the prefix
+        """
+        return self.prefix.last_loop_id + 1 - self.stride
+
+    @property
+    def last_loop_id(self) -> int:
+        """
+        :return: the id of the last loop in the expanded knit graph
+        """
+        return self.prefix.last_loop_id + self.repeat_count * self.stride + self.tail_loop_count
+
+    def __len__(self) -> int:
+        """
+        :return: the number of loops in the expanded knit graph
+        """
+        return len(self.prefix.loops) + self.repeat_count * self.stride + self.tail_loop_count
+
+    def __contains__(self, loop_id: int) -> bool:
+        """
+        :param loop_id: the id of a loop
+        :return: True if the loop is in the expanded knit graph
+        """
+        if loop_id in self.prefix.loops:
+            return True
+        return type(loop_id) is int and self.prefix.last_loop_id < loop_id <= self.last_loop_id
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        :return: iterator over the ids of the loops in the expanded knit graph without expanding it
+        """
+        yield from self.prefix.loops
+        yield from range(self.prefix.last_loop_id + 1, self.last_loop_id + 1)
+
+    def source_loop(self, loop_id: int) -> Tuple[int, int]:
+        """
+        :param loop_id: the id of a loop in the expanded knit graph
+        :return: the id of the loop in the prefix that this loop repeats and the shift from that loop's id
+        """
+        if loop_id not in self:
+            raise KeyError(loop_id)
+        if loop_id <= self.prefix.last_loop_id:
+            return loop_id, 0
+        repeat, block_position = divmod(loop_id - self.prefix.last_loop_id - 1, self.stride)
+        shift = (repeat + 1) * self.stride
+        return self.block_start + block_position, shift
+
+    def parent_ids(self, loop_id: int) -> List[int]:
+        """
+        :param loop_id: the id of a loop in the expanded knit graph
+        :return: the ids of its parent loops in stack order, without expanding the knit graph
+        """
+        source_id, shift = self.source_loop(loop_id)
+        return [parent_id + shift for parent_id in self.prefix.stitches.parent_ids(source_id)]
+
+    def expand(self) -> Knit_Graph:
+        """
+        Creates the explicit knit graph on first use; the prefix is shared with the expansion until either is modified
+        :return: the explicit knit graph with every repeat of the block
+        """
+        if self._expanded is None:
+            knit_graph = self.prefix.fork()
+            if self.repeat_count > 0 or self.tail_loop_count > 0:
+                segments = self._block_segments()
+                for repeat in range(1, self.repeat_count + 1):
+                    for segment in segments:
+                        self._add_segment(knit_graph, segment, repeat * self.stride)
+                tail_stop = self.block_start + self.tail_loop_count
+                for segment in segments:
+                    if segment[0].start < tail_stop:
+                        self._add_segment(knit_graph, self._truncate_segment(segment, tail_stop),
+                                          (self.repeat_count + 1) * self.stride)
+            self._expanded = knit_graph
+        return self._expanded
+
+    def _block_segments(self) -> List[tuple]:
+        """
+        Splits the block at its course starts so that each segment can be added to a knit graph by add_course
+        :return: for each segment, the ids of its loops and the add_course arguments that recreate them
+        """
+        prefix = self.prefix
+        block = range(self.block_start, self.prefix.last_loop_id + 1)
+        starts = sorted({block.start, *[start for start in prefix.course_index.course_starts if start in block]})
+        stitches = prefix.stitches.edges_into(block)
+        segments = []
+        for start, stop in zip(starts, [*starts[1:], block.stop]):
+            parent_ids = []
+            offsets = []
+            pull_directions = []
+            depths = []
+            for index in range(start - block.start, stop - block.start):
+                first_edge, stop_edge = stitches.child_starts[index], stitches.child_starts[index + 1]
+                parent_ids.append(stitches.parent_ids[first_edge:stop_edge])
+                offsets.append(stitches.offsets[first_edge:stop_edge])
+                if stop_edge > first_edge:
+                    pull_directions.append(Pull_Direction.from_code(stitches.pull_directions[first_edge]))
+                    depths.append(stitches.depths[first_edge])
+                else:  # yarn-over
+                    pull_directions.append(Pull_Direction.BtF)
+                    depths.append(0)
+            twists = [twist == 1 for twist in prefix.loops.loop_twists[start:stop]]
+            if all(len(parents) == 1 for parents in parent_ids) and len({offset[0] for offset in offsets}) == 1 \
+                    and len(set(pull_directions)) == 1 and len(set(depths)) == 1:
+                # a course of the same single-parent stitch is added through the fast path of add_course
+                parent_ids = array("i", [parents[0] for parents in parent_ids])
+                offsets, pull_directions, depths = offsets[0][0], pull_directions[0], depths[0]
+            segments.append((range(start, stop), parent_ids, offsets, pull_directions, depths, twists,
+                             prefix.loops.yarn_id(start)))
+        return segments
+
+    @staticmethod
+    def _truncate_segment(segment: tuple, stop: int) -> tuple:
+        """
+        :param segment: a segment of the block
+        :param stop: the id after the last loop of the block to keep
+        :return: the segment without the loops at or after stop
+        """
+        loop_ids = segment[0]
+        count = max(0, min(stop, loop_ids.stop) - loop_ids.start)
+        return (loop_ids[:count], *[values[:count] if isinstance(values, (list, array)) else values
+                                    for values in segment[1:6]], segment[6])
+
+    @staticmethod
+    def _add_segment(knit_graph: Knit_Graph, segment: tuple, shift: int):
+        """
+        Adds a repeat of a segment of the block to the end of the knit graph
+        :param knit_graph: the knit graph being expanded
+        :param segment: the segment of the block
+        :param shift: the difference between the ids of the repeated loops and the loops in the block
+        """
+        loop_ids, parent_ids, offsets, pull_directions, depths, twists, yarn_id = segment
+        assert knit_graph.last_loop_id + 1 == loop_ids.start + shift, "Repeats must be added in order"
+        if isinstance(parent_ids, array):
+            shifted_parents = array("i", [parent_id + shift for parent_id in parent_ids])
+        else:
+            shifted_parents = [array("i", [parent_id + shift for parent_id in parents]) for parents in parent_ids]
+        knit_graph.add_course(shifted_parents, parent_offsets=offsets, pull_directions=pull_directions,
+                              depths=depths, is_twisted=twists, yarn_id=yarn_id)
@@ -0,0 +1,233 @@
+"""An incrementally maintained index of the courses in a knit graph"""
+from array import array
+from typing import Iterator, Mapping, Sequence, Tuple
+
+from knit_graphs.Columns import copy_column
+
+NO_COURSE = -1
+
+
+class Course_Index:
+    """
+    A class to maintain the loop-to-course and course-to-loops mappings of a knit graph as loops are added and connected.
+    The first set of loops in the graph is on course 0.
+    A course change occurs when a loop has a parent loop that is in the current (last) course.
+    Since loops are created in course order, each course is a run of consecutive loop ids starting at its first loop
+    ...
+
+    Attributes
+    ----------
+    course_starts: array
+        The id of the first loop in each course, indexed by course
+    loop_courses: array
+        The course of each loop, indexed by loop id. NO_COURSE if there is no loop at that id
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph to index
+        """
+        self._knit_graph = knit_graph
+        self.course_starts: array = array("i")
+        self.loop_courses: array = array("i")
+        self._last_loop_id: int = -1
+        self._stale: bool = False
+        self._shared: bool = False  # True while the columns are shared with a loaded file or a fork
+
+    def _copy_shared_columns(self):
+        """
+        Replaces columns shared with a loaded file or a fork with private copies before the index is modified
+        """
+        self.course_starts = copy_column(self.course_starts)
+        self.loop_courses = copy_column(self.loop_courses)
+        self._shared = False
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this index's knit graph
+        :return: a copy of this index for the forked knit graph that shares its columns until either index is modified
+        """
+        fork = Course_Index(knit_graph)
+        fork.course_starts = self.course_starts
+        fork.loop_courses = self.loop_courses
+        fork._last_loop_id = self._last_loop_id
+        fork._stale = self._stale
+        fork._shared = self._shared = True
+        return fork
+
+    def add_loop(self, loop_id: int):
+        """
+        Places a new loop at the end of the current course
+        :param loop_id: the id of the loop added to the knit graph
+        """
+        if self._stale:
+            return
+        if loop_id <= self._last_loop_id:  # loops added out of order are indexed by a rebuild
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        missing = loop_id + 1 - len(self.loop_courses)
+        self.loop_courses.extend(array("i", [NO_COURSE]) * missing)
+        if len(self.course_starts) == 0:
+            self.course_starts.append(loop_id)
+        self.loop_courses[loop_id] = len(self.course_starts) - 1
+        self._last_loop_id = loop_id
+
+    def add_loops(self, loop_ids: range):
+        """
+        Indexes a block of new loops whose stitch edges are already in the knit graph.
+        Parents are older than the block, so at most one course change happens in the block:
+         at the first loop with a parent in the current course
+        :param loop_ids: the ids of the new loops in the order of creation
+        """
+        if self._stale:
+            return
+        if len(loop_ids) == 0:
+            return
+        if loop_ids.start <= self._last_loop_id or loop_ids.step != 1:
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        if len(self.course_starts) == 0:
+            self.course_starts.append(loop_ids.start)
+        course = len(self.course_starts) - 1
+        course_change = loop_ids.stop
+        stitches = self._knit_graph.stitches
+        for loop_id in loop_ids:
+            if any(self.loop_courses[parent_id] == course for parent_id in stitches.parent_ids(loop_id)
+                   if parent_id < loop_ids.start):
+                course_change = loop_id
+                break
+        self.loop_courses.extend(array("i", [NO_COURSE]) * (loop_ids.start - len(self.loop_courses)))
+        self.loop_courses.extend(array("i", [course]) * (course_change - loop_ids.start))
+        if course_change < loop_ids.stop:
+            self.course_starts.append(course_change)
+            self.loop_courses.extend(array("i", [course + 1]) * (loop_ids.stop - course_change))
+        self._last_loop_id = loop_ids.stop - 1
+
+    def add_stitch(self, parent_id: int, child_id: int):
+        """
+        Starts a new course at the child loop if the parent loop is in the child's course
+        :param parent_id: the id of the parent loop
+        :param child_id: the id of the child loop
+        """
+        if self._stale:
+            return
+        if child_id != self._last_loop_id or parent_id >= child_id:
+            # a stitch into an earlier loop can change the courses of every loop after it
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        course = self.loop_courses[child_id]
+        if self.loop_courses[parent_id] == course and self.course_starts[course] != child_id:
+            self.course_starts.append(child_id)
+            self.loop_courses[child_id] = course + 1
+
+    def loop_changed(self, loop_id: int):
+        """
+        Invalidates the index, it is rebuilt in one pass when it is next read
+         since removing loops and stitches can merge courses
+        :param loop_id: the id of a loop removed from the knit graph or whose parent stitches were removed
+        """
+        self._stale = True
+
+    def _refresh(self):
+        """
+        Rebuilds the index in one pass over the loops if it was invalidated
+        """
+        if not self._stale:
+            return
+        self.course_starts = array("i")
+        self.loop_courses = array("i")
+        self._last_loop_id = -1
+        self._stale = False
+        self._shared = False
+        stitches = self._knit_graph.stitches
+        for loop_id in self._knit_graph.loops:
+            self.add_loop(loop_id)
+            for parent_id in stitches.parent_ids(loop_id):
+                if parent_id < loop_id:
+                    self.add_stitch(parent_id, loop_id)
+
+    def columns(self) -> Tuple[array, array]:
+        """
+        :return: the course_starts and loop_courses columns, rebuilt first if the index was invalidated
+        """
+        self._refresh()
+        return self.course_starts, self.loop_courses
+
+    @property
+    def course_count(self) -> int:
+        """
+        :return: the number of courses in the knit graph
+        """
+        self._refresh()
+        return len(self.course_starts)
+
+    def course_of(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph
+        :return: the course the loop is on
+        """
+        self._refresh()
+        course = self.loop_courses[loop_id] if 0 <= loop_id < len(self.loop_courses) else NO_COURSE
+        if course == NO_COURSE:
+            raise KeyError(loop_id)
+        return course
+
+    def course_loop_ids(self, course: int) -> Sequence[int]:
+        """
+        :param course: the course to get loops from
+        :return: the ids of the loops on the course in the order of creation
+        """
+        self._refresh()
+        if not 0 <= course < len(self.course_starts):
+            raise KeyError(course)
+        start = self.course_starts[course]
+        if course + 1 < len(self.course_starts):
+            stop = self.course_starts[course + 1]
+        else:
+            stop = self._last_loop_id + 1
+        if len(self._knit_graph.loops) == len(self.loop_courses):  # loop ids are dense
+            return range(start, stop)
+        return [loop_id for loop_id in range(start, stop) if self.loop_courses[loop_id] != NO_COURSE]
+
+
+class Loop_Course_Map(Mapping):
+    """
+    A read-only mapping of loop ids to the course they are on
+    """
+
+    def __init__(self, course_index: Course_Index):
+        self._course_index: Course_Index = course_index
+
+    def __getitem__(self, loop_id: int) -> int:
+        return self._course_index.course_of(loop_id)
+
+    def __iter__(self) -> Iterator[int]:
+        self._course_index._refresh()
+        return iter(self._course_index._knit_graph.loops)
+
+    def __len__(self) -> int:
+        return len(self._course_index._knit_graph.loops)
+
+
+class Course_Loops_Map(Mapping):
+    """
+    A read-only mapping of course ids to the loops on that course in the order of creation
+    """
+
+    def __init__(self, course_index: Course_Index):
+        self._course_index: Course_Index = course_index
+
+    def __getitem__(self, course: int) -> Sequence[int]:
+        return self._course_index.course_loop_ids(course)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(0, self._course_index.course_count))
+
+    def __len__(self) -> int:
+        return self._course_index.course_count
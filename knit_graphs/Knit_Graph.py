@@ -1,28 +1,22 @@
 """The graph structure used to represent knitted objects"""
-from enum import Enum
-from typing import Dict, Optional, List, Tuple, Union
-
-import networkx
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
+from knit_graphs.Course_Index import Course_Index, Course_Loops_Map, Loop_Course_Map
+from knit_graphs.Knit_Graph_Statistics import Knit_Graph_Statistics
+from knit_graphs.Knit_Graph_Validator import Graph_Diagnostic, Knit_Graph_Validator
+from knit_graphs.Knit_Graph_View import Knit_Graph_View
 from knit_graphs.Loop import Loop
+from knit_graphs.Loop_Table import Loop_Table, NO_YARN
+from knit_graphs.Motif_Index import Course_Motifs, Motif_Index
+from knit_graphs.Pull_Direction import Pull_Direction
+from knit_graphs.Stitch_Graph_View import Stitch_Graph_View
+from knit_graphs.Stitch_Storage import Stitch_Slice, Stitch_Storage
+from knit_graphs.Structural_Hash import Structural_Hash
+from knit_graphs.Wale_Index import NO_LOOP, Wale_Index
 from knit_graphs.Yarn import Yarn
 
 
-class Pull_Direction(Enum):
-    """An enumerator of the two pull directions of a loop"""
-    BtF = "BtF" # purl
-    FtB = "FtB" # knit
-
-    def opposite(self):
-        """
-        :return: returns the opposite pull direction of self
-        """
-        if self is Pull_Direction.BtF:
-            return Pull_Direction.FtB
-        else:
-            return Pull_Direction.BtF
-
-
 class Knit_Graph:
     """
     A class to knitted structures
@@ -30,31 +24,51 @@ class Knit_Graph:
 
     Attributes
     ----------
-    graph : networkx.DiGraph
-        the directed-graph structure of loops pulled through other loops
-    loops: Dict[int, Loop]
-        A map of each unique loop id to its loop
+    graph : Stitch_Graph_View
+        a read-only, networkx-style view of the directed-graph structure of loops pulled through other loops
+    stitches: Stitch_Storage
+        the array-backed stitch edges from parent loops to the child loops pulled through them
+    loops: Loop_Table
+        A map of each unique loop id to its loop, stored as per-field arrays
     yarns: Dict[str, Yarn]
         Yarn Ids mapped to the corresponding yarn
+    course_index: Course_Index
+        The loop-to-course and course-to-loops mappings, maintained as loops are added and connected
+    wale_index: Wale_Index
+        The column of each loop and the loops above and below it in its wale, maintained like the course_index
+    motif_index: Motif_Index
+        The ids of the yarn-overs, decreases, and cable stitches, maintained as loops are added and connected
+    structural_hash: Structural_Hash
+        The canonical hash of the structure of the graph, extended as loops are added.
+        Graphs of the same fabric have the same hash, so it can key caches of knitout, visualizations and statistics
     """
 
     def __init__(self):
-        self.graph: networkx.DiGraph = networkx.DiGraph()
-        self.loops: Dict[int, Loop] = {}
+        self.stitches: Stitch_Storage = Stitch_Storage()
+        self.graph: Stitch_Graph_View = Stitch_Graph_View(self)
+        self.loops: Loop_Table = Loop_Table(self)
         self.last_loop_id: int = -1
         self.yarns: Dict[str, Yarn] = {}
+        self.course_index: Course_Index = Course_Index(self)
+        self.wale_index: Wale_Index = Wale_Index(self)
+        self.motif_index: Motif_Index = Motif_Index(self)
+        self.structural_hash: Structural_Hash = Structural_Hash(self)
 
     def add_loop(self, loop: Loop):
         """
         :param loop: the loop to be added in as a node in the graph
         """
-        # Add a node with the loop id to the graph with a parameter keyed to it at "loop" to store the loop
-        self.graph.add_node(loop.loop_id, loop=loop)
+        # Make room for the loop's stitch edges in the stitch storage
+        self.stitches.reserve_loop(loop.loop_id)
         # If this loop is not on its specified yarn add it to the end of the yarn
         if loop.loop_id not in self.yarns[loop.yarn_id]:
             self.yarns[loop.yarn_id].add_loop_to_end(loop=loop)
-        # Add the loop to the loops dictionary
-        self.loops[loop.loop_id] = loop
+        # Add the loop to the loop table, this binds the loop to the table and the stitch storage
+        self.loops.add_loop(loop)
+        self.course_index.add_loop(loop.loop_id)
+        self.wale_index.add_loop(loop.loop_id)
+        self.motif_index.add_loop(loop.loop_id)
+        self.structural_hash.add_loop(loop.loop_id)
         self.last_loop_id = loop.loop_id
 
     def add_yarn(self, yarn: Yarn):
@@ -63,6 +77,25 @@ class Knit_Graph:
         """
         self.yarns[yarn.yarn_id] = yarn
 
+    def fork(self):
+        """
+        Creates a copy-on-write copy of the knit graph to make a variant of it (e.g., a different decrease or cable).
+        The fork shares the loop table, stitch storage, indices, and yarn sequences with this graph.
+        Each of these is copied the first time either graph modifies it, so unchanged parts stay shared.
+        A fork that is never modified is a snapshot of this graph.
+        :return: the fork of this knit graph
+        """
+        fork = Knit_Graph()
+        fork.stitches = self.stitches.fork()
+        fork.loops = self.loops.fork(fork)
+        fork.last_loop_id = self.last_loop_id
+        fork.yarns = {yarn_id: yarn.fork(fork) for yarn_id, yarn in self.yarns.items()}
+        fork.course_index = self.course_index.fork(fork)
+        fork.wale_index = self.wale_index.fork(fork)
+        fork.motif_index = self.motif_index.fork(fork)
+        fork.structural_hash = self.structural_hash.fork(fork)
+        return fork
+
     def connect_loops(self, parent_loop_id: int, child_loop_id: int,
                       pull_direction: Pull_Direction = Pull_Direction.BtF,
                       stack_position: Optional[int] = None, depth: int = 0, parent_offset: int = 0):
@@ -75,47 +108,276 @@ class Knit_Graph:
         :param pull_direction: the direction the child is pulled through the parent
         :param stack_position: The position to insert the parent into, by default add on top of the stack
         """
-        # Make an edge in the graph from the parent loop to the child loop. The edge should have three parameters:
+        assert parent_loop_id in self, f"parent loop {parent_loop_id} is not in this graph"
+        assert child_loop_id in self, f"child loop {child_loop_id} is not in this graph"
+        assert self.stitches.find_edge(parent_loop_id, child_loop_id) is None, \
+            f"loop {child_loop_id} is already pulled through loop {parent_loop_id}"
+        # Make an edge in the stitch storage from the parent loop to the child loop with its
         # "pull_direction", "depth", and "parent_offset"
-        self.graph.add_edge(parent_loop_id, child_loop_id, pull_direction=pull_direction, depth=depth, parent_offset=parent_offset)
-        # add the parent loop to the child's parent loop stack
-        self.loops[child_loop_id].add_parent_loop(self.loops[parent_loop_id], stack_position=stack_position)
+        self.stitches.add_edge(parent_loop_id, child_loop_id, pull_direction.code, depth, parent_offset,
+                               stack_position=stack_position)
+        self.course_index.add_stitch(parent_loop_id, child_loop_id)
+        self.wale_index.add_stitch(child_loop_id)
+        self.motif_index.add_stitch(child_loop_id)
+        self.structural_hash.loop_changed(child_loop_id)
+
+    def add_course(self, parent_ids: Sequence[Union[None, int, Sequence[int]]],
+                   parent_offsets: Union[int, Sequence[Union[int, Sequence[int]]]] = 0,
+                   pull_directions: Union[Pull_Direction, Sequence[Pull_Direction]] = Pull_Direction.BtF,
+                   depths: Union[int, Sequence[int]] = 0, is_twisted: Union[bool, Sequence[bool]] = False,
+                   yarn_id: Optional[str] = None) -> range:
+        """
+        Creates a course of new loops at the end of a yarn and connects them to their parents in one pass.
+        The sequences are parallel and give one entry per new loop in yarn order.
+        A single value instead of a sequence is used for every new loop.
+        :param parent_ids: for each new loop, None or an empty sequence for a yarn-over, the id of its parent loop,
+         or a sequence of parent loop ids in stack order with the bottom of the stack first
+        :param parent_offsets: for each new loop, the offset to its parent
+         or a sequence of offsets parallel to its parent ids
+        :param pull_directions: for each new loop, the direction it is pulled through its parents
+        :param depths: for each new loop, the crossing depth of its stitch
+        :param is_twisted: for each new loop, True if the loop is twisted
+        :param yarn_id: the yarn to make the loops with. May be None if the graph has one yarn
+        :return: the ids of the new loops in yarn order
+        """
+        if yarn_id is None:
+            assert len(self.yarns) == 1, "A yarn_id is needed to add a course to a graph with multiple yarns"
+            yarn_id = next(iter(self.yarns))
+        assert yarn_id in self.yarns, f"No yarn {yarn_id} in this graph"
+        loop_ids = range(self.last_loop_id + 1, self.last_loop_id + 1 + len(parent_ids))
+        if all(type(parent_id) is int for parent_id in parent_ids) \
+                and (type(parent_offsets) is int or all(type(offset) is int for offset in parent_offsets)):
+            # every new loop has one parent, the edge columns are filled in bulk
+            edge_parents = array("i", parent_ids)
+            edge_children = array("i", loop_ids)
+            if isinstance(pull_directions, Pull_Direction):
+                edge_pull_codes = array("b", [pull_directions.code]) * len(loop_ids)
+            else:
+                edge_pull_codes = array("b", [pull_direction.code for pull_direction in pull_directions])
+            edge_depths = array("b", [depths]) * len(loop_ids) if type(depths) is int else array("b", depths)
+            if type(parent_offsets) is int:
+                edge_offsets = array("h", [parent_offsets]) * len(loop_ids)
+            else:
+                edge_offsets = array("h", parent_offsets)
+            assert len(edge_pull_codes) == len(edge_depths) == len(edge_offsets) == len(loop_ids), \
+                f"Expected one pull direction, depth, and offset for each of the {len(loop_ids)} new loops"
+        else:
+            edge_parents, edge_children, edge_pull_codes, edge_depths, edge_offsets = \
+                self._course_edge_columns(loop_ids, parent_ids, parent_offsets, pull_directions, depths)
+        # validate the parents of the course in one pass
+        assert len(set(edge_parents)) == len(edge_parents), "A parent loop is used by more than one new loop"
+        loop_yarns = self.loops.loop_yarns
+        assert all(0 <= parent_id < loop_ids.start and loop_yarns[parent_id] != NO_YARN for parent_id in edge_parents), \
+            f"A parent loop of course {loop_ids} is not in this graph"
+        if type(is_twisted) is bool:
+            twists = bytes([is_twisted]) * len(loop_ids)
+        else:
+            assert len(is_twisted) == len(loop_ids), f"Expected {len(loop_ids)} twist values"
+            twists = bytes(1 if twisted else 0 for twisted in is_twisted)
+        # insert the loops and stitch edges in bulk
+        self.loops.add_loops(loop_ids, yarn_id, twists)
+        self.yarns[yarn_id].add_loop_ids_to_end(loop_ids)
+        self.stitches.reserve_loop(loop_ids.stop - 1)
+        self.stitches.add_edges(edge_parents, edge_children, edge_pull_codes, edge_depths, edge_offsets)
+        self.course_index.add_loops(loop_ids)
+        self.wale_index.add_loops(loop_ids)
+        self.motif_index.add_loops(loop_ids)
+        if len(loop_ids) > 0:
+            self.last_loop_id = loop_ids[-1]
+        return loop_ids
+
+    def remove_stitch(self, parent_loop_id: int, child_loop_id: int):
+        """
+        Removes the stitch-edge between a parent and child loop, the parents above it in the child's stack move down
+        :param parent_loop_id: the id of the parent loop
+        :param child_loop_id: the id of the child loop pulled through the parent
+        """
+        edge_id = self.stitches.find_edge(parent_loop_id, child_loop_id)
+        assert edge_id is not None, f"loop {child_loop_id} is not pulled through loop {parent_loop_id}"
+        self.stitches.remove_edge(edge_id)
+        self.course_index.loop_changed(child_loop_id)
+        self.wale_index.loop_changed(child_loop_id)
+        self.motif_index.loop_changed(child_loop_id)
+        self.structural_hash.loop_changed(child_loop_id)
+
+    def replace_parents(self, child_loop_id: int, parent_loop_ids: Sequence[int],
+                        pull_direction: Pull_Direction = Pull_Direction.BtF, depth: int = 0,
+                        parent_offsets: Union[int, Sequence[int]] = 0):
+        """
+        Replaces the parent stack of a loop, e.g., to change a knit stitch into a decrease
+        :param child_loop_id: the id of the loop whose stitch is replaced
+        :param parent_loop_ids: the ids of the new parent loops from the bottom to the top of the stack
+        :param pull_direction: the direction the child is pulled through the new parents
+        :param depth: the crossing depth of the new stitch
+        :param parent_offsets: the offset to each new parent, or one offset for every parent
+        """
+        if type(parent_offsets) is int:
+            parent_offsets = [parent_offsets] * len(parent_loop_ids)
+        assert len(parent_offsets) == len(parent_loop_ids), \
+            f"Loop {child_loop_id} has {len(parent_loop_ids)} parents but {len(parent_offsets)} offsets"
+        for parent_loop_id in self.stitches.parent_ids(child_loop_id):
+            self.remove_stitch(parent_loop_id, child_loop_id)
+        for parent_loop_id, parent_offset in zip(parent_loop_ids, parent_offsets):
+            self.connect_loops(parent_loop_id, child_loop_id, pull_direction, depth=depth, parent_offset=parent_offset)
+
+    def remove_loops(self, loop_ids: Iterable[int]):
+        """
+        Removes loops and their stitches in time proportional to the number of loops and stitches removed.
+        The loops are marked removed and the loops on either side of them on their yarns are joined;
+         their ids are not reused until the graph is compacted
+        :param loop_ids: the ids of the loops to remove, e.g., a course
+        """
+        loop_ids = set(loop_ids)
+        assert all(loop_id in self for loop_id in loop_ids), "Only loops in the graph can be removed"
+        yarn_loop_ids: Dict[str, Set[int]] = {}
+        for loop_id in sorted(loop_ids):
+            for edge_id in [*self.stitches.parent_edges(loop_id), *self.stitches.child_edges(loop_id)]:
+                child_id = self.stitches.edge_children[edge_id]
+                self.stitches.remove_edge(edge_id)
+                self.motif_index.loop_changed(child_id)
+                self.structural_hash.loop_changed(child_id)
+            yarn_loop_ids.setdefault(self.loops.yarn_id(loop_id), set()).add(loop_id)
+            self.loops.remove_loop(loop_id)
+            self.course_index.loop_changed(loop_id)
+            self.wale_index.loop_changed(loop_id)
+            self.motif_index.loop_changed(loop_id)
+            self.structural_hash.loop_changed(loop_id)
+        for yarn_id, removed_ids in yarn_loop_ids.items():
+            self.yarns[yarn_id].remove_loop_ids(removed_ids)
+
+    def remove_loop(self, loop_id: int):
+        """
+        :param loop_id: the id of the loop to remove with its stitches
+        """
+        self.remove_loops([loop_id])
 
-    def get_courses(self) -> Tuple[Dict[int, int], Dict[int, List[int]]]:
+    def compact(self) -> array:
+        """
+        Renumbers the loops from 0 without the ids of removed loops and drops removed stitches,
+         in one pass over the loop table, stitch storage, and yarns.
+        The course and wale indices are rebuilt when they are next read
+        :return: the new id of each old loop id, NO_LOOP for removed loops
+        """
+        loop_yarns = self.loops.loop_yarns
+        if len(self.loops) == len(loop_yarns) and self.stitches.removed_edge_count == 0:
+            return array("i", range(0, len(loop_yarns)))
+        live_loop_ids = array("i", [loop_id for loop_id, yarn in enumerate(loop_yarns) if yarn != NO_YARN])
+        loop_remap = array("i", [NO_LOOP]) * len(loop_yarns)
+        for new_id, old_id in enumerate(live_loop_ids):
+            loop_remap[old_id] = new_id
+        self.stitches.compact(loop_remap, live_loop_ids)
+        self.loops.compact(live_loop_ids)
+        self.motif_index.compact(loop_remap, live_loop_ids)
+        for yarn in self.yarns.values():
+            yarn.remap_loop_ids(loop_remap)
+        self.last_loop_id = len(live_loop_ids) - 1
+        for index in (self.course_index, self.wale_index, self.structural_hash):
+            index.loop_changed(0)
+        return loop_remap
+
+    @staticmethod
+    def _course_edge_columns(loop_ids: range, parent_ids: Sequence[Union[None, int, Sequence[int]]],
+                             parent_offsets: Union[int, Sequence[Union[int, Sequence[int]]]],
+                             pull_directions: Union[Pull_Direction, Sequence[Pull_Direction]],
+                             depths: Union[int, Sequence[int]]) -> Tuple[array, array, array, array, array]:
+        """
+        Flattens the parallel course sequences given to add_course into stitch edge columns
+        :return: the parent ids, child ids, pull direction codes, depths, and offsets of the course's stitch edges
+        """
+        edge_parents = array("i")
+        edge_children = array("i")
+        edge_pull_codes = array("b")
+        edge_depths = array("b")
+        edge_offsets = array("h")
+        for index, (loop_id, parents) in enumerate(zip(loop_ids, parent_ids)):
+            if parents is None:  # yarn-over
+                continue
+            if type(parents) is int:
+                parents = (parents,)
+            offsets = parent_offsets if type(parent_offsets) is int else parent_offsets[index]
+            if type(offsets) is int:
+                offsets = (offsets,) * len(parents)
+            assert len(offsets) == len(parents), f"Loop {loop_id} has {len(parents)} parents but {len(offsets)} offsets"
+            pull_direction = pull_directions if isinstance(pull_directions, Pull_Direction) else pull_directions[index]
+            depth = depths if type(depths) is int else depths[index]
+            edge_parents.extend(parents)
+            edge_children.extend(array("i", [loop_id]) * len(parents))
+            edge_pull_codes.extend(array("b", [pull_direction.code]) * len(parents))
+            edge_depths.extend(array("b", [depth]) * len(parents))
+            edge_offsets.extend(offsets)
+        return edge_parents, edge_children, edge_pull_codes, edge_depths, edge_offsets
+
+    def get_courses(self) -> Tuple[Loop_Course_Map, Course_Loops_Map]:
         # course type changed from float to int
         """
         Course information will be used to generate instruction for knitting machines and
          visualizations that structure knitted objects like grids.
-         Evaluation of a course structure should be done in O(n*m) time where n is the number of loops in the graph and
-         m is the largest number of parent loops pulled through a single loop (rarely more than 3).
+         The courses are maintained by the course_index as loops are added and connected,
+         so this returns read-only mappings over that index in O(1) without rescanning the graph.
         :return: A dictionary of loop_ids to the course they are on,
         a dictionary of course ids to the loops on that course in the order of creation.
         The first set of loops in the graph is on course 0.
         A course change occurs when a loop has a parent loop that is in the last course.
         """
-        # A course of a knitted structure is a set of neighboring loops that do not involve loops on the prior course
-        # The first course (starting with loop 0) is the 0th course
-        # Note that not having a parent loop does not mean a loop is on course 0, consider yarn-overs
-        loop_ids_to_course = {}
-        course_to_loop_ids = {}
-
-        curr_course = 0
-        curr_loop = 0
-        nloops = len(self.loops.keys())
-        while curr_loop < nloops:
-            # Check for course changes
-            for loop in self.loops[curr_loop].parent_loops:
-                if loop.loop_id in course_to_loop_ids[curr_course]:
-                    curr_course += 1
-                    break
-            # Populate the two output dictionaries
-            if curr_course not in course_to_loop_ids:
-                course_to_loop_ids[curr_course] = []
-            loop_ids_to_course[curr_loop] = curr_course
-            course_to_loop_ids[curr_course].append(curr_loop)
-            curr_loop += 1
-
-        return loop_ids_to_course, course_to_loop_ids
+        return Loop_Course_Map(self.course_index), Course_Loops_Map(self.course_index)
+
+    def course_stitches(self, course: int) -> Stitch_Slice:
+        """
+        :param course: a course in the knit graph
+        :return: the attributes of the stitch edges into the loops of the course as parallel columns
+        """
+        return self.stitches_into(self.course_index.course_loop_ids(course))
+
+    def stitches_into(self, loop_ids: Sequence[int]) -> Stitch_Slice:
+        """
+        :param loop_ids: the ids of loops in the graph, e.g., a course
+        :return: the attributes of the stitch edges into the loops as parallel columns
+        """
+        return self.stitches.edges_into(loop_ids)
+
+    def course_motifs(self, course: int) -> Course_Motifs:
+        """
+        :param course: a course in the knit graph
+        :return: the ids of the yarn-overs, decreases, and cable stitches on the course, read from the motif_index
+         without visiting its other loops
+        """
+        loop_ids = self.course_index.course_loop_ids(course)
+        if len(loop_ids) == 0:
+            return Course_Motifs(array("i"), array("i"), array("i"))
+        motifs = self.motif_index.motifs_between(loop_ids[0], loop_ids[-1] + 1)
+        if course == 0:  # the loops of the first course are the cast-on
+            motifs.yarn_over_ids = array("i")
+        return motifs
+
+    def statistics(self) -> Knit_Graph_Statistics:
+        """
+        :return: the per-course counts of knits, purls, yarn-overs, decreases, cables, and twisted loops,
+         counted in one pass over the stitch storage and one over the loop table
+        """
+        return Knit_Graph_Statistics(self)
+
+    def validate(self, courses: Optional[range] = None) -> List[Graph_Diagnostic]:
+        """
+        :param courses: the courses to check, by default every course
+        :return: the structural problems found in the courses, e.g., parents consumed twice or dangling loops
+        """
+        return Knit_Graph_Validator(self).validate(courses)
+
+    def view(self, courses: Optional[range] = None, wales: Optional[range] = None) -> Knit_Graph_View:
+        """
+        :param courses: the courses to view, by default every course
+        :param wales: the wale columns to view, by default every column
+        :return: a read-only view of the region of this graph, without copying its loops or stitches
+        """
+        return Knit_Graph_View(self, courses, wales)
+
+    def as_networkx(self):
+        """
+        Imports networkx on first use
+        :return: a frozen networkx.DiGraph of the loops and stitches of this graph that reads them on demand
+        """
+        from knit_graphs.Networkx_Adapter import Networkx_Stitch_Graph
+        return Networkx_Stitch_Graph(self)
 
     def __contains__(self, item: Union[int, Loop]) -> bool:
         """
@@ -123,9 +385,9 @@ class Knit_Graph:
         :return: true if the loop_id of item or the loop is in the graph
         """
         if type(item) is int:
-            return self.graph.has_node(item)
+            return item in self.loops
         elif isinstance(item, Loop):
-            return self.graph.has_node(item.loop_id)
+            return item.loop_id in self.loops
 
     def __getitem__(self, item: int) -> Loop:
         """
@@ -135,4 +397,4 @@ class Knit_Graph:
         if item not in self:
             raise AttributeError
         else:
-            return self.graph.nodes[item]["loop"]
+            return self.loops[item]
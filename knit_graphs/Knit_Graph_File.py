@@ -0,0 +1,202 @@
+"""
+A compact, versioned binary file format for knit graphs.
+The file holds the fixed-width columns of a knit graph's loop table, stitch storage, course and wale indices,
+ and the loop sequence of each yarn, so a graph can be cached instead of being regenerated or recompiled.
+Loading memory-maps the file: the columns of the loaded graph are read-only views of the mapped pages,
+ so a large graph opens without parsing and processes that load the same file share one copy of it.
+A loaded graph copies its columns into memory the first time it is modified.
+The same layout can be written to and loaded from any buffer, e.g., a block of shared memory (see Shared_Knit_Graph).
+
+Layout (all integers little-endian in the header, columns in the byte order recorded in the header):
+ header, yarn records, column directory, then each column aligned to 8 bytes
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import List, Tuple
+
+from knit_graphs.Columns import Column, writable_column
+from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Yarn import Yarn
+
+MAGIC = b"KNITGRPH"
+FORMAT_VERSION = 4
+# magic, format version, 1 if columns are big-endian, yarn count, column count,
+# last_loop_id, loop count, last loop id in the course index, last loop id in the wale index, removed edge count
+_HEADER = struct.Struct("<8sHBxIIqqqqq")
+# byte length of the yarn id, carrier id, 1 if the yarn's loop ids are not in ascending order
+_YARN_RECORD = struct.Struct("<HBB")
+# column typecode, item size, item count, byte offset from the start of the file
+_COLUMN_RECORD = struct.Struct("<cBxxIQ")
+_ALIGNMENT = 8
+
+# The columns of a knit graph, by the attribute of the knit graph that holds them and the column's attribute.
+# The loop table's yarn order and the loop ids of each yarn follow these columns
+_GRAPH_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("loops", "loop_yarns"), ("loops", "loop_twists"),
+    ("stitches", "edge_parents"), ("stitches", "edge_children"), ("stitches", "edge_pull_directions"),
+    ("stitches", "edge_depths"), ("stitches", "edge_offsets"), ("stitches", "edge_stack_positions"),
+    ("stitches", "_next_parent_edge"), ("stitches", "_next_child_edge"), ("stitches", "_first_parent_edge"),
+    ("stitches", "_first_child_edge"), ("stitches", "_last_child_edge"),
+    ("course_index", "course_starts"), ("course_index", "loop_courses"),
+    ("wale_index", "loop_columns"), ("wale_index", "wale_parents"), ("wale_index", "wale_children"),
+    ("motif_index", "loop_motifs"), ("motif_index", "yarn_over_ids"), ("motif_index", "decrease_ids"),
+    ("motif_index", "cable_ids"))
+
+
+def _padding(position: int) -> int:
+    """
+    :param position: a byte position in the file
+    :return: the number of bytes needed to align the position
+    """
+    return -position % _ALIGNMENT
+
+
+def _graph_layout(knit_graph: Knit_Graph) -> Tuple[bytes, List[Column], List[int], int]:
+    """
+    Lays out the knit graph in the file format
+    :param knit_graph: the knit graph to lay out
+    :return: the header, yarn records, and column directory; the columns; the byte offset of each column;
+     and the total size in bytes
+    """
+    # stale indices are rebuilt so that the file holds valid indices
+    knit_graph.course_index._refresh()
+    knit_graph.wale_index._refresh()
+    yarns = [*knit_graph.yarns.values()]
+    yarn_positions = {yarn.yarn_id: position for position, yarn in enumerate(yarns)}
+    table_yarns = array("h", [yarn_positions[yarn_id] for yarn_id in knit_graph.loops.yarn_ids])
+    columns: List[Column] = [getattr(getattr(knit_graph, owner), name) for owner, name in _GRAPH_COLUMNS]
+    columns.append(table_yarns)
+    columns.extend(yarn.loop_ids for yarn in yarns)
+    prefix = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 1 if sys.byteorder == "big" else 0, len(yarns),
+                                    len(columns), knit_graph.last_loop_id, len(knit_graph.loops),
+                                    knit_graph.course_index._last_loop_id, knit_graph.wale_index._last_loop_id,
+                                    knit_graph.stitches.removed_edge_count))
+    for yarn in yarns:
+        yarn_id = yarn.yarn_id.encode("utf-8")
+        prefix += _YARN_RECORD.pack(len(yarn_id), yarn.carrier.carrier_id, 0 if yarn._positions is None else 1)
+        prefix += yarn_id
+    prefix += bytes(_padding(len(prefix)))
+    position = len(prefix) + _COLUMN_RECORD.size * len(columns)
+    offsets = []
+    for column in columns:
+        column = memoryview(column)
+        position += _padding(position)
+        offsets.append(position)
+        prefix += _COLUMN_RECORD.pack(column.format.encode("ascii"), column.itemsize, len(column), position)
+        position += column.nbytes
+    return bytes(prefix), columns, offsets, position
+
+
+def write_knit_graph(knit_graph: Knit_Graph, path: str):
+    """
+    Writes the knit graph to a binary file that can be loaded with read_knit_graph
+    :param knit_graph: the knit graph to write
+    :param path: the path of the file to write
+    """
+    prefix, columns, offsets, _ = _graph_layout(knit_graph)
+    with open(path, "wb") as file:
+        file.write(prefix)
+        for column, offset in zip(columns, offsets):
+            file.write(bytes(offset - file.tell()))
+            file.write(column)
+
+
+def write_knit_graph_to_buffer(knit_graph: Knit_Graph, buffer: memoryview):
+    """
+    Writes the knit graph into a writable buffer in the file format, e.g., a block of shared memory
+    :param knit_graph: the knit graph to write
+    :param buffer: a buffer of at least knit_graph_size(knit_graph) bytes
+    """
+    prefix, columns, offsets, size = _graph_layout(knit_graph)
+    assert len(buffer) >= size, f"The knit graph needs {size} bytes, the buffer has {len(buffer)}"
+    buffer[0:len(prefix)] = prefix
+    for column, offset in zip(columns, offsets):
+        column = memoryview(column).cast("B")
+        buffer[offset:offset + len(column)] = column
+
+
+def knit_graph_size(knit_graph: Knit_Graph) -> int:
+    """
+    :param knit_graph: a knit graph
+    :return: the number of bytes the knit graph takes in the file format
+    """
+    return _graph_layout(knit_graph)[3]
+
+
+def read_knit_graph(path: str, memory_map: bool = True) -> Knit_Graph:
+    """
+    Loads a knit graph from a file written by write_knit_graph
+    :param path: the path of the file to read
+    :param memory_map: if True the columns of the graph are read-only views of the memory-mapped file
+     until the graph is modified, otherwise the columns are read into memory
+    :return: the knit graph stored in the file
+    """
+    with open(path, "rb") as file:
+        if memory_map:
+            data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = memoryview(file.read())
+    return read_knit_graph_from_buffer(data, memory_map, path)
+
+
+def read_knit_graph_from_buffer(data: memoryview, share_columns: bool = True, source: str = "buffer") -> Knit_Graph:
+    """
+    Loads a knit graph from a buffer in the file format, e.g., a memory-mapped file or a block of shared memory
+    :param data: the buffer holding the knit graph
+    :param share_columns: if True the columns of the graph are views of the buffer until the graph is modified,
+     otherwise the columns are copied into memory
+    :param source: the name of the buffer in error messages
+    :return: the knit graph stored in the buffer
+    """
+    assert len(data) >= _HEADER.size and data[0:len(MAGIC)] == MAGIC, f"{source} is not a knit graph file"
+    magic, version, big_endian, yarn_count, column_count, last_loop_id, loop_count, course_last_loop_id, \
+        wale_last_loop_id, removed_edge_count = _HEADER.unpack_from(data, 0)
+    assert version == FORMAT_VERSION, f"{source} is knit graph format version {version}, expected {FORMAT_VERSION}"
+    swap_bytes = big_endian != (1 if sys.byteorder == "big" else 0)
+    position = _HEADER.size
+    yarn_records = []
+    for _ in range(0, yarn_count):
+        id_length, carrier_id, out_of_order = _YARN_RECORD.unpack_from(data, position)
+        position += _YARN_RECORD.size
+        yarn_records.append((bytes(data[position:position + id_length]).decode("utf-8"), carrier_id, out_of_order))
+        position += id_length
+    position += _padding(position)
+    columns: List[Column] = []
+    for _ in range(0, column_count):
+        typecode, itemsize, count, offset = _COLUMN_RECORD.unpack_from(data, position)
+        position += _COLUMN_RECORD.size
+        typecode = typecode.decode("ascii")
+        assert array(typecode).itemsize == itemsize, \
+            f"Column of type {typecode} has {itemsize} byte items, {array(typecode).itemsize} on this platform"
+        column: Column = data[offset:offset + count * itemsize].cast(typecode)
+        if swap_bytes:
+            column = writable_column(column)
+            column.byteswap()
+        elif not share_columns:
+            column = writable_column(column)
+        columns.append(column)
+    mapped = share_columns and not swap_bytes
+    knit_graph = Knit_Graph()
+    for (owner, name), column in zip(_GRAPH_COLUMNS, columns):
+        setattr(getattr(knit_graph, owner), name, column)
+    for storage in (knit_graph.loops, knit_graph.stitches, knit_graph.course_index, knit_graph.wale_index,
+                    knit_graph.motif_index):
+        storage._shared = mapped
+    table_yarns = columns[len(_GRAPH_COLUMNS)]
+    knit_graph.loops.yarn_ids = [yarn_records[position][0] for position in table_yarns]
+    knit_graph.loops._yarn_indices = {yarn_id: index for index, yarn_id in enumerate(knit_graph.loops.yarn_ids)}
+    knit_graph.loops._loop_count = loop_count
+    knit_graph.stitches._removed_edge_count = removed_edge_count
+    knit_graph.course_index._last_loop_id = course_last_loop_id
+    knit_graph.wale_index._last_loop_id = wale_last_loop_id
+    for (yarn_id, carrier_id, out_of_order), loop_ids in zip(yarn_records, columns[len(_GRAPH_COLUMNS) + 1:]):
+        yarn = Yarn(yarn_id, knit_graph, carrier_id=carrier_id)
+        yarn.loop_ids = loop_ids
+        yarn._shared = mapped
+        if out_of_order:
+            yarn._positions = {loop_id: position for position, loop_id in enumerate(loop_ids)}
+        knit_graph.add_yarn(yarn)
+    knit_graph.last_loop_id = last_loop_id
+    return knit_graph
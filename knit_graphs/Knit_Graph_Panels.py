@@ -0,0 +1,155 @@
+"""
+Assembly of knit graphs from panels, e.g., a ribbed hem followed by a lace body and a yoke.
+Each panel can be compiled and cached on its own; joining panels copies their columns with loop ids remapped in bulk
+ instead of recompiling one large pattern.
+"""
+from array import array
+from itertools import groupby
+from typing import List, Sequence
+
+from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Yarn import Yarn
+
+NO_LOOP = -1
+
+
+def _is_contiguous(knit_graph: Knit_Graph) -> bool:
+    """
+    :param knit_graph: a panel
+    :return: True if the loop ids of the panel are 0 to last_loop_id without gaps
+    """
+    return len(knit_graph.loops) == knit_graph.last_loop_id + 1
+
+
+def _empty_remap(knit_graph: Knit_Graph) -> array:
+    """
+    :param knit_graph: a panel
+    :return: a remap column for the panel's loop ids with no loop mapped yet
+    """
+    return array("i", [NO_LOOP]) * (knit_graph.last_loop_id + 1)
+
+
+def _add_panel_yarns(knit_graph: Knit_Graph, panel: Knit_Graph):
+    """
+    Adds the yarns of the panel that are not in the knit graph, yarns with the same id are continued by the panel
+    :param knit_graph: the knit graph the panel is joined into
+    :param panel: the panel
+    """
+    for yarn_id, yarn in panel.yarns.items():
+        if yarn_id not in knit_graph.yarns:
+            knit_graph.add_yarn(Yarn(yarn_id, knit_graph, carrier_id=yarn.carrier.carrier_id))
+
+
+def _append_panel_loops(knit_graph: Knit_Graph, panel: Knit_Graph, loop_ids: range, remap: array):
+    """
+    Copies a block of consecutive loops of a panel and the stitches into them to the end of the knit graph.
+    The caller indexes the courses, wales, and motifs of the new loops
+    :param knit_graph: the knit graph the panel is joined into
+    :param panel: the panel
+    :param loop_ids: the ids of the loops of the panel to copy
+    :param remap: the id in the knit graph of each loop of the panel, including the copied loops and their parents
+    """
+    if len(loop_ids) == 0:
+        return
+    new_start = remap[loop_ids.start]
+    assert new_start == knit_graph.last_loop_id + 1, "Panel loops must be added at the end of the knit graph"
+    # loops are added in runs made by the same yarn, usually the whole block
+    run_start = 0
+    for yarn_index, run in groupby(panel.loops.loop_yarns[loop_ids.start:loop_ids.stop]):
+        run_length = len([*run])
+        run_ids = range(new_start + run_start, new_start + run_start + run_length)
+        yarn_id = panel.loops.yarn_ids[yarn_index]
+        twists = panel.loops.loop_twists[loop_ids.start + run_start:loop_ids.start + run_start + run_length]
+        knit_graph.loops.add_loops(run_ids, yarn_id, twists)
+        knit_graph.yarns[yarn_id].add_loop_ids_to_end(run_ids)
+        run_start += run_length
+    stitches = panel.stitches.edges_into(loop_ids)
+    children = array("i", map(remap.__getitem__, map(panel.stitches.edge_children.__getitem__, stitches.edge_ids)))
+    parents = array("i", map(remap.__getitem__, stitches.parent_ids))
+    assert NO_LOOP not in parents, f"A parent of loops {loop_ids} is not in the joined knit graph"
+    knit_graph.stitches.reserve_loop(new_start + len(loop_ids) - 1)
+    knit_graph.stitches.add_edges(parents, children, stitches.pull_directions, stitches.depths, stitches.offsets)
+    knit_graph.last_loop_id = new_start + len(loop_ids) - 1
+
+
+def _course_ranges(knit_graph: Knit_Graph) -> List[range]:
+    """
+    :param knit_graph: a panel with contiguous loop ids
+    :return: the loop ids of each course of the panel
+    """
+    course_starts, _ = knit_graph.course_index.columns()
+    starts = [*course_starts, knit_graph.last_loop_id + 1]
+    return [range(start, stop) for start, stop in zip(starts, starts[1:])]
+
+
+def stack_panels(panels: Sequence[Knit_Graph]) -> Knit_Graph:
+    """
+    Stacks panels from bottom to top.
+    The first course of each panel above the bottom is its cast-on, it is joined to the last course of the panel below:
+     each loop of that first course is replaced by the loop of the last course in the same column, left to right,
+     so the second course of the upper panel is knit into the last course of the panel below.
+    The last course of the panel below must be knit left to right (an even course) like a cast-on
+    :param panels: the knit graphs to stack, bottom first
+    :return: a new knit graph with the loops of each panel above the bottom following the loops of the panel below
+    """
+    assert len(panels) > 0, "No panels to stack"
+    assert all(_is_contiguous(panel) for panel in panels), \
+        "Panels must have loop ids without gaps, compact() panels with removed loops"
+    knit_graph = panels[0].fork()
+    for panel in panels[1:]:
+        courses = _course_ranges(panel)
+        last_course = knit_graph.course_index.course_count - 1
+        assert last_course % 2 == 0, \
+            f"The last course ({last_course}) of a lower panel must be knit left to right to join the next panel"
+        lower_loops = sorted(knit_graph.course_index.course_loop_ids(last_course), key=knit_graph.wale_index.column_of)
+        upper_loops = sorted(courses[0], key=panel.wale_index.column_of)
+        assert len(lower_loops) == len(upper_loops), \
+            f"Cannot join a course of {len(lower_loops)} loops to a panel cast on with {len(upper_loops)} loops"
+        remap = _empty_remap(panel)
+        for upper_id, lower_id in zip(upper_loops, lower_loops):
+            remap[upper_id] = lower_id
+        upper_ids = range(courses[0].stop, panel.last_loop_id + 1)
+        remap[upper_ids.start:upper_ids.stop] = array("i", range(knit_graph.last_loop_id + 1,
+                                                                 knit_graph.last_loop_id + 1 + len(upper_ids)))
+        _add_panel_yarns(knit_graph, panel)
+        _append_panel_loops(knit_graph, panel, upper_ids, remap)
+        for course in courses[1:]:
+            knit_graph.course_index.add_loops(range(remap[course.start], remap[course.start] + len(course)))
+        new_ids = range(remap[upper_ids.start], remap[upper_ids.start] + len(upper_ids))
+        knit_graph.wale_index.add_loops(new_ids)
+        knit_graph.motif_index.add_loops(new_ids)
+    return knit_graph
+
+
+def place_side_by_side(panels: Sequence[Knit_Graph]) -> Knit_Graph:
+    """
+    Places panels with the same number of courses side by side, from left to right.
+    Each course of the new knit graph is made of that course of every panel, joined by its yarn:
+     even courses are knit left to right and take the panels in order, odd courses take them in reverse order
+    :param panels: the knit graphs to place side by side, leftmost first
+    :return: a new knit graph with the loops of each panel course by course
+    """
+    assert len(panels) > 0, "No panels to place"
+    assert all(_is_contiguous(panel) for panel in panels), \
+        "Panels must have loop ids without gaps, compact() panels with removed loops"
+    panel_courses = [_course_ranges(panel) for panel in panels]
+    course_count = len(panel_courses[0])
+    assert all(len(courses) == course_count for courses in panel_courses), \
+        "Panels placed side by side must have the same number of courses"
+    knit_graph = Knit_Graph()
+    for panel in panels:
+        _add_panel_yarns(knit_graph, panel)
+    remaps = [_empty_remap(panel) for panel in panels]
+    for course in range(0, course_count):
+        order = range(0, len(panels)) if course % 2 == 0 else range(len(panels) - 1, -1, -1)
+        course_start = knit_graph.last_loop_id + 1
+        for index in order:
+            loop_ids = panel_courses[index][course]
+            start = knit_graph.last_loop_id + 1
+            remaps[index][loop_ids.start:loop_ids.stop] = array("i", range(start, start + len(loop_ids)))
+            _append_panel_loops(knit_graph, panels[index], loop_ids, remaps[index])
+        new_ids = range(course_start, knit_graph.last_loop_id + 1)
+        knit_graph.course_index.add_loops(new_ids)
+        knit_graph.wale_index.add_loops(new_ids)
+        knit_graph.motif_index.add_loops(new_ids)
+    return knit_graph
@@ -0,0 +1,105 @@
+"""A census of the stitches on each course of a knit graph"""
+from array import array
+from typing import Dict
+
+from knit_graphs.Loop_Table import NO_YARN
+from knit_graphs.Pull_Direction import Pull_Direction
+from knit_graphs.Stitch_Storage import REMOVED_LOOP
+
+
+class Knit_Graph_Statistics:
+    """
+    A class holding per-course counts of the stitches in a knit graph, each as an array indexed by course.
+    A loop pulled through its parents back to front is counted as a knit and front to back as a purl,
+     as the knitout generator knits them on the front and back bed; decreases and cable stitches are also counted
+     as knits or purls, so knits + purls is the number of loops with parents on each course.
+    Loops without parents after the first course are yarn-overs, the first course is the cast-on
+    ...
+
+    Attributes
+    ----------
+    loops: array
+        The number of loops on each course
+    knits: array
+        The number of loops pulled back to front through their parents on each course
+    purls: array
+        The number of loops pulled front to back through their parents on each course
+    yarn_overs: array
+        The number of loops without parents on each course after the first
+    twisted: array
+        The number of twisted loops on each course
+    decreases: Dict[int, array]
+        The number of loops pulled through more than one parent on each course, by the number of parents
+    cables: Dict[int, array]
+        The number of loops whose stitch crosses other stitches on each course, by crossing depth (-1 or 1)
+    """
+
+    def __init__(self, knit_graph):
+        """
+        Counts the stitches of the knit graph in one pass over its stitch edges and one pass over its loops
+        :param knit_graph: the knit graph to count
+        """
+        course_index = knit_graph.course_index
+        course_count = course_index.course_count
+        loop_courses = course_index.loop_courses
+        empty = array("i", [0]) * course_count
+        self.loops: array = empty[:]
+        self.knits: array = empty[:]
+        self.purls: array = empty[:]
+        self.yarn_overs: array = empty[:]
+        self.twisted: array = empty[:]
+        self.decreases: Dict[int, array] = {}
+        self.cables: Dict[int, array] = {}
+        stitches = knit_graph.stitches
+        loop_yarns = knit_graph.loops.loop_yarns
+        # the stitch of each loop is read from the bottom of its parent stack, the arity from the top
+        parent_counts = array("i", [0]) * len(loop_yarns)
+        purl_code = Pull_Direction.FtB.code
+        for child_id, pull_code, depth, stack_position in zip(stitches.edge_children, stitches.edge_pull_directions,
+                                                              stitches.edge_depths, stitches.edge_stack_positions):
+            if child_id == REMOVED_LOOP:
+                continue
+            if stack_position == 0:
+                course = loop_courses[child_id]
+                if pull_code == purl_code:
+                    self.purls[course] += 1
+                else:
+                    self.knits[course] += 1
+                if depth != 0:
+                    if depth not in self.cables:
+                        self.cables[depth] = empty[:]
+                    self.cables[depth][course] += 1
+            if stack_position >= parent_counts[child_id]:
+                parent_counts[child_id] = stack_position + 1
+        loop_twists = knit_graph.loops.loop_twists
+        for loop_id, (yarn, course, twist, parent_count) in enumerate(zip(loop_yarns, loop_courses, loop_twists,
+                                                                          parent_counts)):
+            if yarn == NO_YARN:
+                continue
+            self.loops[course] += 1
+            self.twisted[course] += twist
+            if parent_count == 0:
+                if course > 0:
+                    self.yarn_overs[course] += 1
+            elif parent_count > 1:
+                if parent_count not in self.decreases:
+                    self.decreases[parent_count] = empty[:]
+                self.decreases[parent_count][course] += 1
+
+    @property
+    def course_count(self) -> int:
+        """
+        :return: the number of courses counted
+        """
+        return len(self.loops)
+
+    def totals(self) -> Dict[str, int]:
+        """
+        :return: the count of each kind of stitch over every course, decreases and cables keyed like "decreases_2"
+        """
+        totals = {name: sum(getattr(self, name)) for name in ("loops", "knits", "purls", "yarn_overs", "twisted")}
+        for arity, counts in sorted(self.decreases.items()):
+            totals[f"decreases_{arity}"] = sum(counts)
+        for depth, counts in sorted(self.cables.items()):
+            totals[f"cables_{depth}"] = sum(counts)
+        return totals
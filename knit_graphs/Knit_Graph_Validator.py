@@ -0,0 +1,188 @@
+"""Structural checks of a knit graph that report every problem found as diagnostics instead of failing on the first"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from knit_graphs.Motif_Index import NO_MOTIF
+from knit_graphs.Stitch_Storage import REMOVED_LOOP
+from knit_graphs.Wale_Index import NO_LOOP
+
+PARENT_CONSUMED_TWICE = "parent_consumed_twice"  # a loop is pulled through by more than one child loop
+PARENT_AFTER_CHILD = "parent_after_child"  # a loop is pulled through a loop made after it
+OFFSET_OUTSIDE_PRIOR_COURSE = "offset_outside_prior_course"  # a parent is moved past the needles of the prior course
+MISALIGNED_PARENT = "misaligned_parent"  # a parent of a decrease is not moved onto the needle of its child
+OFFSET_WITHOUT_CABLE = "offset_without_cable"  # a knit or purl moves its parent without crossing other stitches
+DANGLING_LOOP = "dangling_loop"  # a loop holds no child loop, so it would drop off its needle
+# a loop may be slipped past the course above it, so loops are checked for children once this many courses are above
+_DANGLING_COURSE_DISTANCE = 2
+
+
+class Graph_Diagnostic:
+    """
+    A problem found in the structure of a knit graph
+    ...
+
+    Attributes
+    ----------
+    code: str
+        The kind of problem, e.g., PARENT_CONSUMED_TWICE
+    loop_id: int
+        The loop with the problem, the child loop for problems with a stitch
+    parent_id: int
+        The parent loop of the stitch with the problem, NO_LOOP for problems with a loop
+    course: int
+        The course of loop_id
+    message: str
+        A description of the problem
+    """
+
+    def __init__(self, code: str, loop_id: int, course: int, message: str, parent_id: int = NO_LOOP):
+        self.code: str = code
+        self.loop_id: int = loop_id
+        self.parent_id: int = parent_id
+        self.course: int = course
+        self.message: str = message
+
+    def __str__(self):
+        return f"{self.code} on course {self.course}: {self.message}"
+
+    def __repr__(self):
+        return str(self)
+
+
+class Knit_Graph_Validator:
+    """
+    A class to check the structure of a knit graph before knitout is generated from it.
+    Stitches are checked in one pass over the edge columns, read against the course, wale, and motif indices.
+    A loop is only checked for children once two courses are made above it, since the loop may be slipped
+     by the course above it and knit by the next.
+    The validator remembers the courses it has checked, so a graph that is built course by course (e.g., by the
+     knitspeak compiler) can be checked as each course is added with validate_new_courses
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph to check
+        """
+        self._knit_graph = knit_graph
+        self._validated_course_count: int = 0
+
+    def validate(self, courses: Optional[range] = None) -> List[Graph_Diagnostic]:
+        """
+        :param courses: the courses whose loops and the stitches into them are checked, by default every course
+        :return: the problems found, in the order of the loops they are on
+        """
+        knit_graph = self._knit_graph
+        course_count = knit_graph.course_index.course_count
+        if courses is None:
+            stitches = knit_graph.stitches
+            edges = (stitches.edge_parents, stitches.edge_children, stitches.edge_offsets)
+            courses = range(0, course_count)
+        else:
+            courses = range(max(courses.start, 0), min(courses.stop, course_count))
+            edges = self._course_edges(courses)
+        diagnostics = self._check_stitches(*edges)
+        settled_stop = course_count - _DANGLING_COURSE_DISTANCE
+        diagnostics.extend(self._check_dangling_loops(range(courses.start, min(courses.stop, settled_stop))))
+        diagnostics.sort(key=lambda diagnostic: diagnostic.loop_id)
+        return diagnostics
+
+    def validate_new_courses(self) -> List[Graph_Diagnostic]:
+        """
+        Checks the courses added since the last call, and the loops below them that are now settled
+        :return: the problems found, in the order of the loops they are on
+        """
+        course_count = self._knit_graph.course_index.course_count
+        first_course = self._validated_course_count
+        self._validated_course_count = course_count
+        diagnostics = self._check_stitches(*self._course_edges(range(first_course, course_count)))
+        diagnostics.extend(self._check_dangling_loops(range(max(first_course - _DANGLING_COURSE_DISTANCE, 0),
+                                                            course_count - _DANGLING_COURSE_DISTANCE)))
+        diagnostics.sort(key=lambda diagnostic: diagnostic.loop_id)
+        return diagnostics
+
+    def _course_edges(self, courses: range) -> Tuple[Sequence[int], Sequence[int], Sequence[int]]:
+        """
+        :param courses: consecutive courses of the knit graph
+        :return: the parent, child, and offset columns of the stitches into the loops of the courses
+        """
+        course_index = self._knit_graph.course_index
+        loop_ids = [loop_id for course in courses for loop_id in course_index.course_loop_ids(course)]
+        stitches = self._knit_graph.stitches.edges_into(loop_ids)
+        children = array("i")
+        for loop_id, start, stop in zip(loop_ids, stitches.child_starts, stitches.child_starts[1:]):
+            children.extend(array("i", [loop_id]) * (stop - start))
+        return stitches.parent_ids, children, stitches.offsets
+
+    def _column_spans(self, courses: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        """
+        :param courses: courses of the knit graph
+        :return: the leftmost and rightmost column of each course
+        """
+        spans = {}
+        for course in courses:
+            columns = self._knit_graph.wale_index.course_columns(course)
+            if len(columns) > 0:
+                spans[course] = min(columns), max(columns)
+        return spans
+
+    def _check_stitches(self, parents: Sequence[int], children: Sequence[int],
+                        offsets: Sequence[int]) -> List[Graph_Diagnostic]:
+        """
+        :param parents: the parent loop of each stitch
+        :param children: the child loop of each stitch, REMOVED_LOOP for removed stitches
+        :param offsets: the parent offset of each stitch
+        :return: the problems found with the stitches
+        """
+        knit_graph = self._knit_graph
+        _, loop_courses = knit_graph.course_index.columns()
+        loop_columns, wale_parents, _ = knit_graph.wale_index.columns()
+        loop_motifs = knit_graph.motif_index.loop_motifs
+        spans = self._column_spans({loop_courses[child_id] - 1 for child_id in set(children)
+                                    if child_id != REMOVED_LOOP and loop_courses[child_id] > 0})
+        diagnostics = []
+        checked_parents = set()
+        for parent_id, child_id, offset in zip(parents, children, offsets):
+            if child_id == REMOVED_LOOP:
+                continue
+            course = loop_courses[child_id]
+            if parent_id > child_id:
+                diagnostics.append(Graph_Diagnostic(PARENT_AFTER_CHILD, child_id, course,
+                                                    f"Loop {child_id} is pulled through loop {parent_id} made after it",
+                                                    parent_id))
+                continue
+            target_column = loop_columns[parent_id] + offset
+            if course - 1 in spans and not spans[course - 1][0] <= target_column <= spans[course - 1][1]:
+                diagnostics.append(Graph_Diagnostic(OFFSET_OUTSIDE_PRIOR_COURSE, child_id, course,
+                                                    f"Offset {offset} moves parent {parent_id} of loop {child_id} to"
+                                                    f" column {target_column} outside of columns {spans[course - 1]}",
+                                                    parent_id))
+            if wale_parents[child_id] != parent_id and target_column != loop_columns[child_id]:
+                diagnostics.append(Graph_Diagnostic(MISALIGNED_PARENT, child_id, course,
+                                                    f"Offset {offset} moves parent {parent_id} to column "
+                                                    f"{target_column}, but loop {child_id} is on column "
+                                                    f"{loop_columns[child_id]}", parent_id))
+            if offset != 0 and loop_motifs[child_id] == NO_MOTIF:
+                diagnostics.append(Graph_Diagnostic(OFFSET_WITHOUT_CABLE, child_id, course,
+                                                    f"Loop {child_id} is offset {offset} from its parent {parent_id}"
+                                                    f" but does not cross other stitches", parent_id))
+            if parent_id not in checked_parents:
+                checked_parents.add(parent_id)
+                child_ids = knit_graph.stitches.child_ids(parent_id)
+                if len(child_ids) > 1:
+                    diagnostics.append(Graph_Diagnostic(PARENT_CONSUMED_TWICE, parent_id, loop_courses[parent_id],
+                                                        f"Loop {parent_id} is pulled through by loops {child_ids}"))
+        return diagnostics
+
+    def _check_dangling_loops(self, courses: range) -> List[Graph_Diagnostic]:
+        """
+        :param courses: courses at least two courses below the last course of the knit graph
+        :return: the loops of the courses that hold no child loop
+        """
+        knit_graph = self._knit_graph
+        diagnostics = []
+        for course in courses:
+            for loop_id in knit_graph.course_index.course_loop_ids(course):
+                if next(knit_graph.stitches.child_edges(loop_id), None) is None:
+                    diagnostics.append(Graph_Diagnostic(DANGLING_LOOP, loop_id, course,
+                                                        f"Loop {loop_id} holds no loop and would drop"))
+        return diagnostics
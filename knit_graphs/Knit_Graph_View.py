@@ -0,0 +1,370 @@
+"""Read-only views of a region of courses and wales in a knit graph"""
+from array import array
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from knit_graphs.Loop import Loop
+from knit_graphs.Motif_Index import Course_Motifs
+from knit_graphs.Stitch_Graph_View import Edge_Data, Stitch_Graph_View, _Child_Adjacency, _Edge_View
+from knit_graphs.Stitch_Storage import Stitch_Slice
+from knit_graphs.Yarn import Yarn, Yarn_Graph_View
+
+
+class Region_Loops(Mapping):
+    """
+    A read-only mapping of the ids of the loops in a region to their Loop handles, in course order
+    """
+
+    def __init__(self, region):
+        self._region = region
+
+    def __getitem__(self, loop_id: int) -> Loop:
+        if loop_id not in self._region:
+            raise KeyError(loop_id)
+        return self._region.knit_graph.loops[loop_id]
+
+    def __iter__(self) -> Iterator[int]:
+        for course in range(0, self._region.course_count):
+            yield from self._region.course_loop_ids(course)
+
+    def __len__(self) -> int:
+        return sum(len(self._region.course_loop_ids(course)) for course in range(0, self._region.course_count))
+
+    def __contains__(self, loop_id) -> bool:
+        return loop_id in self._region
+
+
+class _Region_Child_Adjacency(_Child_Adjacency):
+    """
+    A read-only mapping of the children of one parent loop in a region to the data on the edges that connect them
+    """
+
+    def __init__(self, region, parent_id: int):
+        super().__init__(region.knit_graph.stitches, parent_id)
+        self._region = region
+
+    def __getitem__(self, child_id: int) -> Edge_Data:
+        if child_id not in self._region:
+            raise KeyError(child_id)
+        return super().__getitem__(child_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._region.child_ids(self._parent_id))
+
+    def __len__(self) -> int:
+        return len(self._region.child_ids(self._parent_id))
+
+
+class _Region_Edge_View(_Edge_View):
+    """
+    A read-only collection of the (parent_id, child_id) stitch edges between loops in a region
+    """
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for parent_id in self._knit_graph.loops:
+            for child_id in self._knit_graph.child_ids(parent_id):
+                yield parent_id, child_id
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, edge) -> bool:
+        parent_id, child_id = edge
+        return parent_id in self._knit_graph and child_id in self._knit_graph and super().__contains__(edge)
+
+
+class Region_Graph_View(Stitch_Graph_View):
+    """
+    A read-only, networkx-style view of the stitch edges between the loops of a region.
+    Stitches from loops outside of the region are left out and reported by the region as external parents
+    """
+
+    @property
+    def edges(self) -> _Region_Edge_View:
+        """
+        :return: the (parent_id, child_id) stitch edges between loops in the region
+        """
+        return _Region_Edge_View(self._knit_graph)
+
+    def has_edge(self, parent_id: int, child_id: int) -> bool:
+        """
+        :param parent_id: the id of the parent loop
+        :param child_id: the id of the child loop
+        :return: True if both loops are in the region and the child is pulled through the parent
+        """
+        return (parent_id, child_id) in self.edges
+
+    def predecessors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of the child loop
+        :return: iterator over the parent loop ids in the region in stack order
+        """
+        return iter(self._knit_graph.parent_ids(loop_id))
+
+    def successors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of the parent loop
+        :return: iterator over the child loop ids in the region
+        """
+        return iter(self._knit_graph.child_ids(loop_id))
+
+    def number_of_edges(self) -> int:
+        """
+        :return: the number of stitch edges between loops in the region
+        """
+        return len(self.edges)
+
+    def __getitem__(self, parent_id: int) -> _Region_Child_Adjacency:
+        if parent_id not in self._knit_graph:
+            raise KeyError(parent_id)
+        return _Region_Child_Adjacency(self._knit_graph, parent_id)
+
+
+class Region_Yarn:
+    """
+    A read-only view of the loops of a yarn that are in a region
+    ...
+
+    Attributes
+    ----------
+    yarn_graph: Yarn_Graph_View
+        A read-only view of the loops of the yarn in the region, linked where they are consecutive on the yarn
+    """
+
+    def __init__(self, yarn: Yarn, region):
+        """
+        :param yarn: the yarn to view
+        :param region: the region the view is limited to
+        """
+        self._yarn: Yarn = yarn
+        self._region = region
+        self.yarn_graph: Yarn_Graph_View = _Region_Yarn_Graph_View(self)
+
+    @property
+    def carrier(self):
+        """
+        :return: the yarn-carrier holding the yarn
+        """
+        return self._yarn.carrier
+
+    @property
+    def yarn_id(self) -> str:
+        """
+        :return: the id of the yarn
+        """
+        return self._yarn.yarn_id
+
+    @property
+    def loop_ids(self) -> List[int]:
+        """
+        :return: the ids of the loops on the yarn in the region in yarn order
+        """
+        return [loop_id for loop_id in self._yarn if loop_id in self._region]
+
+    def position_of(self, loop_id: int) -> Optional[int]:
+        """
+        :param loop_id: the id of the loop
+        :return: the position of the loop on the underlying yarn or None if it is not in the region
+        """
+        if loop_id not in self._region:
+            return None
+        return self._yarn.position_of(loop_id)
+
+    def __contains__(self, loop_id) -> bool:
+        return self.position_of(loop_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.loop_ids)
+
+    def __len__(self) -> int:
+        return len(self.loop_ids)
+
+
+class _Region_Yarn_Graph_View(Yarn_Graph_View):
+    """
+    A read-only view of the loops of a yarn in a region, linked only where they are consecutive on the yarn
+    """
+
+    @property
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """
+        :return: the (prior_loop_id, next_loop_id) links between loops in the region that are consecutive on the yarn
+        """
+        region_yarn = self._yarn
+        for loop_id in region_yarn:
+            for next_id in self.successors(loop_id):
+                yield loop_id, next_id
+
+    def successors(self, loop_id: int) -> Iterator[int]:
+        region_yarn = self._yarn
+        yarn = region_yarn._yarn
+        position = region_yarn.position_of(loop_id)
+        if position is not None and position + 1 < len(yarn) and yarn.loop_ids[position + 1] in region_yarn._region:
+            yield yarn.loop_ids[position + 1]
+
+    def predecessors(self, loop_id: int) -> Iterator[int]:
+        region_yarn = self._yarn
+        yarn = region_yarn._yarn
+        position = region_yarn.position_of(loop_id)
+        if position is not None and position > 0 and yarn.loop_ids[position - 1] in region_yarn._region:
+            yield yarn.loop_ids[position - 1]
+
+
+class Knit_Graph_View:
+    """
+    A read-only view of a region of a knit graph: a range of its courses, optionally limited to a range of wale columns.
+    The view reads the loops and stitches of the knit graph in place, nothing is copied.
+    Courses in the view are numbered from 0 at the first course of the region, so the view can be visualized and
+     converted to knitout like a knit graph with the region's first course as its cast-on.
+    Stitches from parents outside of the region are not part of the view, they are reported as external parents
+    ...
+
+    Attributes
+    ----------
+    knit_graph: Knit_Graph
+        The knit graph being viewed
+    courses: range
+        The courses of the knit graph in the region
+    wales: Optional[range]
+        The wale columns in the region, or None for every column
+    graph: Region_Graph_View
+        A read-only, networkx-style view of the stitches between loops in the region
+    loops: Region_Loops
+        The ids of the loops in the region mapped to their Loop handles
+    yarns: Dict[str, Region_Yarn]
+        The yarns of the knit graph limited to the region
+    """
+
+    def __init__(self, knit_graph, courses: Optional[range] = None, wales: Optional[range] = None):
+        """
+        :param knit_graph: the knit graph to view
+        :param courses: the courses of the knit graph to view, by default every course
+        :param wales: the wale columns to view, by default every column
+        """
+        course_count = knit_graph.course_index.course_count
+        if courses is None:
+            courses = range(0, course_count)
+        assert courses.step == 1, "A view must cover consecutive courses"
+        self.knit_graph = knit_graph
+        self.courses: range = range(max(courses.start, 0), min(courses.stop, course_count))
+        self.wales: Optional[range] = wales
+        self.graph: Region_Graph_View = Region_Graph_View(self)
+        self.loops: Region_Loops = Region_Loops(self)
+        self.yarns: Dict[str, Region_Yarn] = {yarn_id: Region_Yarn(yarn, self)
+                                              for yarn_id, yarn in knit_graph.yarns.items()}
+
+    @property
+    def course_count(self) -> int:
+        """
+        :return: the number of courses in the view
+        """
+        return len(self.courses)
+
+    def course_loop_ids(self, course: int) -> Sequence[int]:
+        """
+        :param course: a course of the view, numbered from 0 at the first course of the region
+        :return: the ids of the loops in the region on that course in the order of creation
+        """
+        if not 0 <= course < len(self.courses):
+            raise KeyError(course)
+        loop_ids = self.knit_graph.course_index.course_loop_ids(self.courses[course])
+        if self.wales is None:
+            return loop_ids
+        columns = self.knit_graph.wale_index
+        return [loop_id for loop_id in loop_ids if columns.column_of(loop_id) in self.wales]
+
+    def get_courses(self) -> Tuple[Dict[int, int], Dict[int, Sequence[int]]]:
+        """
+        :return: A dictionary of loop_ids in the region to their course in the view,
+        a dictionary of course ids in the view to the loops in the region on that course in the order of creation.
+        """
+        course_to_loop_ids = {course: self.course_loop_ids(course) for course in range(0, len(self.courses))}
+        loop_ids_to_course = {loop_id: course for course, loop_ids in course_to_loop_ids.items() for loop_id in loop_ids}
+        return loop_ids_to_course, course_to_loop_ids
+
+    def parent_ids(self, loop_id: int) -> List[int]:
+        """
+        :param loop_id: the id of a loop in the region
+        :return: the ids of its parent loops in the region in stack order
+        """
+        return [parent_id for parent_id in self.knit_graph.stitches.parent_ids(loop_id) if parent_id in self]
+
+    def external_parent_ids(self, loop_id: int) -> List[int]:
+        """
+        :param loop_id: the id of a loop in the region
+        :return: the ids of its parent loops outside of the region in stack order
+        """
+        return [parent_id for parent_id in self.knit_graph.stitches.parent_ids(loop_id) if parent_id not in self]
+
+    def external_references(self) -> Dict[int, List[int]]:
+        """
+        :return: the loops in the region that are pulled through loops outside of the region mapped to those parents
+        """
+        references = {}
+        for loop_id in self.loops:
+            external_parents = self.external_parent_ids(loop_id)
+            if len(external_parents) > 0:
+                references[loop_id] = external_parents
+        return references
+
+    def child_ids(self, loop_id: int) -> List[int]:
+        """
+        :param loop_id: the id of a loop in the region
+        :return: the ids of the loops in the region pulled through it
+        """
+        return [child_id for child_id in self.knit_graph.stitches.child_ids(loop_id) if child_id in self]
+
+    def stitches_into(self, loop_ids: Sequence[int]) -> Stitch_Slice:
+        """
+        :param loop_ids: the ids of loops in the region
+        :return: the attributes of the stitch edges from parents in the region into the loops as parallel columns
+        """
+        stitches = self.knit_graph.stitches
+        stitch_slice = stitches.edges_into(loop_ids)
+        if all(parent_id in self for parent_id in stitch_slice.parent_ids):
+            return stitch_slice
+        edge_ids = []
+        child_starts = [0]
+        for index in range(0, len(loop_ids)):
+            for edge_position in range(stitch_slice.child_starts[index], stitch_slice.child_starts[index + 1]):
+                if stitch_slice.parent_ids[edge_position] in self:
+                    edge_ids.append(stitch_slice.edge_ids[edge_position])
+            child_starts.append(len(edge_ids))
+        return Stitch_Slice(stitches, loop_ids, array("i", child_starts), array("i", edge_ids))
+
+    def course_motifs(self, course: int) -> Course_Motifs:
+        """
+        Loops whose parents are all outside of the region are yarn-overs in the region
+        :param course: a course of the view, numbered from 0 at the first course of the region
+        :return: the ids of the yarn-overs, decreases, and cable stitches in the region on that course
+        """
+        return Course_Motifs.from_stitches(self.stitches_into(self.course_loop_ids(course)), cast_on=course == 0)
+
+    def as_networkx(self):
+        """
+        Imports networkx on first use
+        :return: a frozen networkx.DiGraph of the loops and stitches in the region that reads them on demand
+        """
+        from knit_graphs.Networkx_Adapter import Networkx_Stitch_Graph
+        return Networkx_Stitch_Graph(self)
+
+    def __contains__(self, item) -> bool:
+        """
+        :param item: a loop or loop id
+        :return: True if the loop is in the region
+        """
+        loop_id = item.loop_id if isinstance(item, Loop) else item
+        if loop_id not in self.knit_graph.loops:
+            return False
+        course = self.knit_graph.course_index.course_of(loop_id)
+        if course not in self.courses:
+            return False
+        return self.wales is None or self.knit_graph.wale_index.column_of(loop_id) in self.wales
+
+    def __getitem__(self, item: int) -> Loop:
+        """
+        :param item: the id of a loop in the region
+        :return: the Loop with the matching id
+        """
+        if item not in self:
+            raise AttributeError
+        return self.knit_graph.loops[item]
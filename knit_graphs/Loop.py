@@ -1,20 +1,63 @@
 """The Loop data structure"""
-from typing import List, Optional
+from typing import Iterator, Optional, Sequence
+
+
+class Parent_Stack(Sequence):
+    """
+    A read-only view of the parent loops of a loop, read from the stack order kept in the knit graph's stitch storage
+    """
+
+    def __init__(self, knit_graph, child_id: int):
+        """
+        :param knit_graph: the knit graph that holds the child loop
+        :param child_id: the id of the loop pulled through the parents in this stack
+        """
+        self._knit_graph = knit_graph
+        self._child_id: int = child_id
+
+    def __getitem__(self, position: int):
+        """
+        :param position: the position in the stack, 0 at the bottom of the stack, or a slice of positions
+        :return: the parent loop at that position in the stack or a list of the parent loops in the slice
+        """
+        loops = self._knit_graph.loops
+        parent_ids = self._knit_graph.stitches.parent_ids(self._child_id)[position]
+        if isinstance(position, slice):
+            return [loops[parent_id] for parent_id in parent_ids]
+        return loops[parent_ids]
+
+    def __iter__(self) -> Iterator:
+        """
+        :return: iterator over the parent loops from the bottom to the top of the stack
+        """
+        stitches = self._knit_graph.stitches
+        loops = self._knit_graph.loops
+        return (loops[stitches.edge_parents[edge_id]] for edge_id in stitches.parent_edges(self._child_id))
+
+    def __len__(self) -> int:
+        """
+        :return: the number of parent loops in the stack
+        """
+        return sum(1 for _ in self._knit_graph.stitches.parent_edges(self._child_id))
 
 
 class Loop:
     """
     A class to represent a single loop structure
+    Loops are compact __slots__ objects. Once a loop is added to a Knit_Graph it becomes a lightweight handle:
+     its fields are read from the graph's Loop_Table and its parent loops from the graph's stitch storage.
+    Parent loops are only stored in the stitch storage, so a loop has no parents until it is in a knit graph.
     ...
 
     Attributes
     ----------
     is_twisted: bool
         True if the loop is twisted
-    parent_loops: List[Loop]
-        The list of loops that this loop is pulled through.
-        The order in the list implies the stacking order with the first loop at the bottom the stack
+    parent_loops: Sequence[Loop]
+        A view of the loops that this loop is pulled through.
+        The order in the sequence implies the stacking order with the first loop at the bottom the stack
     """
+    __slots__ = ("_loop_id", "_yarn_id", "_is_twisted", "_knit_graph")
 
     def __init__(self, loop_id: int, yarn_id: str, is_twisted: bool = False):
         """
@@ -23,23 +66,37 @@ class Loop:
         :param is_twisted: True if the loop should be twisted
             (created by pulling a carrier backwards across the needle)
         """
+        self._knit_graph = None
         self.is_twisted = is_twisted
         assert loop_id >= 0, f"{loop_id}: Loop_id must be non-negative"
         self._loop_id: int = loop_id
         self.yarn_id = yarn_id
-        self.parent_loops: List[Loop] = []
+
+    def bind(self, knit_graph):
+        """
+        Makes this loop a handle over the loop and stitch storage of the knit graph it was added to
+        :param knit_graph: the knit graph that holds this loop
+        """
+        self._knit_graph = knit_graph
+
+    @property
+    def parent_loops(self) -> Sequence:
+        """
+        :return: The loops that this loop is pulled through in stack order, bottom of the stack first
+        """
+        if self._knit_graph is None:
+            return ()
+        return Parent_Stack(self._knit_graph, self._loop_id)
 
     def add_parent_loop(self, parent, stack_position: Optional[int] = None):
         """
-        Adds the parent Loop onto the stack of parent_loops.
-        Top of the stack is the last index in the parent_loops list
+        Adds the parent Loop onto the stack of parent_loops by connecting the loops in their knit graph.
+        Top of the stack is the last index in the parent_loops sequence
         :param parent: the Loop to be added onto the stack
         :param stack_position: The position to insert the parent into, if None add on top of the stack
         """
-        if stack_position is None:
-            self.parent_loops.append(parent)
-        else:
-            self.parent_loops.insert(stack_position, parent)
+        assert self._knit_graph is not None, f"Loop {self._loop_id} must be in a knit graph to have parent loops"
+        self._knit_graph.connect_loops(parent.loop_id, self._loop_id, stack_position=stack_position)
 
     @property
     def loop_id(self) -> int:
@@ -51,10 +108,12 @@ class Loop:
     def prior_loop_id(self, knitGraph) -> Optional[int]:
         """
         :param knitGraph: the knitgraph to check for prior loops
-        :return: the id of the loop that comes before this in the knitgraph
+        :return: the id of the loop that comes before this in the knitgraph, skipping the ids of removed loops
         """
         prior_id = self.loop_id - 1
-        if knitGraph.graph.has_node(prior_id):
+        while prior_id >= 0 and not knitGraph.graph.has_node(prior_id):
+            prior_id -= 1
+        if prior_id >= 0:
             return prior_id
         else:
             return None
@@ -62,10 +121,12 @@ class Loop:
     def next_loop_id(self, knitGraph) -> Optional[int]:
         """
         :param knitGraph: the knitgraph to check for next loops
-        :return: the id of the loop that comes after this in the knitgraph
+        :return: the id of the loop that comes after this in the knitgraph, skipping the ids of removed loops
         """
         next_id = self.loop_id + 1
-        if knitGraph.graph.has_node(next_id):
+        while next_id <= knitGraph.last_loop_id and not knitGraph.graph.has_node(next_id):
+            next_id += 1
+        if next_id <= knitGraph.last_loop_id:
             return next_id
         else:
             return None
@@ -75,11 +136,16 @@ class Loop:
         """
         :return: True if the loop is twisted
         """
-        return self._is_twisted
+        if self._knit_graph is None:
+            return self._is_twisted
+        return self._knit_graph.loops.is_twisted(self._loop_id)
 
     @is_twisted.setter
     def is_twisted(self, is_twisted: bool):
-        self._is_twisted = is_twisted
+        if self._knit_graph is None:
+            self._is_twisted = is_twisted
+        else:
+            self._knit_graph.loops.set_twisted(self._loop_id, is_twisted)
 
     @property
     def yarn_id(self) -> str:
@@ -90,6 +156,7 @@ class Loop:
 
     @yarn_id.setter
     def yarn_id(self, yarn_id: str):
+        assert self._knit_graph is None, f"Cannot move loop {self._loop_id} to another yarn after it is in a knit graph"
         self._yarn_id: str = yarn_id
 
     def __hash__(self):
@@ -0,0 +1,172 @@
+"""A struct-of-arrays table that stores the loops of a knit graph"""
+from array import array
+from typing import Dict, Iterator, List, Mapping, Sequence
+
+from knit_graphs.Columns import copy_column
+from knit_graphs.Loop import Loop
+
+NO_YARN = -1
+
+
+class Loop_Table(Mapping):
+    """
+    A class to store the fields of every loop in a knit graph in per-field arrays indexed by loop id.
+    Loop objects are not kept by the table; indexing the table returns a lightweight Loop handle over these arrays
+    ...
+
+    Attributes
+    ----------
+    loop_yarns: array
+        The index of the yarn that makes each loop (see yarn_ids), NO_YARN if there is no loop at that id
+    loop_twists: array
+        1 if the loop is twisted, 0 otherwise
+    yarn_ids: List[str]
+        The ids of the yarns referenced by loop_yarns, in the order they were first used
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph whose loops are stored in this table
+        """
+        self._knit_graph = knit_graph
+        self.loop_yarns: array = array("h")
+        self.loop_twists: array = array("b")
+        self.yarn_ids: List[str] = []
+        self._yarn_indices: Dict[str, int] = {}
+        self._loop_count: int = 0
+        self._shared: bool = False  # True while the columns are shared with a loaded file or a fork
+
+    def _copy_shared_columns(self):
+        """
+        Replaces columns shared with a loaded file or a fork with private copies before the table is modified
+        """
+        self.loop_yarns = copy_column(self.loop_yarns)
+        self.loop_twists = copy_column(self.loop_twists)
+        self._shared = False
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this table's knit graph
+        :return: a copy of this table in the forked knit graph that shares its columns until either table is modified
+        """
+        fork = Loop_Table(knit_graph)
+        fork.loop_yarns = self.loop_yarns
+        fork.loop_twists = self.loop_twists
+        fork.yarn_ids = [*self.yarn_ids]
+        fork._yarn_indices = dict(self._yarn_indices)
+        fork._loop_count = self._loop_count
+        fork._shared = self._shared = True
+        return fork
+
+    def add_loop(self, loop: Loop):
+        """
+        Records the fields of the loop in the table and binds the loop to the table's knit graph
+        :param loop: the loop to add
+        """
+        loop_id = loop.loop_id
+        assert loop_id not in self, f"Loop {loop_id} is already in the knit graph"
+        if self._shared:
+            self._copy_shared_columns()
+        missing = loop_id + 1 - len(self.loop_yarns)
+        if missing > 0:
+            self.loop_yarns.extend(array("h", [NO_YARN]) * missing)
+            self.loop_twists.extend(bytes(missing))
+        yarn_id = loop.yarn_id
+        if yarn_id not in self._yarn_indices:
+            self._yarn_indices[yarn_id] = len(self.yarn_ids)
+            self.yarn_ids.append(yarn_id)
+        self.loop_yarns[loop_id] = self._yarn_indices[yarn_id]
+        self.loop_twists[loop_id] = 1 if loop.is_twisted else 0
+        self._loop_count += 1
+        loop.bind(self._knit_graph)
+
+    def add_loops(self, loop_ids: range, yarn_id: str, twists: Sequence[int]):
+        """
+        Records a block of consecutive new loops in the table
+        :param loop_ids: the ids of the new loops, all larger than the ids in the table
+        :param yarn_id: the id of the yarn that makes the loops
+        :param twists: 1 for each loop that is twisted, 0 otherwise
+        """
+        assert loop_ids.step == 1 and loop_ids.start >= len(self.loop_yarns), \
+            f"Loops {loop_ids} must follow the loops in the knit graph"
+        if self._shared:
+            self._copy_shared_columns()
+        if yarn_id not in self._yarn_indices:
+            self._yarn_indices[yarn_id] = len(self.yarn_ids)
+            self.yarn_ids.append(yarn_id)
+        gap = loop_ids.start - len(self.loop_yarns)
+        self.loop_yarns.extend(array("h", [NO_YARN]) * gap + array("h", [self._yarn_indices[yarn_id]]) * len(loop_ids))
+        self.loop_twists.extend(bytes(gap))
+        self.loop_twists.extend(array("b", twists))
+        self._loop_count += len(loop_ids)
+
+    def remove_loop(self, loop_id: int):
+        """
+        Marks the loop removed in O(1), its id is free until the table is compacted
+        :param loop_id: the id of the loop to remove
+        """
+        assert loop_id in self, f"Loop {loop_id} is not in the knit graph"
+        if self._shared:
+            self._copy_shared_columns()
+        self.loop_yarns[loop_id] = NO_YARN
+        self.loop_twists[loop_id] = 0
+        self._loop_count -= 1
+
+    def compact(self, live_loop_ids: array):
+        """
+        Drops removed loops so that the kept loops are numbered from 0 in order
+        :param live_loop_ids: the old ids of the loops that are kept, in ascending order
+        """
+        self.loop_yarns = array("h", map(self.loop_yarns.__getitem__, live_loop_ids))
+        self.loop_twists = array("b", map(self.loop_twists.__getitem__, live_loop_ids))
+        self._loop_count = len(live_loop_ids)
+        self._shared = False
+
+    def yarn_id(self, loop_id: int) -> str:
+        """
+        :param loop_id: the id of the loop
+        :return: the id of the yarn that makes the loop
+        """
+        return self.yarn_ids[self.loop_yarns[loop_id]]
+
+    def is_twisted(self, loop_id: int) -> bool:
+        """
+        :param loop_id: the id of the loop
+        :return: True if the loop is twisted
+        """
+        return self.loop_twists[loop_id] == 1
+
+    def set_twisted(self, loop_id: int, is_twisted: bool):
+        """
+        :param loop_id: the id of the loop
+        :param is_twisted: True if the loop should be twisted
+        """
+        if self._shared:
+            self._copy_shared_columns()
+        self.loop_twists[loop_id] = 1 if is_twisted else 0
+        self._knit_graph.structural_hash.loop_changed(loop_id)
+
+    def __getitem__(self, loop_id: int) -> Loop:
+        """
+        :param loop_id: the id of the loop
+        :return: a Loop handle over the table entry for that loop
+        """
+        if loop_id not in self:
+            raise KeyError(loop_id)
+        loop = Loop(loop_id, self.yarn_ids[self.loop_yarns[loop_id]])
+        loop.bind(self._knit_graph)
+        return loop
+
+    def __contains__(self, loop_id) -> bool:
+        return type(loop_id) is int and 0 <= loop_id < len(self.loop_yarns) and self.loop_yarns[loop_id] != NO_YARN
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        :return: iterator over the loop ids in the table in ascending order
+        """
+        if self._loop_count == len(self.loop_yarns):
+            return iter(range(0, self._loop_count))
+        return (loop_id for loop_id, yarn in enumerate(self.loop_yarns) if yarn != NO_YARN)
+
+    def __len__(self) -> int:
+        return self._loop_count
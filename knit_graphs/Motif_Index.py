@@ -0,0 +1,259 @@
+"""An incrementally maintained index of the decreases, cables, and yarn-overs in a knit graph"""
+from array import array
+from bisect import bisect_left
+from typing import Sequence
+
+from knit_graphs.Columns import copy_column
+from knit_graphs.Loop_Table import NO_YARN
+from knit_graphs.Stitch_Storage import Stitch_Slice
+
+NO_MOTIF = 0  # a knit or purl stitch, or no loop at that id
+YARN_OVER = 1  # a loop without parents
+DECREASE = 2  # a loop pulled through more than one parent
+CABLE = 3  # a loop pulled through one parent with a stitch that crosses other stitches
+
+
+def _slice_motifs(stitches: Stitch_Slice) -> array:
+    """
+    :param stitches: the stitch edges into a set of loops
+    :return: the motif of each loop in the slice
+    """
+    motifs = array("b", [NO_MOTIF]) * (len(stitches.child_starts) - 1)
+    depths = stitches.depths
+    for index, (start, stop) in enumerate(zip(stitches.child_starts, stitches.child_starts[1:])):
+        if start == stop:
+            motifs[index] = YARN_OVER
+        elif stop - start > 1:
+            motifs[index] = DECREASE
+        elif depths[start] != 0:
+            motifs[index] = CABLE
+    return motifs
+
+
+class Course_Motifs:
+    """
+    A class holding the ids of the loops of one course that need more than a knit or purl, each in ascending order.
+    Planners can skip the transfer passes of a course whose motifs are empty
+    ...
+
+    Attributes
+    ----------
+    yarn_over_ids: Sequence[int]
+        The loops without parents on the course. Empty on the first course, its loops are the cast-on
+    decrease_ids: Sequence[int]
+        The loops pulled through more than one parent on the course
+    cable_ids: Sequence[int]
+        The loops pulled through one parent with a crossing depth other than 0 on the course
+    """
+
+    def __init__(self, yarn_over_ids: Sequence[int], decrease_ids: Sequence[int], cable_ids: Sequence[int]):
+        self.yarn_over_ids: Sequence[int] = yarn_over_ids
+        self.decrease_ids: Sequence[int] = decrease_ids
+        self.cable_ids: Sequence[int] = cable_ids
+
+    @staticmethod
+    def from_stitches(stitches: Stitch_Slice, cast_on: bool = False):
+        """
+        Classifies the loops of a course from its stitch edges, e.g., for a region view whose parents are filtered
+        :param stitches: the stitch edges into the loops of a course
+        :param cast_on: True if the course is the first course, whose loops are not yarn-overs
+        :return: the motifs of the course
+        """
+        motif_ids = {YARN_OVER: array("i"), DECREASE: array("i"), CABLE: array("i")}
+        for loop_id, motif in zip(stitches.child_ids, _slice_motifs(stitches)):
+            if motif != NO_MOTIF:
+                motif_ids[motif].append(loop_id)
+        if cast_on:
+            motif_ids[YARN_OVER] = array("i")
+        return Course_Motifs(motif_ids[YARN_OVER], motif_ids[DECREASE], motif_ids[CABLE])
+
+    @property
+    def is_plain(self) -> bool:
+        """
+        :return: True if the course has only knit and purl stitches
+        """
+        return len(self.yarn_over_ids) == 0 and len(self.decrease_ids) == 0 and len(self.cable_ids) == 0
+
+
+class Motif_Index:
+    """
+    A class to maintain the motif of each loop in a knit graph as loops are added and connected,
+     with the ids of the loops of each motif in ascending order.
+    A loop's motif depends only on its own parent stack, so each new stitch reclassifies one loop,
+     and the loops of a motif in a course are found by bisecting its ids at the course's first and last loop
+    ...
+
+    Attributes
+    ----------
+    loop_motifs: array
+        The motif of each loop (NO_MOTIF, YARN_OVER, DECREASE, or CABLE), indexed by loop id
+    yarn_over_ids: array
+        The ids of the loops without parents in ascending order, including the loops of the first course
+    decrease_ids: array
+        The ids of the loops pulled through more than one parent in ascending order
+    cable_ids: array
+        The ids of the loops pulled through one parent with a crossing depth other than 0 in ascending order
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph to index
+        """
+        self._knit_graph = knit_graph
+        self.loop_motifs: array = array("b")
+        self.yarn_over_ids: array = array("i")
+        self.decrease_ids: array = array("i")
+        self.cable_ids: array = array("i")
+        self._shared: bool = False  # True while the columns are shared with a loaded file or a fork
+
+    def _copy_shared_columns(self):
+        """
+        Replaces columns shared with a loaded file or a fork with private copies before the index is modified
+        """
+        self.loop_motifs = copy_column(self.loop_motifs)
+        self.yarn_over_ids = copy_column(self.yarn_over_ids)
+        self.decrease_ids = copy_column(self.decrease_ids)
+        self.cable_ids = copy_column(self.cable_ids)
+        self._shared = False
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this index's knit graph
+        :return: a copy of this index for the forked knit graph that shares its columns until either index is modified
+        """
+        fork = Motif_Index(knit_graph)
+        fork.loop_motifs = self.loop_motifs
+        fork.yarn_over_ids = self.yarn_over_ids
+        fork.decrease_ids = self.decrease_ids
+        fork.cable_ids = self.cable_ids
+        fork._shared = self._shared = True
+        return fork
+
+    def _motif_ids(self, motif: int) -> array:
+        """
+        :param motif: YARN_OVER, DECREASE, or CABLE
+        :return: the ids of the loops with that motif
+        """
+        if motif == YARN_OVER:
+            return self.yarn_over_ids
+        elif motif == DECREASE:
+            return self.decrease_ids
+        return self.cable_ids
+
+    def _set_motif(self, loop_id: int, motif: int):
+        """
+        Moves the loop from the ids of its prior motif to the ids of its new motif.
+        Loops are usually reclassified right after they are added, so the ids move at the end of each column
+        :param loop_id: the id of a loop in the index
+        :param motif: the new motif of the loop
+        """
+        prior_motif = self.loop_motifs[loop_id]
+        if prior_motif == motif:
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        if prior_motif != NO_MOTIF:
+            motif_ids = self._motif_ids(prior_motif)
+            del motif_ids[bisect_left(motif_ids, loop_id)]
+        if motif != NO_MOTIF:
+            motif_ids = self._motif_ids(motif)
+            motif_ids.insert(bisect_left(motif_ids, loop_id), loop_id)
+        self.loop_motifs[loop_id] = motif
+
+    def _classify(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph, or of a removed loop
+        :return: the motif of the loop from its current parent stack
+        """
+        if self._knit_graph.loops.loop_yarns[loop_id] == NO_YARN:
+            return NO_MOTIF
+        stitches = self._knit_graph.stitches
+        parent_edges = [*stitches.parent_edges(loop_id)]
+        if len(parent_edges) == 0:
+            return YARN_OVER
+        elif len(parent_edges) > 1:
+            return DECREASE
+        elif stitches.edge_depths[parent_edges[0]] != 0:
+            return CABLE
+        return NO_MOTIF
+
+    def add_loop(self, loop_id: int):
+        """
+        Indexes a new loop, which has no parents yet, as a yarn-over until it is connected to its parents
+        :param loop_id: the id of the loop added to the knit graph
+        """
+        if self._shared:
+            self._copy_shared_columns()
+        missing = loop_id + 1 - len(self.loop_motifs)
+        if missing > 0:
+            self.loop_motifs.extend(array("b", [NO_MOTIF]) * missing)
+        self._set_motif(loop_id, YARN_OVER)
+
+    def add_loops(self, loop_ids: range):
+        """
+        Indexes a block of new loops whose stitch edges are already in the knit graph
+        :param loop_ids: the ids of the new loops in the order of creation
+        """
+        if len(loop_ids) == 0:
+            return
+        if loop_ids.start < len(self.loop_motifs) or loop_ids.step != 1:
+            for loop_id in loop_ids:
+                self.add_loop(loop_id)
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        motifs = _slice_motifs(self._knit_graph.stitches.edges_into(loop_ids))
+        self.loop_motifs.extend(array("b", [NO_MOTIF]) * (loop_ids.start - len(self.loop_motifs)))
+        self.loop_motifs.extend(motifs)
+        # the new ids are after every indexed loop, so they extend each column in order
+        for loop_id, motif in zip(loop_ids, motifs):
+            if motif != NO_MOTIF:
+                self._motif_ids(motif).append(loop_id)
+
+    def add_stitch(self, child_id: int):
+        """
+        Reclassifies the child loop of a new stitch from its prior motif, without reading its parent stack:
+         the first stitch into a yarn-over makes a knit, purl, or cable stitch and any further stitch a decrease
+        :param child_id: the id of the child loop in a new stitch
+        """
+        if self.loop_motifs[child_id] == YARN_OVER:
+            stitches = self._knit_graph.stitches
+            motif = CABLE if stitches.edge_depths[stitches.first_parent_edge(child_id)] != 0 else NO_MOTIF
+        else:
+            motif = DECREASE
+        self._set_motif(child_id, motif)
+
+    def loop_changed(self, loop_id: int):
+        """
+        Reclassifies a loop from its parent stack
+        :param loop_id: the id of a loop whose parent stitches changed or that was removed from the knit graph
+        """
+        self._set_motif(loop_id, self._classify(loop_id))
+
+    def compact(self, loop_remap: array, live_loop_ids: array):
+        """
+        Renumbers the indexed loops after the knit graph is compacted, removed loops are already NO_MOTIF
+        :param loop_remap: the new id of each old loop id
+        :param live_loop_ids: the old ids of the loops that are kept, in ascending order
+        """
+        self.loop_motifs = array("b", map(self.loop_motifs.__getitem__, live_loop_ids))
+        self.yarn_over_ids = array("i", map(loop_remap.__getitem__, self.yarn_over_ids))
+        self.decrease_ids = array("i", map(loop_remap.__getitem__, self.decrease_ids))
+        self.cable_ids = array("i", map(loop_remap.__getitem__, self.cable_ids))
+        self._shared = False
+
+    def motif_of(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph
+        :return: the motif of the loop
+        """
+        return self.loop_motifs[loop_id]
+
+    def motifs_between(self, start: int, stop: int) -> Course_Motifs:
+        """
+        :param start: the first loop id of a run of loops, e.g., a course
+        :param stop: the loop id after the run
+        :return: the loops of each motif in the run, as slices of the motif columns
+        """
+        motif_ids = [self.yarn_over_ids, self.decrease_ids, self.cable_ids]
+        return Course_Motifs(*[ids[bisect_left(ids, start):bisect_left(ids, stop)] for ids in motif_ids])
@@ -0,0 +1,87 @@
+"""
+A read-only networkx.DiGraph over the storage of a knit graph, for analysis scripts that run networkx algorithms.
+This module imports networkx, so it is only imported by Knit_Graph.as_networkx() when an adapter is requested
+"""
+from typing import Iterator, Mapping
+
+import networkx
+
+from knit_graphs.Stitch_Graph_View import Edge_Data, Stitch_Graph_View
+
+
+class _Successor_Map(Mapping):
+    """
+    A read-only mapping of each loop to the mapping of its children to the data on the edges that connect them
+    """
+
+    def __init__(self, graph: Stitch_Graph_View):
+        self._graph: Stitch_Graph_View = graph
+
+    def __getitem__(self, parent_id: int) -> Mapping[int, Edge_Data]:
+        return self._graph[parent_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._graph)
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __contains__(self, loop_id) -> bool:
+        return loop_id in self._graph
+
+
+class _Parent_Adjacency(Mapping):
+    """
+    A read-only mapping of the parents of one child loop, in stack order, to the data on the edges that connect them
+    """
+
+    def __init__(self, graph: Stitch_Graph_View, child_id: int):
+        self._graph: Stitch_Graph_View = graph
+        self._child_id: int = child_id
+
+    def __getitem__(self, parent_id: int) -> Edge_Data:
+        if not self._graph.has_edge(parent_id, self._child_id):
+            raise KeyError(parent_id)
+        return self._graph[parent_id][self._child_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return self._graph.predecessors(self._child_id)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._graph.predecessors(self._child_id))
+
+
+class _Predecessor_Map(_Successor_Map):
+    """
+    A read-only mapping of each loop to the mapping of its parents to the data on the edges that connect them
+    """
+
+    def __getitem__(self, child_id: int) -> _Parent_Adjacency:
+        if child_id not in self._graph:
+            raise KeyError(child_id)
+        return _Parent_Adjacency(self._graph, child_id)
+
+
+class Networkx_Stitch_Graph(networkx.DiGraph):
+    """
+    A frozen networkx.DiGraph whose node and adjacency dictionaries are replaced by mappings that read the loops and
+     stitches of a knit graph, or a region view of one, on demand.
+    Nodes are loop ids with a "loop" attribute, edges go from parent to child loops with the "pull_direction", "depth",
+     and "parent_offset" attributes; nothing is copied when the adapter is made, and it reflects later changes to the
+     knit graph. networkx algorithms, node and edge views, degree views, and subgraph views read it like any DiGraph,
+     while methods that modify it raise networkx.NetworkXError
+    """
+
+    def __init__(self, knit_graph=None, **attr):
+        """
+        :param knit_graph: the knit graph or Knit_Graph_View to present. networkx creates empty graphs of this class
+         for copies and subgraph views, those are ordinary DiGraphs
+        :param attr: graph attributes
+        """
+        super().__init__(**attr)
+        if knit_graph is not None:
+            graph = knit_graph.graph
+            self._node = graph.nodes
+            self._succ = self._adj = _Successor_Map(graph)
+            self._pred = _Predecessor_Map(graph)
+            networkx.freeze(self)
@@ -0,0 +1,38 @@
+"""The directions that a loop can be pulled through its parent loops"""
+from enum import Enum
+
+
+class Pull_Direction(Enum):
+    """An enumerator of the two pull directions of a loop"""
+    BtF = "BtF" # purl
+    FtB = "FtB" # knit
+
+    def opposite(self):
+        """
+        :return: returns the opposite pull direction of self
+        """
+        if self is Pull_Direction.BtF:
+            return Pull_Direction.FtB
+        else:
+            return Pull_Direction.BtF
+
+    @property
+    def code(self) -> int:
+        """
+        :return: the small integer used to store this pull direction in array-backed stitch storage
+        """
+        if self is Pull_Direction.BtF:
+            return 0
+        else:
+            return 1
+
+    @staticmethod
+    def from_code(code: int):
+        """
+        :param code: a pull direction code produced by Pull_Direction.code
+        :return: the pull direction stored under that code
+        """
+        if code == 0:
+            return Pull_Direction.BtF
+        else:
+            return Pull_Direction.FtB
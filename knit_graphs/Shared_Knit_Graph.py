@@ -0,0 +1,94 @@
+"""Knit graphs published in shared memory so that worker processes can read them without copying"""
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from knit_graphs.Knit_Graph import Knit_Graph
+from knit_graphs.Knit_Graph_File import knit_graph_size, read_knit_graph_from_buffer, write_knit_graph_to_buffer
+
+
+class Shared_Knit_Graph:
+    """
+    A class to hold a knit graph in a block of shared memory, laid out in the knit graph file format.
+    The publishing process copies the graph into the block once; every process that attaches to the block by name
+     gets a knit graph whose columns are read-only views of the block, so attaching costs time proportional to the
+     number of yarns and N workers share one copy of the graph.
+    Like a memory-mapped file, an attached graph copies its columns into the process the first time it is modified.
+    A Shared_Knit_Graph pickles as its name, so it can be passed to a multiprocessing pool and attached by the workers.
+    On Python versions before 3.13 the block is tracked by the resource tracker of each process that attaches to it,
+     so workers should be started with multiprocessing by the publishing process to share its resource tracker
+    ...
+
+    Attributes
+    ----------
+    knit_graph: Knit_Graph
+        The knit graph in the block of shared memory. None once the block is closed
+    """
+
+    def __init__(self, shared_memory: SharedMemory, owner: bool):
+        """
+        :param shared_memory: the block of shared memory holding the knit graph
+        :param owner: True if this process published the knit graph and unlinks the block
+        """
+        self._shared_memory: SharedMemory = shared_memory
+        self._owner: bool = owner
+        self.knit_graph: Optional[Knit_Graph] = read_knit_graph_from_buffer(shared_memory.buf.toreadonly(), True,
+                                                                            shared_memory.name)
+
+    @staticmethod
+    def publish(knit_graph: Knit_Graph, name: Optional[str] = None):
+        """
+        Copies the knit graph into a new block of shared memory
+        :param knit_graph: the knit graph to publish
+        :param name: the name of the block, by default a unique name is generated
+        :return: the published knit graph, owned by this process
+        """
+        shared_memory = SharedMemory(name=name, create=True, size=knit_graph_size(knit_graph))
+        write_knit_graph_to_buffer(knit_graph, shared_memory.buf)
+        return Shared_Knit_Graph(shared_memory, owner=True)
+
+    @staticmethod
+    def attach(name: str):
+        """
+        :param name: the name of a block of shared memory holding a published knit graph
+        :return: the knit graph in the block, as read-only views of the block
+        """
+        try:
+            shared_memory = SharedMemory(name=name, track=False)
+        except TypeError:  # the track parameter was added in Python 3.13
+            shared_memory = SharedMemory(name=name)
+        return Shared_Knit_Graph(shared_memory, owner=False)
+
+    @property
+    def name(self) -> str:
+        """
+        :return: the name that other processes attach to the knit graph with
+        """
+        return self._shared_memory.name
+
+    def close(self):
+        """
+        Releases this process's views of the block; the knit graph, and forks and views of it, can no longer be read.
+        The owner also unlinks the block
+        """
+        if self.knit_graph is None:
+            return
+        knit_graph = self.knit_graph
+        self.knit_graph = None
+        # the graph's columns are released now rather than when the graph's reference cycles are collected
+        for storage in (knit_graph.loops, knit_graph.stitches, knit_graph.course_index, knit_graph.wale_index,
+                        knit_graph.motif_index, *knit_graph.yarns.values()):
+            for column in vars(storage).values():
+                if isinstance(column, memoryview):
+                    column.release()
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        return Shared_Knit_Graph.attach, (self.name,)
@@ -0,0 +1,192 @@
+"""Read-only views that present array-backed stitch storage through the parts of the networkx DiGraph API we use"""
+from typing import Dict, Iterator, Mapping, Tuple
+
+from knit_graphs.Pull_Direction import Pull_Direction
+from knit_graphs.Stitch_Storage import Stitch_Storage
+
+
+class Edge_Data(Mapping):
+    """
+    A read-only mapping of the "pull_direction", "depth", and "parent_offset" attributes of one stitch edge
+    """
+    _keys = ("pull_direction", "depth", "parent_offset")
+
+    def __init__(self, stitches: Stitch_Storage, edge_id: int):
+        """
+        :param stitches: the storage holding the edge
+        :param edge_id: the id of the edge in storage
+        """
+        self._stitches: Stitch_Storage = stitches
+        self._edge_id: int = edge_id
+
+    def __getitem__(self, key: str):
+        if key == "pull_direction":
+            return Pull_Direction.from_code(self._stitches.edge_pull_directions[self._edge_id])
+        elif key == "depth":
+            return self._stitches.edge_depths[self._edge_id]
+        elif key == "parent_offset":
+            return self._stitches.edge_offsets[self._edge_id]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def copy(self) -> Dict[str, object]:
+        """
+        :return: a dictionary of the edge's attributes, as networkx copies edge data when it copies a graph
+        """
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _Child_Adjacency(Mapping):
+    """
+    A read-only mapping of the children of one parent loop to the data on the edges that connect them
+    """
+
+    def __init__(self, stitches: Stitch_Storage, parent_id: int):
+        self._stitches: Stitch_Storage = stitches
+        self._parent_id: int = parent_id
+
+    def __getitem__(self, child_id: int) -> Edge_Data:
+        edge_id = self._stitches.find_edge(self._parent_id, child_id)
+        if edge_id is None:
+            raise KeyError(child_id)
+        return Edge_Data(self._stitches, edge_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._stitches.child_ids(self._parent_id))
+
+    def __len__(self) -> int:
+        return len(self._stitches.child_ids(self._parent_id))
+
+
+class _Node_View(Mapping):
+    """
+    A read-only mapping of loop ids to their node attributes ({"loop": Loop}) in graph order
+    """
+
+    def __init__(self, knit_graph):
+        self._knit_graph = knit_graph
+
+    def __getitem__(self, loop_id: int) -> Dict[str, object]:
+        return {"loop": self._knit_graph.loops[loop_id]}
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._knit_graph.loops)
+
+    def __len__(self) -> int:
+        return len(self._knit_graph.loops)
+
+    def __contains__(self, loop_id) -> bool:
+        return loop_id in self._knit_graph.loops
+
+
+class _Edge_View:
+    """
+    A read-only collection of (parent_id, child_id) stitch edges ordered by parent loop
+    """
+
+    def __init__(self, knit_graph):
+        self._knit_graph = knit_graph
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        stitches = self._knit_graph.stitches
+        for parent_id in self._knit_graph.loops:
+            for child_id in stitches.child_ids(parent_id):
+                yield parent_id, child_id
+
+    def __len__(self) -> int:
+        return len(self._knit_graph.stitches)
+
+    def __contains__(self, edge) -> bool:
+        parent_id, child_id = edge
+        return self._knit_graph.stitches.find_edge(parent_id, child_id) is not None
+
+
+class Stitch_Graph_View:
+    """
+    A read-only view of a knit graph that answers the networkx.DiGraph queries made by the knitout generator
+    and visualizer (nodes, edges, predecessors, successors, and graph[parent][child] edge data)
+     directly from the array-backed stitch storage
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the Knit_Graph to view
+        """
+        self._knit_graph = knit_graph
+
+    @property
+    def nodes(self) -> _Node_View:
+        """
+        :return: a mapping of loop ids to their node attributes in the order the loops were added
+        """
+        return _Node_View(self._knit_graph)
+
+    @property
+    def edges(self) -> _Edge_View:
+        """
+        :return: the (parent_id, child_id) stitch edges
+        """
+        return _Edge_View(self._knit_graph)
+
+    def has_node(self, loop_id: int) -> bool:
+        """
+        :param loop_id: the id of the loop
+        :return: True if the loop is in the graph
+        """
+        return loop_id in self._knit_graph.loops
+
+    def has_edge(self, parent_id: int, child_id: int) -> bool:
+        """
+        :param parent_id: the id of the parent loop
+        :param child_id: the id of the child loop
+        :return: True if the child is pulled through the parent
+        """
+        return self._knit_graph.stitches.find_edge(parent_id, child_id) is not None
+
+    def predecessors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of the child loop
+        :return: iterator over the parent loop ids in stack order
+        """
+        return iter(self._knit_graph.stitches.parent_ids(loop_id))
+
+    def successors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of the parent loop
+        :return: iterator over the child loop ids
+        """
+        return iter(self._knit_graph.stitches.child_ids(loop_id))
+
+    def number_of_nodes(self) -> int:
+        """
+        :return: the number of loops in the graph
+        """
+        return len(self._knit_graph.loops)
+
+    def number_of_edges(self) -> int:
+        """
+        :return: the number of stitch edges in the graph
+        """
+        return len(self._knit_graph.stitches)
+
+    def __getitem__(self, parent_id: int) -> _Child_Adjacency:
+        if parent_id not in self._knit_graph.loops:
+            raise KeyError(parent_id)
+        return _Child_Adjacency(self._knit_graph.stitches, parent_id)
+
+    def __contains__(self, loop_id) -> bool:
+        return loop_id in self._knit_graph.loops
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._knit_graph.loops)
+
+    def __len__(self) -> int:
+        return len(self._knit_graph.loops)
@@ -0,0 +1,442 @@
+"""Array-backed storage for the stitch edges of a knit graph"""
+from array import array
+from typing import Iterator, List, Optional, Sequence
+
+from knit_graphs.Columns import Column, copy_column, writable_column
+
+NO_EDGE = -1
+REMOVED_LOOP = -1  # the parent and child of a removed edge
+
+
+def _gather_column(column: Column, indices: Sequence[int], remap: Optional[Column] = None) -> array:
+    """
+    :param column: a column of the storage
+    :param indices: the indices of the values to keep in order
+    :param remap: if given, the new value of each kept value
+    :return: an array of the kept values
+    """
+    values = map(column.__getitem__, indices)
+    if remap is not None:
+        values = map(remap.__getitem__, values)
+    return array(column.typecode if isinstance(column, array) else column.format, values)
+
+
+class Stitch_Storage:
+    """
+    A class to store stitch edges in contiguous integer columns instead of networkx nodes and edge dictionaries.
+    Edges are threaded into per-loop adjacency lists in a forward-star layout:
+     each loop stores the first edge of its parent stack and of its child list,
+     and each edge stores the next edge in both lists.
+    Edge ids never move, so edges can be appended in O(1) and inserted into a parent stack in O(stack size).
+    Removed edges are unthreaded from the adjacency lists of their loops and left in the columns with REMOVED_LOOP ends
+     until the storage is compacted
+    ...
+
+    Attributes
+    ----------
+    edge_parents: array
+        The parent loop id of each stitch edge, indexed by edge id
+    edge_children: array
+        The child loop id of each stitch edge, indexed by edge id
+    edge_pull_directions: array
+        The Pull_Direction code of each stitch edge
+    edge_depths: array
+        The cable crossing depth (-1, 0, 1) of each stitch edge
+    edge_offsets: array
+        The offset from the child to the parent loop of each stitch edge
+    edge_stack_positions: array
+        The position of each stitch edge in its child's parent stack, 0 at the bottom of the stack
+    """
+
+    _column_names = ("edge_parents", "edge_children", "edge_pull_directions", "edge_depths", "edge_offsets",
+                     "edge_stack_positions", "_next_parent_edge", "_next_child_edge", "_first_parent_edge",
+                     "_first_child_edge", "_last_child_edge")
+
+    def __init__(self):
+        self.edge_parents: array = array("i")
+        self.edge_children: array = array("i")
+        self.edge_pull_directions: array = array("b")
+        self.edge_depths: array = array("b")
+        self.edge_offsets: array = array("h")
+        self.edge_stack_positions: array = array("h")
+        self._next_parent_edge: array = array("i")  # next edge up the child's parent stack
+        self._next_child_edge: array = array("i")  # next edge in the parent's child list
+        self._first_parent_edge: array = array("i")  # indexed by loop id, the bottom of the loop's parent stack
+        self._first_child_edge: array = array("i")  # indexed by loop id, the first child edge of the loop
+        self._last_child_edge: array = array("i")  # indexed by loop id, the last child edge of the loop
+        self._removed_edge_count: int = 0
+        self._shared: bool = False  # True while the columns are shared with a loaded file or a fork
+
+    def _copy_shared_columns(self):
+        """
+        Replaces columns shared with a loaded file or a fork with private copies before the storage is modified
+        """
+        for name in self._column_names:
+            setattr(self, name, copy_column(getattr(self, name)))
+        self._shared = False
+
+    def fork(self) -> "Stitch_Storage":
+        """
+        :return: a copy of this storage that shares its columns until either storage is modified
+        """
+        fork = Stitch_Storage()
+        for name in self._column_names:
+            setattr(fork, name, getattr(self, name))
+        fork._removed_edge_count = self._removed_edge_count
+        fork._shared = self._shared = True
+        return fork
+
+    def __len__(self) -> int:
+        """
+        :return: the number of stitch edges in storage, not counting removed edges
+        """
+        return len(self.edge_parents) - self._removed_edge_count
+
+    @property
+    def removed_edge_count(self) -> int:
+        """
+        :return: the number of removed stitch edges still in the edge columns, 0 once the storage is compacted
+        """
+        return self._removed_edge_count
+
+    def reserve_loop(self, loop_id: int):
+        """
+        Grows the per-loop adjacency columns so that they can hold loop_id
+        :param loop_id: the id of a loop that will be connected by stitch edges
+        """
+        missing = loop_id + 1 - len(self._first_parent_edge)
+        if missing > 0:
+            if self._shared:
+                self._copy_shared_columns()
+            empty = array("i", [NO_EDGE]) * missing
+            self._first_parent_edge.extend(empty)
+            self._first_child_edge.extend(empty)
+            self._last_child_edge.extend(empty)
+
+    def add_edge(self, parent_id: int, child_id: int, pull_code: int, depth: int, parent_offset: int,
+                 stack_position: Optional[int] = None) -> int:
+        """
+        Appends a stitch edge to storage and threads it into the adjacency lists of its loops
+        :param parent_id: the id of the parent loop
+        :param child_id: the id of the child loop
+        :param pull_code: the Pull_Direction code of the stitch
+        :param depth: the crossing depth of the stitch
+        :param parent_offset: the offset from the child to the parent loop
+        :param stack_position: The position to insert the parent into, by default add on top of the stack
+        :return: the id of the new edge
+        """
+        self.reserve_loop(max(parent_id, child_id))
+        if self._shared:
+            self._copy_shared_columns()
+        edge_id = len(self.edge_parents)
+        self.edge_parents.append(parent_id)
+        self.edge_children.append(child_id)
+        self.edge_pull_directions.append(pull_code)
+        self.edge_depths.append(depth)
+        self.edge_offsets.append(parent_offset)
+        self._next_parent_edge.append(NO_EDGE)
+        self._next_child_edge.append(NO_EDGE)
+        # thread the edge into the child's parent stack
+        prior_edge = NO_EDGE
+        next_edge = self._first_parent_edge[child_id]
+        position = 0
+        while next_edge != NO_EDGE and (stack_position is None or position < stack_position):
+            prior_edge = next_edge
+            next_edge = self._next_parent_edge[next_edge]
+            position += 1
+        self.edge_stack_positions.append(position)
+        self._next_parent_edge[edge_id] = next_edge
+        if prior_edge == NO_EDGE:
+            self._first_parent_edge[child_id] = edge_id
+        else:
+            self._next_parent_edge[prior_edge] = edge_id
+        # the parents above the new edge move up the stack
+        while next_edge != NO_EDGE:
+            self.edge_stack_positions[next_edge] += 1
+            next_edge = self._next_parent_edge[next_edge]
+        # thread the edge onto the end of the parent's child list
+        last_child_edge = self._last_child_edge[parent_id]
+        if last_child_edge == NO_EDGE:
+            self._first_child_edge[parent_id] = edge_id
+        else:
+            self._next_child_edge[last_child_edge] = edge_id
+        self._last_child_edge[parent_id] = edge_id
+        return edge_id
+
+    def add_edges(self, parent_ids: array, child_ids: array, pull_codes: array, depths: array, parent_offsets: array):
+        """
+        Appends a block of stitch edges to storage in one pass.
+        The edges into each child must be contiguous and in stack order, and the children must not have parents yet
+        :param parent_ids: the id of the parent loop of each edge
+        :param child_ids: the id of the child loop of each edge
+        :param pull_codes: the Pull_Direction code of each edge
+        :param depths: the crossing depth of each edge
+        :param parent_offsets: the offset from the child to the parent loop of each edge
+        """
+        if len(child_ids) == 0:
+            return
+        self.reserve_loop(max(max(parent_ids), max(child_ids)))
+        if self._shared:
+            self._copy_shared_columns()
+        first_edge = len(self.edge_parents)
+        edge_count = len(child_ids)
+        self.edge_parents.extend(parent_ids)
+        self.edge_children.extend(child_ids)
+        self.edge_pull_directions.extend(pull_codes)
+        self.edge_depths.extend(depths)
+        self.edge_offsets.extend(parent_offsets)
+        # each edge is followed in its child's parent stack by the next edge if it goes into the same child
+        self._next_parent_edge.extend(array("i", [first_edge + index + 1 if child_ids[index + 1] == child_ids[index]
+                                                  else NO_EDGE for index in range(0, edge_count - 1)]))
+        self._next_parent_edge.append(NO_EDGE)
+        self._next_child_edge.extend(array("i", [NO_EDGE]) * edge_count)
+        first_parent_edge = self._first_parent_edge
+        first_child_edge = self._first_child_edge
+        last_child_edge = self._last_child_edge
+        next_child_edge = self._next_child_edge
+        stack_positions = self.edge_stack_positions
+        prior_child = NO_EDGE
+        position = 0
+        for edge_id, parent_id, child_id in zip(range(first_edge, first_edge + edge_count), parent_ids, child_ids):
+            if child_id != prior_child:
+                assert first_parent_edge[child_id] == NO_EDGE, f"Loop {child_id} already has parent loops"
+                first_parent_edge[child_id] = edge_id
+                prior_child = child_id
+                position = 0
+            else:
+                position += 1
+            stack_positions.append(position)
+            last_edge = last_child_edge[parent_id]
+            if last_edge == NO_EDGE:
+                first_child_edge[parent_id] = edge_id
+            else:
+                next_child_edge[last_edge] = edge_id
+            last_child_edge[parent_id] = edge_id
+
+    def remove_edge(self, edge_id: int):
+        """
+        Unthreads the edge from the parent stack of its child and the child list of its parent in O(stack + children).
+        The parents above the edge move down the stack, and the edge is marked removed until the storage is compacted
+        :param edge_id: the id of the edge to remove
+        """
+        parent_id = self.edge_parents[edge_id]
+        child_id = self.edge_children[edge_id]
+        assert child_id != REMOVED_LOOP, f"Edge {edge_id} was already removed"
+        if self._shared:
+            self._copy_shared_columns()
+        # unthread the edge from the child's parent stack
+        prior_edge = NO_EDGE
+        current_edge = self._first_parent_edge[child_id]
+        while current_edge != edge_id:
+            prior_edge = current_edge
+            current_edge = self._next_parent_edge[current_edge]
+        next_edge = self._next_parent_edge[edge_id]
+        if prior_edge == NO_EDGE:
+            self._first_parent_edge[child_id] = next_edge
+        else:
+            self._next_parent_edge[prior_edge] = next_edge
+        while next_edge != NO_EDGE:
+            self.edge_stack_positions[next_edge] -= 1
+            next_edge = self._next_parent_edge[next_edge]
+        # unthread the edge from the parent's child list
+        prior_edge = NO_EDGE
+        current_edge = self._first_child_edge[parent_id]
+        while current_edge != edge_id:
+            prior_edge = current_edge
+            current_edge = self._next_child_edge[current_edge]
+        if prior_edge == NO_EDGE:
+            self._first_child_edge[parent_id] = self._next_child_edge[edge_id]
+        else:
+            self._next_child_edge[prior_edge] = self._next_child_edge[edge_id]
+        if self._last_child_edge[parent_id] == edge_id:
+            self._last_child_edge[parent_id] = prior_edge
+        self.edge_parents[edge_id] = REMOVED_LOOP
+        self.edge_children[edge_id] = REMOVED_LOOP
+        self._next_parent_edge[edge_id] = NO_EDGE
+        self._next_child_edge[edge_id] = NO_EDGE
+        self._removed_edge_count += 1
+
+    def compact(self, loop_remap: array, live_loop_ids: array):
+        """
+        Drops removed edges and renumbers the loops in one pass over the columns.
+        Edges keep their relative order, so parent stacks and child lists are unchanged
+        :param loop_remap: the new id of each old loop id, REMOVED_LOOP for removed loops
+        :param live_loop_ids: the old ids of the loops that are kept, in ascending order
+        """
+        if len(loop_remap) > 0:
+            self.reserve_loop(len(loop_remap) - 1)
+        edge_count = len(self.edge_parents)
+        live_edges = array("i", [edge_id for edge_id in range(0, edge_count)
+                                 if self.edge_children[edge_id] != REMOVED_LOOP])
+        # the new id of each old edge id, with a trailing NO_EDGE so that edge_remap[NO_EDGE] is NO_EDGE
+        edge_remap = array("i", [NO_EDGE]) * (edge_count + 1)
+        for new_edge, old_edge in enumerate(live_edges):
+            edge_remap[old_edge] = new_edge
+
+        self.edge_parents = _gather_column(self.edge_parents, live_edges, loop_remap)
+        self.edge_children = _gather_column(self.edge_children, live_edges, loop_remap)
+        self.edge_pull_directions = _gather_column(self.edge_pull_directions, live_edges)
+        self.edge_depths = _gather_column(self.edge_depths, live_edges)
+        self.edge_offsets = _gather_column(self.edge_offsets, live_edges)
+        self.edge_stack_positions = _gather_column(self.edge_stack_positions, live_edges)
+        self._next_parent_edge = _gather_column(self._next_parent_edge, live_edges, edge_remap)
+        self._next_child_edge = _gather_column(self._next_child_edge, live_edges, edge_remap)
+        self._first_parent_edge = _gather_column(self._first_parent_edge, live_loop_ids, edge_remap)
+        self._first_child_edge = _gather_column(self._first_child_edge, live_loop_ids, edge_remap)
+        self._last_child_edge = _gather_column(self._last_child_edge, live_loop_ids, edge_remap)
+        self._removed_edge_count = 0
+        self._shared = False
+
+    def first_parent_edge(self, child_id: int) -> Optional[int]:
+        """
+        :param child_id: the id of the child loop
+        :return: the edge at the bottom of the child's parent stack or None if the child has no parents
+        """
+        if child_id >= len(self._first_parent_edge) or self._first_parent_edge[child_id] == NO_EDGE:
+            return None
+        return self._first_parent_edge[child_id]
+
+    def parent_edges(self, child_id: int) -> Iterator[int]:
+        """
+        :param child_id: the id of the child loop
+        :return: iterator over the edges into the child loop, from the bottom to the top of its parent stack
+        """
+        if child_id >= len(self._first_parent_edge):
+            return
+        edge_id = self._first_parent_edge[child_id]
+        while edge_id != NO_EDGE:
+            yield edge_id
+            edge_id = self._next_parent_edge[edge_id]
+
+    def child_edges(self, parent_id: int) -> Iterator[int]:
+        """
+        :param parent_id: the id of the parent loop
+        :return: iterator over the edges out of the parent loop in the order they were created
+        """
+        if parent_id >= len(self._first_child_edge):
+            return
+        edge_id = self._first_child_edge[parent_id]
+        while edge_id != NO_EDGE:
+            yield edge_id
+            edge_id = self._next_child_edge[edge_id]
+
+    def parent_ids(self, child_id: int) -> List[int]:
+        """
+        :param child_id: the id of the child loop
+        :return: the ids of the parent loops in stack order, bottom of the stack first
+        """
+        parents = self.edge_parents
+        return [parents[edge_id] for edge_id in self.parent_edges(child_id)]
+
+    def child_ids(self, parent_id: int) -> List[int]:
+        """
+        :param parent_id: the id of the parent loop
+        :return: the ids of the loops pulled through the parent loop
+        """
+        children = self.edge_children
+        return [children[edge_id] for edge_id in self.child_edges(parent_id)]
+
+    def find_edge(self, parent_id: int, child_id: int) -> Optional[int]:
+        """
+        :param parent_id: the id of the parent loop
+        :param child_id: the id of the child loop
+        :return: the id of the edge from parent to child or None if they are not connected
+        """
+        for edge_id in self.parent_edges(child_id):
+            if self.edge_parents[edge_id] == parent_id:
+                return edge_id
+        return None
+
+    def edges_into(self, child_ids: Sequence[int]) -> "Stitch_Slice":
+        """
+        Gathers the stitch edges into a set of child loops (e.g., a course) so their attributes can be read as columns
+        :param child_ids: the ids of the child loops in the order to slice them
+        :return: the stitch edges into the child loops, grouped by child in stack order
+        """
+        edge_ids = array("i")
+        child_starts = array("i", [0])
+        first_parent_edge = self._first_parent_edge
+        next_parent_edge = self._next_parent_edge
+        loop_count = len(first_parent_edge)
+        for child_id in child_ids:
+            edge_id = first_parent_edge[child_id] if child_id < loop_count else NO_EDGE
+            while edge_id != NO_EDGE:
+                edge_ids.append(edge_id)
+                edge_id = next_parent_edge[edge_id]
+            child_starts.append(len(edge_ids))
+        return Stitch_Slice(self, child_ids, child_starts, edge_ids)
+
+
+class Stitch_Slice:
+    """
+    A class holding the attributes of the stitch edges into a set of child loops as parallel columns.
+    The edges into the child at index i of child_ids are at indices child_starts[i] to child_starts[i + 1],
+     from the bottom to the top of its parent stack.
+    When these edges are stored contiguously and in order, as they are when a course is built by add_course
+     or stitch by stitch, the columns are sliced directly from the stitch storage
+    ...
+
+    Attributes
+    ----------
+    child_ids: Sequence[int]
+        The ids of the child loops in the slice
+    child_starts: array
+        The index of the first edge into each child loop, followed by the number of edges in the slice
+    edge_ids: array
+        The id of each edge in the slice
+    parent_ids: array
+        The parent loop id of each edge in the slice
+    pull_directions: array
+        The Pull_Direction code of each edge in the slice
+    depths: array
+        The cable crossing depth of each edge in the slice
+    offsets: array
+        The offset from the child to the parent loop of each edge in the slice
+    stack_positions: array
+        The position of each edge in its child's parent stack
+    """
+
+    def __init__(self, stitches: Stitch_Storage, child_ids: Sequence[int], child_starts: array, edge_ids: array):
+        """
+        :param stitches: the stitch storage the edges are in
+        :param child_ids: the ids of the child loops in the slice
+        :param child_starts: the index of the first edge into each child loop, followed by the number of edges
+        :param edge_ids: the ids of the edges into the child loops grouped by child in stack order
+        """
+        self.child_ids: Sequence[int] = child_ids
+        self.child_starts: array = child_starts
+        self.edge_ids: array = edge_ids
+        if len(edge_ids) > 0 and edge_ids[-1] - edge_ids[0] + 1 == len(edge_ids) \
+                and edge_ids == array("i", range(edge_ids[0], edge_ids[-1] + 1)):
+            start, stop = edge_ids[0], edge_ids[-1] + 1
+            self.parent_ids: array = writable_column(stitches.edge_parents[start:stop])
+            self.pull_directions: array = writable_column(stitches.edge_pull_directions[start:stop])
+            self.depths: array = writable_column(stitches.edge_depths[start:stop])
+            self.offsets: array = writable_column(stitches.edge_offsets[start:stop])
+            self.stack_positions: array = writable_column(stitches.edge_stack_positions[start:stop])
+        else:
+            self.parent_ids: array = array("i", [stitches.edge_parents[edge_id] for edge_id in edge_ids])
+            self.pull_directions: array = array("b", [stitches.edge_pull_directions[edge_id] for edge_id in edge_ids])
+            self.depths: array = array("b", [stitches.edge_depths[edge_id] for edge_id in edge_ids])
+            self.offsets: array = array("h", [stitches.edge_offsets[edge_id] for edge_id in edge_ids])
+            self.stack_positions: array = array("h", [stitches.edge_stack_positions[edge_id] for edge_id in edge_ids])
+
+    def parent_count(self, index: int) -> int:
+        """
+        :param index: the index of a child loop in child_ids
+        :return: the number of parents of that child loop
+        """
+        return self.child_starts[index + 1] - self.child_starts[index]
+
+    def parents_of(self, index: int) -> array:
+        """
+        :param index: the index of a child loop in child_ids
+        :return: the parent loop ids of that child loop in stack order
+        """
+        return self.parent_ids[self.child_starts[index]:self.child_starts[index + 1]]
+
+    def __len__(self) -> int:
+        """
+        :return: the number of edges in the slice
+        """
+        return len(self.edge_ids)
@@ -0,0 +1,151 @@
+"""An incrementally maintained canonical hash of the structure of a knit graph"""
+import struct
+from array import array
+from hashlib import blake2b
+from typing import Dict
+
+from knit_graphs.Columns import copy_column
+from knit_graphs.Loop_Table import NO_YARN
+
+NO_RANK = -1
+DIGEST_SIZE = 32
+# canonical yarn, rank of the prior loop on the yarn, 1 if twisted, number of parents
+_LOOP_RECORD = struct.Struct("<iiBH")
+# rank of the parent loop, pull direction code, crossing depth, parent offset
+_STITCH_RECORD = struct.Struct("<ibbh")
+# carrier of each canonical yarn
+_YARN_RECORD = struct.Struct("<B")
+
+
+class Structural_Hash:
+    """
+    A class to maintain a blake2b hash of the structure of a knit graph: its loops, their yarn order, twists,
+     and the parent stacks of each loop with the pull direction, depth, and offset of each stitch.
+    The hash is canonical: loops are numbered by their rank in creation (loop id) order and yarns by the first loop
+     made with them, so graphs of the same fabric built by different routes have the same hash,
+     while yarn ids and the loop ids themselves are not part of it.
+    Loops are hashed in creation order in one linear pass, each loop as a record of its own fields and its parents.
+    A loop's record never changes when later loops are added, so the hash extends from where it left off
+     as a graph grows; a change to a loop that is already hashed restarts the hash on the next request
+    ...
+
+    Attributes
+    ----------
+    loop_ranks: array
+        The rank of each hashed loop in creation order, indexed by loop id. NO_RANK if there is no loop at that id
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph to hash
+        """
+        self._knit_graph = knit_graph
+        self.loop_ranks: array = array("i")
+        self._hasher = blake2b(digest_size=DIGEST_SIZE)
+        self._hashed_loop_count: int = 0
+        self._yarn_ranks: Dict[str, int] = {}
+        self._shared: bool = False  # True while the ranks are shared with a fork
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this hash's knit graph
+        :return: a copy of this hash for the forked knit graph that shares its ranks until either hash is extended
+        """
+        fork = Structural_Hash(knit_graph)
+        fork.loop_ranks = self.loop_ranks
+        fork._hasher = self._hasher.copy()
+        fork._hashed_loop_count = self._hashed_loop_count
+        fork._yarn_ranks = dict(self._yarn_ranks)
+        fork._shared = self._shared = True
+        return fork
+
+    def _reset(self):
+        """
+        Discards the hashed loops so the next request hashes the knit graph from its first loop
+        """
+        self.loop_ranks = array("i")
+        self._hasher = blake2b(digest_size=DIGEST_SIZE)
+        self._hashed_loop_count = 0
+        self._yarn_ranks = {}
+        self._shared = False
+
+    def loop_changed(self, loop_id: int):
+        """
+        Restarts the hash if the loop's record is already hashed
+        :param loop_id: the id of a loop whose twist or parent stack changed
+        """
+        if loop_id < len(self.loop_ranks):
+            self._reset()
+
+    def add_loop(self, loop_id: int):
+        """
+        Restarts the hash if the new loop is created before hashed loops
+        :param loop_id: the id of the loop added to the knit graph
+        """
+        if loop_id < len(self.loop_ranks):
+            self._reset()
+
+    def _extend(self):
+        """
+        Hashes the records of the loops added since the last request
+        """
+        knit_graph = self._knit_graph
+        loop_yarns = knit_graph.loops.loop_yarns
+        hashed_stop = len(self.loop_ranks)
+        if hashed_stop == len(loop_yarns):
+            return
+        if self._shared:
+            self.loop_ranks = copy_column(self.loop_ranks)
+            self._shared = False
+        # rank every new loop first, so that parents created after their children have a rank
+        rank = self._hashed_loop_count
+        new_ranks = array("i", [NO_RANK]) * (len(loop_yarns) - hashed_stop)
+        for index, yarn in enumerate(loop_yarns[hashed_stop:]):
+            if yarn != NO_YARN:
+                new_ranks[index] = rank
+                rank += 1
+        self.loop_ranks.extend(new_ranks)
+        loop_ranks = self.loop_ranks
+        yarn_ids = knit_graph.loops.yarn_ids
+        loop_twists = knit_graph.loops.loop_twists
+        stitches = knit_graph.stitches
+        edge_parents = stitches.edge_parents
+        edge_pull_directions = stitches.edge_pull_directions
+        edge_depths = stitches.edge_depths
+        edge_offsets = stitches.edge_offsets
+        records = bytearray()
+        for loop_id in range(hashed_stop, len(loop_yarns)):
+            if loop_yarns[loop_id] == NO_YARN:
+                continue
+            yarn_id = yarn_ids[loop_yarns[loop_id]]
+            if yarn_id not in self._yarn_ranks:
+                self._yarn_ranks[yarn_id] = len(self._yarn_ranks)
+            yarn = knit_graph.yarns[yarn_id]
+            position = yarn.position_of(loop_id)
+            prior_rank = NO_RANK if position is None or position == 0 else loop_ranks[yarn.loop_ids[position - 1]]
+            parent_edges = [*stitches.parent_edges(loop_id)]
+            records += _LOOP_RECORD.pack(self._yarn_ranks[yarn_id], prior_rank, loop_twists[loop_id],
+                                         len(parent_edges))
+            for edge_id in parent_edges:
+                records += _STITCH_RECORD.pack(loop_ranks[edge_parents[edge_id]], edge_pull_directions[edge_id],
+                                               edge_depths[edge_id], edge_offsets[edge_id])
+        self._hasher.update(records)
+        self._hashed_loop_count = rank
+
+    def digest(self) -> bytes:
+        """
+        Hashes the loops added since the last request, then finishes a copy of the hash with the carrier of each yarn
+        :return: the canonical hash of the knit graph's structure
+        """
+        self._extend()
+        hasher = self._hasher.copy()
+        yarns = sorted(self._yarn_ranks, key=self._yarn_ranks.__getitem__)
+        hasher.update(b"".join(_YARN_RECORD.pack(self._knit_graph.yarns[yarn_id].carrier.carrier_id)
+                               for yarn_id in yarns))
+        return hasher.digest()
+
+    def hexdigest(self) -> str:
+        """
+        :return: the canonical hash of the knit graph's structure as a hex string
+        """
+        return self.digest().hex()
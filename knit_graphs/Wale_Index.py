@@ -0,0 +1,237 @@
+"""An incrementally maintained index of the wales (columns) in a knit graph"""
+from array import array
+from typing import List, Tuple
+
+from knit_graphs.Columns import copy_column
+
+NO_LOOP = -1
+
+
+class Wale_Index:
+    """
+    A class to maintain the column of each loop and the wale-wise links between loops as loops are added and connected.
+    A loop continues the wale of the loop at the bottom of its parent stack, so decreases end the wales of the other
+     parents and cables carry their wale across columns.
+    Columns follow the needle positions used by the knitout generator:
+     the first course is on columns 0 to n from left to right,
+     a loop with parents is at the column of its bottom parent plus that parent's offset,
+     and a loop without parents (i.e., a yarn-over) is one column past the prior loop in the direction of its course
+    ...
+
+    Attributes
+    ----------
+    loop_columns: array
+        The column of each loop, indexed by loop id
+    wale_parents: array
+        The loop below each loop in its wale (the bottom of its parent stack), NO_LOOP if it starts a wale
+    wale_children: array
+        The loop above each loop in its wale, NO_LOOP if it ends a wale
+    """
+
+    def __init__(self, knit_graph):
+        """
+        :param knit_graph: the knit graph to index
+        """
+        self._knit_graph = knit_graph
+        self.loop_columns: array = array("i")
+        self.wale_parents: array = array("i")
+        self.wale_children: array = array("i")
+        self._last_loop_id: int = NO_LOOP
+        self._stale: bool = False
+        self._shared: bool = False  # True while the columns are shared with a loaded file or a fork
+
+    def _copy_shared_columns(self):
+        """
+        Replaces columns shared with a loaded file or a fork with private copies before the index is modified
+        """
+        self.loop_columns = copy_column(self.loop_columns)
+        self.wale_parents = copy_column(self.wale_parents)
+        self.wale_children = copy_column(self.wale_children)
+        self._shared = False
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this index's knit graph
+        :return: a copy of this index for the forked knit graph that shares its columns until either index is modified
+        """
+        fork = Wale_Index(knit_graph)
+        fork.loop_columns = self.loop_columns
+        fork.wale_parents = self.wale_parents
+        fork.wale_children = self.wale_children
+        fork._last_loop_id = self._last_loop_id
+        fork._stale = self._stale
+        fork._shared = self._shared = True
+        return fork
+
+    def add_loop(self, loop_id: int):
+        """
+        Places a new loop without parents one column past the prior loop in the direction of its course
+        :param loop_id: the id of the loop added to the knit graph
+        """
+        if self._stale:
+            return
+        if loop_id <= self._last_loop_id:  # loops added out of order are indexed by a rebuild
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        missing = loop_id + 1 - len(self.loop_columns)
+        empty = array("i", [NO_LOOP]) * missing
+        self.loop_columns.extend(empty)
+        self.wale_parents.extend(empty)
+        self.wale_children.extend(empty)
+        if self._last_loop_id == NO_LOOP:
+            self.loop_columns[loop_id] = 0
+        else:
+            course = self._knit_graph.course_index.course_of(loop_id)
+            step = 1 if course % 2 == 0 else -1
+            self.loop_columns[loop_id] = self.loop_columns[self._last_loop_id] + step
+        self._last_loop_id = loop_id
+
+    def add_stitch(self, child_id: int):
+        """
+        Links the child loop into the wale of the bottom loop in its parent stack
+        :param child_id: the id of the child loop in a new stitch
+        """
+        if self._stale:
+            return
+        if child_id != self._last_loop_id:  # a stitch into an earlier loop can move every loop after it
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        stitches = self._knit_graph.stitches
+        bottom_edge = stitches.first_parent_edge(child_id)
+        bottom_parent = stitches.edge_parents[bottom_edge]
+        if bottom_parent >= child_id:  # not a wale, the parent is not below the child
+            return
+        prior_parent = self.wale_parents[child_id]
+        if prior_parent != NO_LOOP:  # a new parent was stacked under the prior bottom of the stack
+            self.wale_children[prior_parent] = NO_LOOP
+        self.wale_parents[child_id] = bottom_parent
+        self.wale_children[bottom_parent] = child_id
+        self.loop_columns[child_id] = self.loop_columns[bottom_parent] + stitches.edge_offsets[bottom_edge]
+
+    def add_loops(self, loop_ids: range):
+        """
+        Indexes a block of new loops whose stitch edges are already in the knit graph
+        :param loop_ids: the ids of the new loops in the order of creation, indexed by the course_index
+        """
+        if self._stale:
+            return
+        if len(loop_ids) == 0:
+            return
+        if loop_ids.start <= self._last_loop_id or loop_ids.step != 1:
+            self._stale = True
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        empty = array("i", [NO_LOOP]) * (loop_ids.stop - len(self.loop_columns))
+        self.loop_columns.extend(empty)
+        self.wale_parents.extend(empty)
+        self.wale_children.extend(empty)
+        stitches = self._knit_graph.stitches
+        loop_courses = self._knit_graph.course_index.loop_courses
+        columns = self.loop_columns
+        prior_column = -1 if self._last_loop_id == NO_LOOP else columns[self._last_loop_id]
+        for loop_id in loop_ids:
+            bottom_edge = stitches.first_parent_edge(loop_id)
+            if bottom_edge is None or stitches.edge_parents[bottom_edge] >= loop_id:
+                prior_column += 1 if loop_courses[loop_id] % 2 == 0 else -1
+            else:
+                bottom_parent = stitches.edge_parents[bottom_edge]
+                self.wale_parents[loop_id] = bottom_parent
+                self.wale_children[bottom_parent] = loop_id
+                prior_column = columns[bottom_parent] + stitches.edge_offsets[bottom_edge]
+            columns[loop_id] = prior_column
+        self._last_loop_id = loop_ids.stop - 1
+
+    def loop_changed(self, loop_id: int):
+        """
+        Invalidates the index, it is rebuilt in one pass when it is next read
+         since removing loops and stitches can end wales and move the loops after them
+        :param loop_id: the id of a loop removed from the knit graph or whose parent stitches were removed
+        """
+        self._stale = True
+
+    def _refresh(self):
+        """
+        Rebuilds the index in one pass over the loops if it was invalidated
+        """
+        if not self._stale:
+            return
+        self.loop_columns = array("i")
+        self.wale_parents = array("i")
+        self.wale_children = array("i")
+        self._last_loop_id = NO_LOOP
+        self._stale = False
+        self._shared = False
+        stitches = self._knit_graph.stitches
+        for loop_id in self._knit_graph.loops:
+            self.add_loop(loop_id)
+            if stitches.first_parent_edge(loop_id) is not None:
+                self.add_stitch(loop_id)
+
+    def columns(self) -> Tuple[array, array, array]:
+        """
+        :return: the loop_columns, wale_parents, and wale_children columns, rebuilt first if the index was invalidated
+        """
+        self._refresh()
+        return self.loop_columns, self.wale_parents, self.wale_children
+
+    def column_of(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph
+        :return: the column of the loop
+        """
+        self._refresh()
+        if loop_id not in self._knit_graph.loops:
+            raise KeyError(loop_id)
+        return self.loop_columns[loop_id]
+
+    def wale_parent(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph
+        :return: the id of the loop below this one in its wale, NO_LOOP if the loop starts a wale
+        """
+        self._refresh()
+        return self.wale_parents[loop_id]
+
+    def wale_child(self, loop_id: int) -> int:
+        """
+        :param loop_id: the id of a loop in the knit graph
+        :return: the id of the loop above this one in its wale, NO_LOOP if the loop ends a wale
+        """
+        self._refresh()
+        return self.wale_children[loop_id]
+
+    def wale(self, loop_id: int) -> List[int]:
+        """
+        :param loop_id: the id of any loop in the wale
+        :return: the ids of the loops in the wale from bottom to top
+        """
+        self._refresh()
+        bottom = loop_id
+        while self.wale_parents[bottom] != NO_LOOP:
+            bottom = self.wale_parents[bottom]
+        loop_ids = []
+        while bottom != NO_LOOP:
+            loop_ids.append(bottom)
+            bottom = self.wale_children[bottom]
+        return loop_ids
+
+    def wale_starts(self) -> List[int]:
+        """
+        :return: the id of the bottom loop of every wale in the order the loops were created
+        """
+        self._refresh()
+        return [loop_id for loop_id in self._knit_graph.loops if self.wale_parents[loop_id] == NO_LOOP]
+
+    def course_columns(self, course: int) -> List[int]:
+        """
+        :param course: a course in the knit graph
+        :return: the columns of the loops on the course in the order of creation
+        """
+        self._refresh()
+        columns = self.loop_columns
+        return [columns[loop_id] for loop_id in self._knit_graph.course_index.course_loop_ids(course)]
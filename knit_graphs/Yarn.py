@@ -1,14 +1,76 @@
 """
 The Yarn Data Structure
 """
-from typing import Optional, Tuple, Union
-
-import networkx as networkx
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
 
+from knit_graphs.Columns import copy_column
 from knit_graphs.Loop import Loop
 from knitting_machine.Machine_State import Yarn_Carrier
 
 
+class Yarn_Graph_View:
+    """
+    A read-only view that presents the loop sequence of a yarn through the networkx DiGraph queries used on yarn graphs
+    """
+
+    def __init__(self, yarn):
+        """
+        :param yarn: the yarn to view
+        """
+        self._yarn = yarn
+
+    @property
+    def nodes(self) -> Iterator[int]:
+        """
+        :return: the loop ids on the yarn in yarn order
+        """
+        return iter(self._yarn)
+
+    @property
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """
+        :return: the (prior_loop_id, next_loop_id) links between consecutive loops on the yarn
+        """
+        loop_ids = self._yarn.loop_ids
+        return zip(loop_ids, loop_ids[1:])
+
+    def has_node(self, loop_id: int) -> bool:
+        """
+        :param loop_id: the id of the loop
+        :return: True if the loop is on the yarn
+        """
+        return loop_id in self._yarn
+
+    def successors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of a loop on the yarn
+        :return: iterator over the loop that follows it on the yarn, if any
+        """
+        position = self._yarn.position_of(loop_id)
+        if position is not None and position + 1 < len(self._yarn):
+            yield self._yarn.loop_ids[position + 1]
+
+    def predecessors(self, loop_id: int) -> Iterator[int]:
+        """
+        :param loop_id: the id of a loop on the yarn
+        :return: iterator over the loop that precedes it on the yarn, if any
+        """
+        position = self._yarn.position_of(loop_id)
+        if position is not None and position > 0:
+            yield self._yarn.loop_ids[position - 1]
+
+    def __contains__(self, loop_id) -> bool:
+        return loop_id in self._yarn
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._yarn)
+
+    def __len__(self) -> int:
+        return len(self._yarn)
+
+
 class Yarn:
     """
     A class to represent a yarn structure
@@ -16,10 +78,10 @@ class Yarn:
 
     Attributes
     ----------
-    yarn_graph: networkx.DiGraph
-        A directed graph structure (always a list) of loops on the yarn
-    last_loop_id: int
-        The id of the last loop on the yarn, none if no loops on the yarn
+    loop_ids: array
+        The append-only sequence of the ids of the loops on the yarn in yarn order
+    yarn_graph: Yarn_Graph_View
+        A read-only view of the loops on the yarn as a directed graph structure (always a list)
     """
 
     def __init__(self, yarn_id: str, knit_graph, last_loop: Optional[Loop] = None, carrier_id: int = 3):
@@ -32,13 +94,112 @@ class Yarn:
         self.knit_graph = knit_graph
         assert 0 < carrier_id < 11, f"Invalid yarn carrier {carrier_id}"
         self._carrier: Yarn_Carrier = Yarn_Carrier(carrier_id)
-        self.yarn_graph: networkx.DiGraph = networkx.DiGraph()
-        if last_loop is None:
-            self.last_loop_id = None
-        else:
-            self.last_loop_id: int = last_loop.loop_id
+        self.loop_ids: array = array("i")
+        # loop ids are usually added in ascending order and found by binary search,
+        # otherwise this maps each loop id to its position on the yarn
+        self._positions: Optional[Dict[int, int]] = None
+        self.yarn_graph: Yarn_Graph_View = Yarn_Graph_View(self)
+        self._shared: bool = False  # True while the loop ids are shared with a loaded file or a fork
+        if last_loop is not None:
+            self._append_loop_id(last_loop.loop_id)
         self._yarn_id: str = yarn_id
 
+    @property
+    def last_loop_id(self) -> Optional[int]:
+        """
+        :return: The id of the last loop on the yarn, none if no loops on the yarn
+        """
+        if len(self.loop_ids) == 0:
+            return None
+        return self.loop_ids[-1]
+
+    def _copy_shared_columns(self):
+        """
+        Replaces loop ids shared with a loaded file or a fork with a private copy before the yarn is modified
+        """
+        self.loop_ids = copy_column(self.loop_ids)
+        if self._positions is not None:
+            self._positions = dict(self._positions)
+        self._shared = False
+
+    def fork(self, knit_graph):
+        """
+        :param knit_graph: the fork of this yarn's knit graph
+        :return: a copy of this yarn in the forked knit graph that shares its loop ids until either yarn is modified
+        """
+        fork = Yarn(self._yarn_id, knit_graph, carrier_id=self._carrier.carrier_id)
+        fork.loop_ids = self.loop_ids
+        fork._positions = self._positions
+        fork._shared = self._shared = True
+        return fork
+
+    def _append_loop_id(self, loop_id: int):
+        """
+        Appends the loop id to the end of the yarn in O(1)
+        :param loop_id: the id of the loop to add
+        """
+        if self._shared:
+            self._copy_shared_columns()
+        if self._positions is None and len(self.loop_ids) > 0 and loop_id <= self.loop_ids[-1]:
+            self._positions = {prior_id: position for position, prior_id in enumerate(self.loop_ids)}
+        if self._positions is not None:
+            self._positions[loop_id] = len(self.loop_ids)
+        self.loop_ids.append(loop_id)
+
+    def add_loop_ids_to_end(self, loop_ids: range):
+        """
+        Adds a block of loop ids at the end of the yarn
+        :param loop_ids: the ids of the loops to add in yarn order
+        """
+        if self._shared:
+            self._copy_shared_columns()
+        if self._positions is None and (len(self.loop_ids) == 0 or loop_ids.start > self.loop_ids[-1]) \
+                and loop_ids.step > 0:
+            self.loop_ids.extend(loop_ids)
+        else:
+            for loop_id in loop_ids:
+                self._append_loop_id(loop_id)
+
+    def remove_loop_ids(self, loop_ids: Set[int]):
+        """
+        Removes loops from the yarn, joining the loops on either side of them.
+        A run of consecutive loops, such as a course, is removed by one slice deletion
+        :param loop_ids: the ids of the loops to remove
+        """
+        positions = sorted(position for position in map(self.position_of, loop_ids) if position is not None)
+        if len(positions) == 0:
+            return
+        if self._shared:
+            self._copy_shared_columns()
+        if positions[-1] - positions[0] + 1 == len(positions):
+            del self.loop_ids[positions[0]:positions[-1] + 1]
+        else:
+            self.loop_ids = array("i", [loop_id for loop_id in self.loop_ids if loop_id not in loop_ids])
+        if self._positions is not None:
+            self._positions = {loop_id: position for position, loop_id in enumerate(self.loop_ids)}
+
+    def remap_loop_ids(self, loop_remap: array):
+        """
+        Renumbers the loops on the yarn after the knit graph is compacted
+        :param loop_remap: the new id of each old loop id
+        """
+        self.loop_ids = array("i", map(loop_remap.__getitem__, self.loop_ids))
+        self._shared = False
+        if self._positions is not None:
+            self._positions = {loop_id: position for position, loop_id in enumerate(self.loop_ids)}
+
+    def position_of(self, loop_id: int) -> Optional[int]:
+        """
+        :param loop_id: the id of the loop
+        :return: the index of the loop in yarn order or None if the loop is not on this yarn
+        """
+        if self._positions is not None:
+            return self._positions.get(loop_id)
+        position = bisect_left(self.loop_ids, loop_id)
+        if position < len(self.loop_ids) and self.loop_ids[position] == loop_id:
+            return position
+        return None
+
     @property
     def carrier(self) -> Yarn_Carrier:
         """
@@ -69,13 +230,8 @@ class Yarn:
         # If no loop is provided create one with loop id and twisted parameter
         if loop is None:
             loop = Loop(loop_id, self._yarn_id, is_twisted)
-        # Add Loop Id as a node to the yarn_graph and add parameter keyed to it at "loop" to store the loop
-        self.yarn_graph.add_node(loop_id, loop=loop)
-        # Add an edge between this loop and the loop before it on the yarn
-        if self.last_loop_id is not None:
-            self.yarn_graph.add_edge(self.last_loop_id, loop_id)
-        # Update last_loop_id
-        self.last_loop_id = loop_id
+        # Append the loop id to the yarn's loop sequence, this also updates last_loop_id
+        self._append_loop_id(loop_id)
         # Return the created loop's id and the loop
         return loop_id, loop
 
@@ -85,9 +241,9 @@ class Yarn:
         :return: true if the loop_id of item or the loop is in the yarn
         """
         if type(item) is int:
-            return self.yarn_graph.has_node(item)
+            return self.position_of(item) is not None
         elif isinstance(item, Loop):
-            return self.yarn_graph.has_node(item.loop_id)
+            return self.position_of(item.loop_id) is not None
 
     def __getitem__(self, item: int) -> Loop:
         """
@@ -97,4 +253,16 @@ class Yarn:
         if item not in self:
             raise AttributeError
         else:
-            return self.yarn_graph.nodes[item].loop
+            return self.knit_graph[item]
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        :return: iterator over the loop ids on the yarn in yarn order
+        """
+        return iter(self.loop_ids)
+
+    def __len__(self) -> int:
+        """
+        :return: the number of loops on the yarn
+        """
+        return len(self.loop_ids)
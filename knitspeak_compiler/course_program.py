@@ -0,0 +1,91 @@
+"""Flat programs that a course statement is lowered to before the compiler executes it"""
+from array import array
+from typing import List, Tuple, Union
+
+from knitspeak_compiler.knitspeak_interpreter.cable_definitions import Cable_Definition
+from knitspeak_compiler.knitspeak_interpreter.closures import Num_Closure
+from knitspeak_compiler.knitspeak_interpreter.stitch_definitions import Stitch_Definition
+
+STITCH = 0  # make the stitch or slip of the operand, a stitch definition already flipped for the side of the course
+REPEAT = 1  # run the body up to the matching REPEAT_END the operand's count of times, operand is (count, end index)
+REPEAT_END = 2  # end of a REPEAT body, operand is the index of the first operation of the body
+GUARD = 3  # run the body up to the matching GUARD_END until the operand's count of loops are left, (count, end index)
+GUARD_END = 4  # end of a GUARD body, operand is the index of the first operation of the body
+COURSE_CHECK = 5  # end the course if every loop of the prior course is consumed, follows each statement of the course
+
+
+class Course_Program:
+    """
+    A course statement lowered for one side of the fabric: a flat array of opcodes with an operand for each.
+    Cables are expanded into their stitches and stitches are flipped for wrong-side courses when the program is made,
+     so executing a program only dispatches on opcodes.
+    Repeat counts and loop-count guards may be closures, they are evaluated each time their block is entered
+    ...
+
+    Attributes
+    ----------
+    opcodes: array
+        The operation at each position of the program, STITCH, REPEAT, REPEAT_END, GUARD, GUARD_END, or COURSE_CHECK
+    operands: list
+        The operand of the operation at each position of the program
+    """
+
+    def __init__(self, instructions: List[tuple], wrong_side: bool):
+        """
+        :param instructions: the instruction tuples of a course statement from the parser, each a stitch definition,
+         cable definition, list of instructions, or instruction with a tuple of whether its repeats are static and
+         either its number of repeats or the number of loops to leave
+        :param wrong_side: True if the course is worked from the wrong side, which flips its stitches and cables
+        """
+        self.opcodes: array = array("b")
+        self.operands: list = []
+        self._wrong_side: bool = wrong_side
+        for instruction in instructions:
+            self._lower_instruction(instruction)
+            self._emit(COURSE_CHECK, None)
+
+    def _emit(self, opcode: int, operand) -> int:
+        """
+        :param opcode: the operation to add to the end of the program
+        :param operand: the operand of the operation
+        :return: the position of the operation
+        """
+        self.opcodes.append(opcode)
+        self.operands.append(operand)
+        return len(self.opcodes) - 1
+
+    def _lower_instruction(self, instruction: Tuple[Union[tuple, Stitch_Definition, Cable_Definition, list],
+                                                    Tuple[bool, Union[int, Num_Closure]]]):
+        """
+        Adds an instruction and its repeat structure to the end of the program
+        :param instruction: an instruction tuple of the action and how to repeat it
+        """
+        action = instruction[0]
+        static_repeats, count = instruction[1]
+        if static_repeats and not isinstance(count, Num_Closure) and count == 1:  # the action is run once
+            self._lower_action(action)
+            return
+        block_start = self._emit(REPEAT if static_repeats else GUARD, None)
+        self._lower_action(action)
+        block_end = self._emit(REPEAT_END if static_repeats else GUARD_END, block_start + 1)
+        self.operands[block_start] = (count, block_end)
+
+    def _lower_action(self, action: Union[tuple, Stitch_Definition, Cable_Definition, list]):
+        """
+        Adds the operations of an action to the end of the program
+        :param action: a stitch definition, cable definition, list of instructions, or an instruction
+        """
+        if isinstance(action, Stitch_Definition):
+            self._emit(STITCH, action.flipped if self._wrong_side else action)
+        elif isinstance(action, Cable_Definition):
+            cable = action.flipped if self._wrong_side else action
+            for stitch_definition in cable.stitch_definitions():  # the cable's stitches are flipped with the cable
+                self._emit(STITCH, stitch_definition)
+        elif type(action) is list:
+            for sub_instruction in action:
+                self._lower_instruction(sub_instruction)
+        else:
+            self._lower_instruction(action)
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
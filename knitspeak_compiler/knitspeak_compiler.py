@@ -1,10 +1,12 @@
 """Compiler code for converting knitspeak AST to knitgraph"""
-from typing import List, Dict, Union, Tuple, Set
+from typing import List, Dict, Optional, Union, Tuple, Set
 
+from knit_graphs.Compressed_Knit_Graph import Compressed_Knit_Graph
 from knit_graphs.Knit_Graph import Knit_Graph, Pull_Direction
+from knit_graphs.Knit_Graph_Validator import Knit_Graph_Validator
 from knit_graphs.Yarn import Yarn
+from knitspeak_compiler.course_program import COURSE_CHECK, Course_Program, GUARD, REPEAT, REPEAT_END, STITCH
 from knitspeak_compiler.knitspeak_interpreter.knitspeak_interpreter import KnitSpeak_Interpreter
-from knitspeak_compiler.knitspeak_interpreter.cable_definitions import Cable_Definition
 from knitspeak_compiler.knitspeak_interpreter.closures import Num_Closure, Iterator_Closure
 from knitspeak_compiler.knitspeak_interpreter.stitch_definitions import Stitch_Definition
 
@@ -14,7 +16,11 @@ class Knitspeak_Compiler:
     A class used to compile knit graphs from knitspeak
     """
 
-    def __init__(self):
+    def __init__(self, validate: bool = False):
+        """
+        :param validate: if True, each row is checked as it is compiled and the first row that makes
+         an invalid knit graph (e.g., consumes a loop twice) raises a KnitSpeak Error
+        """
         self._parser = KnitSpeak_Interpreter()
         self.parse_results: List[Dict[str, Union[List[int, Num_Closure, Iterator_Closure], List[tuple]]]] = []
         self.course_ids_to_operations: Dict[int, List[tuple]] = {}
@@ -24,7 +30,11 @@ class Knitspeak_Compiler:
         self.last_course_loop_ids: List[int] = []
         self.cur_course_loop_ids: List[int] = []
         self.current_row = 0
+        self.row_last_loop_ids: List[int] = []  # the id of the last loop made by each row, starting with the 0th course
         self.loop_ids_consumed_by_current_course: Set[int] = set()
+        # the program of each course for each side, keyed by the course id and True for wrong-side rows
+        self._course_programs: Dict[Tuple[int, bool], Course_Program] = {}
+        self.validator: Optional[Knit_Graph_Validator] = Knit_Graph_Validator(self.knit_graph) if validate else None
 
     def _increment_current_row(self):
         """
@@ -52,22 +62,60 @@ class Knitspeak_Compiler:
         self.parse_results = self._parser.parse(pattern, patternIsFile)
         self._organize_courses()
         self.populate_0th_course(starting_width)
+        self._compile_rows(row_count)
+        return self.knit_graph
+
+    def compile_compressed(self, starting_width: int, row_count: int, pattern: str,
+                           patternIsFile: bool = False) -> Compressed_Knit_Graph:
+        """
+        Compiles the pattern like compile, but stops after two passes through the pattern's rows
+         if the second pass makes the same stitches as the first, shifted by the loops made in a pass.
+        The remaining rows are recorded as repeats of the second pass and are only created when the result is expanded.
+        If the passes differ (e.g., a closure depends on the current row), every row is compiled
+        :param row_count: the number of rows to knit before completing, pattern may repeat or be incomplete
+        :param starting_width: the number of loops used to create the 0th course
+        :param pattern: the pattern as a string or in a file
+        :param patternIsFile: True if pattern is provided in a file
+        :return: the resulting compressed knit graph
+        """
+        self.parse_results = self._parser.parse(pattern, patternIsFile)
+        self._organize_courses()
+        self.populate_0th_course(starting_width)
+        pass_length = len(self.course_ids_to_operations)
+        explicit_rows = 2 * pass_length
+        if row_count <= explicit_rows:
+            self._compile_rows(row_count)
+            return Compressed_Knit_Graph(self.knit_graph)
+        self._compile_rows(explicit_rows)
+        block_start = self.row_last_loop_ids[pass_length] + 1
+        stride = self.knit_graph.last_loop_id + 1 - block_start
+        if not Compressed_Knit_Graph.repeats_block(self.knit_graph, stride):
+            self._compile_rows(row_count)
+            return Compressed_Knit_Graph(self.knit_graph)
+        repeat_count, tail_rows = divmod(row_count - explicit_rows, pass_length)
+        tail_loop_count = self.row_last_loop_ids[pass_length + tail_rows] + 1 - block_start
+        return Compressed_Knit_Graph(self.knit_graph, stride, repeat_count, tail_loop_count)
+
+    def _compile_rows(self, row_count: int):
+        """
+        Compiles passes through the pattern's rows until row_count rows are compiled
+        :param row_count: the number of rows to knit before completing
+        """
         while self.current_row < row_count:
             for course_id in sorted(self.course_ids_to_operations):
                 self._increment_current_row()
                 assert self.current_row % course_id == 0
-                course_instructions = self.course_ids_to_operations[course_id]
-                while len(self.loop_ids_consumed_by_current_course) < len(self.last_course_loop_ids):
-                    for instruction in course_instructions:
-                        self._process_instruction(instruction)
-                        if len(self.loop_ids_consumed_by_current_course) == len(self.last_course_loop_ids):
-                            break
+                self._execute_program(self._course_program(course_id))
                 self.last_course_loop_ids = self.cur_course_loop_ids
                 self.cur_course_loop_ids = []
                 self.loop_ids_consumed_by_current_course = set()
+                self.row_last_loop_ids.append(self.knit_graph.last_loop_id)
+                if self.validator is not None:
+                    diagnostics = self.validator.validate_new_courses()
+                    assert len(diagnostics) == 0, \
+                        f"KnitSpeak Error: Row {self.current_row} makes an invalid knit graph: {diagnostics}"
                 if self.current_row == row_count:
                     break
-        return self.knit_graph
 
     def populate_0th_course(self, starting_width: int):
         """
@@ -75,10 +123,9 @@ class Knitspeak_Compiler:
         Adds loop_ids in yarn-wise order to self.last_course_loop_ids
         :param starting_width: the number of loops to create
         """
-        for i in range(0, starting_width):
-            loop_id, loop = self.yarn.add_loop_to_end()
-            self.knit_graph.add_loop(loop)
-            self.last_course_loop_ids.append(loop_id)
+        loop_ids = self.knit_graph.add_course([None] * starting_width, yarn_id=self.yarn.yarn_id)
+        self.last_course_loop_ids.extend(loop_ids)
+        self.row_last_loop_ids.append(self.knit_graph.last_loop_id)
 
     def _organize_courses(self):
         """
@@ -127,64 +174,73 @@ class Knitspeak_Compiler:
         if max_course % 2 == 1 and "all_ws" in self._parser.parser.symbolTable:  # ends on rs row
             self.course_ids_to_operations[max_course + 1] = self.course_ids_to_operations[2]
 
-    def _process_instruction(self, instruction: Tuple[Union[tuple, Stitch_Definition, Cable_Definition, list],
-                                                      Tuple[bool, int]]):
-        """
-        :param instruction: A tuple with the knitting instructions and information about how to repeat them
-        instruction[0] can be a stitch definition, cable definition, or a list of instruction tuples
-        instruction[1] is a tuple with a boolean and an int.
-         If the boolean is true, then the integer represents the number of times to repeat the instructions
-         If the boolean is false, then the integer represents the number of loops left after executing the instructions
-        :return:
-        """
-        action = instruction[0]
-        is_stitch = isinstance(action, Stitch_Definition)
-        is_cable = isinstance(action, Cable_Definition)
-        is_list = type(action) is list
-        static_repeats = instruction[1][0]
-        repeats = 1
-        if static_repeats:
-            repeats = instruction[1][1]
-            if isinstance(repeats, Num_Closure):
-                repeats = repeats.to_int()
-        remaining_loops = 0
-        if not static_repeats:
-            remaining_loops = instruction[1][1]
-            if isinstance(remaining_loops, Num_Closure):
-                remaining_loops = remaining_loops.to_int()
-
-        def execute_instructions():
-            """
-            Executes the action according to its type
-            """
-            if is_stitch:
-                self._process_stitch(action)
-            elif is_cable:
-                self._process_cable(action)
-            elif is_list:
-                self._process_list(action)
-            else:
-                self._process_instruction(action)
-
-        if not static_repeats:  # need to iterate until remaining loops is left
-            while (len(self.last_course_loop_ids) - len(self.loop_ids_consumed_by_current_course)) > remaining_loops:
-                execute_instructions()
-            assert remaining_loops == (len(self.last_course_loop_ids) - len(self.loop_ids_consumed_by_current_course))
-        else:
-            for _ in range(0, repeats):
-                execute_instructions()
-
-    def _process_stitch(self, stitch_def: Stitch_Definition, flipped_by_cable=False):
+    def _course_program(self, course_id: int) -> Course_Program:
+        """
+        :param course_id: the course whose instructions are compiled
+        :return: the program of the course for the side of the current row, lowered the first time it is used
+        """
+        key = (course_id, self._working_ws)
+        if key not in self._course_programs:
+            self._course_programs[key] = Course_Program(self.course_ids_to_operations[course_id], self._working_ws)
+        return self._course_programs[key]
+
+    def _execute_program(self, program: Course_Program):
+        """
+        Runs a course program against the prior course, making its stitches until every prior loop is consumed
+        :param program: the program of the current course
+        """
+        opcodes = program.opcodes
+        operands = program.operands
+        last_course_loop_ids = self.last_course_loop_ids
+        consumed = self.loop_ids_consumed_by_current_course
+        counts = []  # the repeats left or the loops to leave for each block being run
+        while len(consumed) < len(last_course_loop_ids):
+            position = 0
+            while position < len(opcodes):
+                opcode = opcodes[position]
+                if opcode == STITCH:
+                    self._process_stitch(operands[position])
+                elif opcode == COURSE_CHECK:
+                    if len(consumed) == len(last_course_loop_ids):
+                        return
+                elif opcode == REPEAT:
+                    count, block_end = operands[position]
+                    if isinstance(count, Num_Closure):
+                        count = count.to_int()
+                    if count > 0:
+                        counts.append(count)
+                    else:
+                        position = block_end
+                elif opcode == REPEAT_END:
+                    counts[-1] -= 1
+                    if counts[-1] > 0:
+                        position = operands[position]
+                        continue
+                    counts.pop()
+                elif opcode == GUARD:
+                    remaining_loops, block_end = operands[position]
+                    if isinstance(remaining_loops, Num_Closure):
+                        remaining_loops = remaining_loops.to_int()
+                    if len(last_course_loop_ids) - len(consumed) > remaining_loops:
+                        counts.append(remaining_loops)
+                    else:
+                        assert remaining_loops == len(last_course_loop_ids) - len(consumed)
+                        position = block_end
+                else:  # GUARD_END
+                    if len(last_course_loop_ids) - len(consumed) > counts[-1]:
+                        position = operands[position]
+                        continue
+                    assert counts.pop() == len(last_course_loop_ids) - len(consumed)
+                position += 1
+
+    def _process_stitch(self, stitch_def: Stitch_Definition):
         """
         Uses a stitch definition and compiler state to generate a new loop and connect it to the prior course.
         May throw two compiler errors.
          if there is no loop at the parent offsets of the stitch, then throw an error reporting the missing index
          if a parent loop has already been consumed, then throw an error reporting the misused parent loop
-        :param flipped_by_cable: if True, implies that this stitch came from a cable and has been flipped appropriately
-        :param stitch_def: the stitch definition used to connect the new loop
+        :param stitch_def: the stitch definition used to connect the new loop, already flipped for wrong-side rows
         """
-        if self._working_ws and not flipped_by_cable:  # flips stitches following hand-knitting conventions
-            stitch_def = stitch_def.copy_and_flip()
         course_index = len(self.cur_course_loop_ids)
         prior_course_index = (len(self.last_course_loop_ids) - 1) - course_index
         if stitch_def.child_loops == 1:
@@ -218,22 +274,3 @@ class Knitspeak_Compiler:
                     f"Knitspeak Error: Loop {parent_loop_id} has already been used"
                 self.loop_ids_consumed_by_current_course.add(parent_loop_id)
                 self.cur_course_loop_ids.append(parent_loop_id)
-
-    def _process_cable(self, cable_def: Cable_Definition):
-        """
-        Uses a cable definition and compiler state to generate and connect a cable
-        :param cable_def: the cable definition used to connect the cable into the knitgraph
-        """
-        if self._working_ws:  # flips cable by hand-knitting convention
-            cable_def = cable_def.copy_and_flip()
-        stitch_definitions = cable_def.stitch_definitions()
-        for stitch_definition in stitch_definitions:
-            self._process_stitch(stitch_definition, flipped_by_cable=True)
-
-    def _process_list(self, action: List[tuple]):
-        """
-        Processes actions in a list of actions
-        :param action: the list of actions
-        """
-        for sub_action in action:
-            self._process_instruction(sub_action)
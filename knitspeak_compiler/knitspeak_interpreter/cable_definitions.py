@@ -1,13 +1,19 @@
 """Cable Definition is used to construct different cable structures"""
-from typing import List
+from typing import Dict, Optional, Tuple
 
 from knit_graphs.Knit_Graph import Pull_Direction
 from knitspeak_compiler.knitspeak_interpreter.stitch_definitions import Stitch_Definition, Stitch_Lean
 
 
+# the cable definitions made by Cable_Definition.interned, keyed by their attributes
+_interned_cables: Dict[Tuple[int, int, Pull_Direction, Pull_Direction, Stitch_Lean], "Cable_Definition"] = {}
+
+
 class Cable_Definition:
     """
-    A class used to organize associated stitch definitions in a cable
+    A class used to organize associated stitch definitions in a cable.
+    Definitions are immutable, so equal definitions made with interned() are one shared object
+     that holds its flipped definition and its stitch definitions once they are first used
     """
 
     def __init__(self, left_crossing_loops: int = 1, right_crossing_loops: int = 1,
@@ -19,6 +25,27 @@ class Cable_Definition:
         self._left_crossing_pull_direction = left_crossing_pull_direction
         self._right_crossing_loops = right_crossing_loops
         self._left_crossing_loops = left_crossing_loops
+        self._flipped: Optional[Cable_Definition] = None
+        self._stitch_definitions: Optional[Tuple[Stitch_Definition, ...]] = None
+
+    @staticmethod
+    def interned(left_crossing_loops: int = 1, right_crossing_loops: int = 1,
+                 left_crossing_pull_direction: Pull_Direction = Pull_Direction.BtF,
+                 right_crossing_pull_direction: Pull_Direction = Pull_Direction.BtF,
+                 cable_lean: Stitch_Lean = Stitch_Lean.Left):
+        """
+        :param left_crossing_loops: the number of loops on the left of the cable
+        :param right_crossing_loops: the number of loops on the right of the cable
+        :param left_crossing_pull_direction: the direction the left loops are pulled
+        :param right_crossing_pull_direction: the direction the right loops are pulled
+        :param cable_lean: the direction the cable leans
+        :return: the shared definition of the cable
+        """
+        key = (left_crossing_loops, right_crossing_loops, left_crossing_pull_direction, right_crossing_pull_direction,
+               cable_lean)
+        if key not in _interned_cables:
+            _interned_cables[key] = Cable_Definition(*key)
+        return _interned_cables[key]
 
     def __len__(self) -> int:
         return self._left_crossing_loops + self._right_crossing_loops
@@ -47,10 +74,12 @@ class Cable_Definition:
         """
         return -1 * self.left_crossing_depth
 
-    def stitch_definitions(self) -> List[Stitch_Definition]:
+    def stitch_definitions(self) -> Tuple[Stitch_Definition, ...]:
         """
-        :return: the list of stitch definitions that construct this cable in yarn-wise order
+        :return: the interned stitch definitions that construct this cable in yarn-wise order
         """
+        if self._stitch_definitions is not None:
+            return self._stitch_definitions
         crossing_offset_direction = self.lean.offset_direction()
         if self.lean is Stitch_Lean.Left:
             crossing_pull_direction = self._left_crossing_pull_direction
@@ -62,30 +91,28 @@ class Cable_Definition:
             crossing_offset_magnitude = self._left_crossing_loops
             stable_pull_direction = self._left_crossing_pull_direction
             stable_offset_magnitude = self._right_crossing_loops
-        crossings = [Stitch_Definition(crossing_pull_direction, 1, [crossing_offset_direction * crossing_offset_magnitude])
-                     for _ in range(0, stable_offset_magnitude)]
-        stable = [Stitch_Definition(stable_pull_direction, -1, [-1 * crossing_offset_direction * stable_offset_magnitude])
-                  for _ in range(0, crossing_offset_magnitude)]
+        crossing = Stitch_Definition.interned(crossing_pull_direction, 1,
+                                              [crossing_offset_direction * crossing_offset_magnitude])
+        crossings = (crossing,) * stable_offset_magnitude
+        stable_stitch = Stitch_Definition.interned(stable_pull_direction, -1,
+                                                   [-1 * crossing_offset_direction * stable_offset_magnitude])
+        stable = (stable_stitch,) * crossing_offset_magnitude
         if self.lean is Stitch_Lean.Left:
-            return stable + crossings
+            self._stitch_definitions = stable + crossings
         else:
-            return crossings + stable
-
-    def copy(self):
-        """
-        :return: a deep copy of the cable definition
-        """
-        newCable = Cable_Definition(self._left_crossing_loops, self._right_crossing_loops,
-                                    self._left_crossing_pull_direction, self._right_crossing_pull_direction, self.lean)
-        return newCable
+            self._stitch_definitions = crossings + stable
+        return self._stitch_definitions
 
-    def copy_and_flip(self):
+    @property
+    def flipped(self):
         """
-        :return: a deep copy of stitch that is flipped
+        :return: the interned cable with its sides and lean swapped, as worked from the other side
         """
-        return Cable_Definition(self._right_crossing_loops, self._left_crossing_loops,
-                                self._right_crossing_pull_direction, self._left_crossing_pull_direction,
-                                self.lean.flip())
+        if self._flipped is None:
+            self._flipped = Cable_Definition.interned(self._right_crossing_loops, self._left_crossing_loops,
+                                                      self._right_crossing_pull_direction,
+                                                      self._left_crossing_pull_direction, self.lean.flip())
+        return self._flipped
 
     def __str__(self):
         return f"C{self.lean}({self._left_crossing_loops}-{self._left_crossing_pull_direction}/{self._right_crossing_loops}-{self._right_crossing_pull_direction}"
@@ -65,7 +65,7 @@ def _flipStitchList(operation_tuple_list: List[tuple]) -> list:
         if type(stDef) is list:
             newStitchDefs.append((_flipStitchList(stDef), operation[1]))
         else:
-            stDef = stDef.copy_and_flip()
+            stDef = stDef.flipped
             newStitchDefs.append((stDef, operation[1]))
     return newStitchDefs
 
@@ -356,6 +356,6 @@ def opId(context: Context, nodes: List[str]) -> Union[Stitch_Definition, Cable_D
     :param nodes: node used to identify stitch type
     :return: the stitch definition or cable definition keyed to this term
     """
-    currentSymbolTable = context.parser.symbolTable
-    assert nodes[0] in currentSymbolTable, "No stitch defined ID={}".format(nodes[0])
-    return currentSymbolTable[nodes[0]]
+    definition = context.parser.symbolTable.get(nodes[0])
+    assert definition is not None, "No stitch defined ID={}".format(nodes[0])
+    return definition
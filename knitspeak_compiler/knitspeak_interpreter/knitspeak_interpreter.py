@@ -1,10 +1,33 @@
 """Components of the parglare parser for knitspeak"""
 
 import os
-from typing import List, Dict, Union
+from typing import List, Dict, Tuple, Union
 
 from knitspeak_compiler.knitspeak_interpreter.symbol_table import Symbol_Table
 from parglare import Grammar, Parser
+from parglare.tables import LRTable, create_load_table
+
+KNITSPEAK_GRAMMAR = os.path.join(os.path.dirname(__file__), "knitspeak.pg")
+# the grammar and LR table loaded from each grammar file, with the modification time and size of the file they are from
+_loaded_grammars: Dict[str, Tuple[Tuple[int, int], Grammar, LRTable]] = {}
+
+
+def load_grammar(grammar_file: str = KNITSPEAK_GRAMMAR) -> Tuple[Grammar, LRTable]:
+    """
+    Loads a grammar and its LR table once per process, so parsers made after the first only cost their own parses.
+    The table is read from the precompiled .pgt file next to the grammar, which parglare rebuilds and saves when it
+     is older than the grammar. Both are loaded again if the grammar file is modified while the process runs
+    :param grammar_file: the path to a parglare grammar
+    :return: the grammar and the LR table of its parser, shared by every caller
+    """
+    status = os.stat(grammar_file)
+    file_version = (status.st_mtime_ns, status.st_size)
+    if grammar_file not in _loaded_grammars or _loaded_grammars[grammar_file][0] != file_version:
+        grammar = Grammar.from_file(grammar_file, ignore_case=True)
+        table = create_load_table(grammar, prefer_shifts=True)
+        _loaded_grammars[grammar_file] = (file_version, grammar, table)
+    _, grammar, table = _loaded_grammars[grammar_file]
+    return grammar, table
 
 
 class KnitSpeak_Interpreter:
@@ -14,7 +37,7 @@ class KnitSpeak_Interpreter:
 
     Attributes
     ----------
-    parser: the parglare Parser that we add a symbol table to
+    parser: the parglare Parser that we add a symbol table to. Parsers share the grammar and table from load_grammar
     """
 
     def __init__(self, debugGrammar: bool = False, debugParser: bool = False, debugParserLayout: bool = False):
@@ -24,10 +47,12 @@ class KnitSpeak_Interpreter:
         :param debugParser: if true, parglare parser is set to debug mod
         :param debugParserLayout: if true, parser layout is debuggable
         """
-        directory = os.path.dirname(__file__)
-        pg_loc = directory + f"{os.path.sep}knitspeak.pg"
-        self._grammar = Grammar.from_file(pg_loc, debug=debugGrammar, ignore_case=True)
-        self.parser = Parser(self._grammar, debug=debugParser, debug_layout=debugParserLayout)
+        if debugGrammar:
+            self._grammar = Grammar.from_file(KNITSPEAK_GRAMMAR, debug=True, ignore_case=True)
+            self.parser = Parser(self._grammar, debug=debugParser, debug_layout=debugParserLayout)
+        else:
+            self._grammar, table = load_grammar()
+            self.parser = Parser(self._grammar, debug=debugParser, debug_layout=debugParserLayout, table=table)
         self.parser.symbolTable = Symbol_Table()
 
     def parse(self, pattern: str, pattern_is_file: bool = False) -> List[Dict[str, Union[List[int], List[tuple]]]]:
@@ -1,6 +1,6 @@
 """Stitch definitions are used to construct a stitch at compile time"""
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, Optional, Sequence, Tuple
 
 from knit_graphs.Knit_Graph import Pull_Direction
 
@@ -44,14 +44,20 @@ class Stitch_Lean(Enum):
             return self
 
 
+# the stitch definitions made by Stitch_Definition.interned, keyed by their attributes
+_interned_stitches: Dict[Tuple[Pull_Direction, int, Tuple[int, ...], int], "Stitch_Definition"] = {}
+
+
 class Stitch_Definition:
     """
-    A class used to define how a stitch edge should be created
+    A class used to define how a stitch edge should be created.
+    Definitions are immutable, so equal definitions made with interned() are one shared object
+     that holds its flipped definition once it is first used
     ...
 
     Attributes
     ----------
-    offset_to_parent_loops : list of integers
+    offset_to_parent_loops : tuple of integers
         a stack of offsets from child loop to parent loop in prior course.
         Stack order implies stacking order of parent loops through child.
     pull_direction:
@@ -63,13 +69,60 @@ class Stitch_Definition:
     """
 
     def __init__(self, pull_direction: Pull_Direction = Pull_Direction.BtF, cabling_depth: int = 0,
-                 offset_to_parent_loops: Optional[List[int]] = None, child_loops: int = 1):
-        self.child_loops = child_loops
+                 offset_to_parent_loops: Optional[Sequence[int]] = None, child_loops: int = 1):
+        self._child_loops: int = child_loops
+        if offset_to_parent_loops is None:
+            offset_to_parent_loops = [0]
+        self._offset_to_parent_loops: Tuple[int, ...] = tuple(offset_to_parent_loops)
+        self._pull_direction: Pull_Direction = pull_direction
+        self._cabling_depth: int = cabling_depth
+        self._flipped: Optional[Stitch_Definition] = None
+
+    @staticmethod
+    def interned(pull_direction: Pull_Direction = Pull_Direction.BtF, cabling_depth: int = 0,
+                 offset_to_parent_loops: Optional[Sequence[int]] = None, child_loops: int = 1):
+        """
+        :param pull_direction: the direction to pull the child loop through the parents
+        :param cabling_depth: the depth of the stitch crossing over stitches
+        :param offset_to_parent_loops: the stack of offsets from the child loop to its parent loops, [0] by default
+        :param child_loops: the number of child loops
+        :return: the shared definition of the stitch
+        """
         if offset_to_parent_loops is None:
             offset_to_parent_loops = [0]
-        self.offset_to_parent_loops: List[int] = offset_to_parent_loops
-        self.pull_direction: Pull_Direction = pull_direction
-        self.cabling_depth = cabling_depth
+        key = (pull_direction, cabling_depth, tuple(offset_to_parent_loops), child_loops)
+        if key not in _interned_stitches:
+            _interned_stitches[key] = Stitch_Definition(pull_direction, cabling_depth, offset_to_parent_loops,
+                                                        child_loops)
+        return _interned_stitches[key]
+
+    @property
+    def offset_to_parent_loops(self) -> Tuple[int, ...]:
+        """
+        :return: the stack of offsets from the child loop to its parent loops
+        """
+        return self._offset_to_parent_loops
+
+    @property
+    def pull_direction(self) -> Pull_Direction:
+        """
+        :return: the direction to pull the child loop through the parents
+        """
+        return self._pull_direction
+
+    @property
+    def cabling_depth(self) -> int:
+        """
+        :return: the depth of this stitch crossing over stitches
+        """
+        return self._cabling_depth
+
+    @property
+    def child_loops(self) -> int:
+        """
+        :return: the number of child loops
+        """
+        return self._child_loops
 
     @property
     def is_decrease(self) -> bool:
@@ -93,32 +146,16 @@ class Stitch_Definition:
         else:
             return Stitch_Lean.Right
 
-    def flip(self):
-        """
-        switches the pull_direction and the lean of the stitch
-        """
-        if self.pull_direction is Pull_Direction.BtF:
-            self.pull_direction = Pull_Direction.FtB
-        else:
-            self.pull_direction = Pull_Direction.BtF
-        new_offsets = [offset * -1 for offset in reversed(self.offset_to_parent_loops)]
-        self.offset_to_parent_loops = new_offsets
-
-    def copy(self):
-        """
-        :return: a deep copy of this stitch definition
-        """
-        definition = Stitch_Definition(pull_direction=self.pull_direction, cabling_depth=self.cabling_depth,
-                                       offset_to_parent_loops=self.offset_to_parent_loops, child_loops=self.child_loops)
-        return definition
-
-    def copy_and_flip(self):
+    @property
+    def flipped(self):
         """
-        :return: a deep copy of stitch that is flipped
+        :return: the interned stitch with the opposite pull_direction and lean, as worked from the other side
         """
-        copy = self.copy()
-        copy.flip()
-        return copy
+        if self._flipped is None:
+            pull_direction = Pull_Direction.FtB if self.pull_direction is Pull_Direction.BtF else Pull_Direction.BtF
+            offsets = [offset * -1 for offset in reversed(self.offset_to_parent_loops)]
+            self._flipped = Stitch_Definition.interned(pull_direction, self.cabling_depth, offsets, self.child_loops)
+        return self._flipped
 
     def __eq__(self, other):
         instance = isinstance(other, Stitch_Definition)
@@ -1,7 +1,8 @@
 """Script used to create knitout instructions from a knitgraph"""
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 from knit_graphs.Knit_Graph import Knit_Graph, Pull_Direction
+from knit_graphs.Knit_Graph_View import Knit_Graph_View
 from knitting_machine.Machine_State import Machine_State, Needle, Pass_Direction
 from knitting_machine.machine_operations import outhook
 from knitting_machine.operation_sets import Carriage_Pass, Instruction_Type
@@ -12,11 +13,15 @@ class Knitout_Generator:
     A class that is used to generate a single yarn knit-graph
     """
 
-    def __init__(self, knit_graph: Knit_Graph):
+    def __init__(self, knit_graph: Union[Knit_Graph, Knit_Graph_View], validate: bool = False):
         """
-        :param knit_graph: the knitgraph to generate instructions for
+        :param knit_graph: the knitgraph, or a view of a region of a knitgraph, to generate instructions for.
+         The first course of a view is cast on
+        :param validate: if True, a knit graph (not a view) is checked before any pass is planned
+         and an invalid knit graph (e.g., with a dangling loop) fails instead of generating instructions
         """
         self._knit_graph = knit_graph
+        self._validate: bool = validate
         assert len(self._knit_graph.yarns) == 1, "This only supports single color graphs"
         self._carrier = [*self._knit_graph.yarns.values()][0].carrier
         loop_id_to_course, courses_to_loop_ids = self._knit_graph.get_courses()
@@ -31,6 +36,9 @@ class Knitout_Generator:
         """
         Generates the instructions for this knitgraph
         """
+        if self._validate and isinstance(self._knit_graph, Knit_Graph):
+            diagnostics = self._knit_graph.validate()
+            assert len(diagnostics) == 0, f"Cannot knit an invalid knit graph: {diagnostics}"
         self._add_header()
         self._cast_on()
         assert self._machine_state.last_carriage_direction is Pass_Direction.Left_to_Right, \
@@ -54,7 +62,7 @@ class Knitout_Generator:
         :param course_number: the course identifier for comments only
         """
         carrier_set = [self._carrier]
-        loop_id_to_target_needle = self._do_xfers_for_row(loop_ids, direction)
+        loop_id_to_target_needle = self._do_xfers_for_row(loop_ids, direction, course_number)
         #  collect the needles that need to be knitted and the loop_id being created on each needle
         needles: Dict[Needle, Tuple[int, None]] = {}
         for loop_id, target_needle in loop_id_to_target_needle.items():
@@ -65,17 +73,23 @@ class Knitout_Generator:
         #  I recommend including a course comment with the course id
         self._add_carriage_pass(carriage_pass, f"Knit course {course_number}")
 
-    def _do_xfers_for_row(self, loop_ids: List[int], direction: Pass_Direction) -> Dict[int, Needle]:
+    def _do_xfers_for_row(self, loop_ids: List[int], direction: Pass_Direction, course_number: int) \
+            -> Dict[int, Needle]:
         """
-        Completes all the xfers needed to prepare a row
+        Completes all the xfers needed to prepare a row.
+        The decrease and cable passes are only planned on courses whose motifs include decreases or cables
         :param loop_ids: the loop ids of a single course
         :param direction: the direction that the loops will be knit in
+        :param course_number: the course of the loops
         :return loop_id_to_target_needle: loop ids mapped to target needles to be knit on
         """
+        motifs = self._knit_graph.course_motifs(course_number)
         loop_id_to_target_needle, parent_loops_to_needles, decrease_offsets, front_cable_offsets, back_cable_offsets \
             = self._find_target_needles(loop_ids, direction)
-        self._do_decrease_transfers(parent_loops_to_needles, decrease_offsets)
-        self._do_cable_transfers(parent_loops_to_needles, front_cable_offsets, back_cable_offsets)
+        if len(motifs.decrease_ids) > 0:
+            self._do_decrease_transfers(parent_loops_to_needles, decrease_offsets)
+        if len(motifs.cable_ids) > 0:
+            self._do_cable_transfers(parent_loops_to_needles, front_cable_offsets, back_cable_offsets)
         self._do_knit_purl_xfers(loop_id_to_target_needle)
         return loop_id_to_target_needle
 
@@ -103,8 +117,11 @@ class Knitout_Generator:
         # .... only includes parents involved in a decrease
 
         max_needle = len(loop_ids) - 1  # last needle being used to create this swatch
+        # the attributes of every stitch into the course, read as columns in one slice of the stitch storage
+        stitches = self._knit_graph.stitches_into(loop_ids)
         for loop_pos, loop_id in enumerate(loop_ids):  # find target needle locations of each loop in the course
-            parent_ids = [*self._knit_graph.graph.predecessors(loop_id)]
+            first_edge = stitches.child_starts[loop_pos]
+            parent_ids = stitches.parents_of(loop_pos)
             for parent_id in parent_ids:  # find current needle of all parent loops
                 parent_needle = self._machine_state.get_needle_of_loop(parent_id)
                 assert parent_needle is not None, f"Parent loop {parent_id} is not held on a needle"
@@ -118,11 +135,11 @@ class Knitout_Generator:
                 else:
                     loop_id_to_target_needle[loop_id] = Needle(True, max_needle - loop_pos)
             elif len(parent_ids) == 1:  # knit, purl, may be in cable, no needle
-                parent_id = [*parent_ids][0]
+                parent_id = parent_ids[0]
                 parent_needle = parent_loops_to_needles[parent_id]
-                parent_offset = self._knit_graph.graph[parent_id][loop_id]["parent_offset"]
-                cable_depth = self._knit_graph.graph[parent_id][loop_id]["depth"]
-                pull_direction = self._knit_graph.graph[parent_id][loop_id]["pull_direction"]
+                parent_offset = stitches.offsets[first_edge]
+                cable_depth = stitches.depths[first_edge]
+                pull_direction = Pull_Direction.from_code(stitches.pull_directions[first_edge])
                 front_bed = pull_direction is Pull_Direction.BtF  # knit on front bed, purl on back bed
 
                 #  if there is a parent offset, this must be in a cable (depth != 0)
@@ -139,17 +156,16 @@ class Knitout_Generator:
                 #  collect the parent offset information
                 parents_to_offsets[parent_id] = parent_offset
             else:  # decrease, the bottom parent loop in the stack will be on the target needle
-                loop = self._knit_graph.loops[loop_id]
                 target_needle = None  # re-assigned on first iteration to needle of first parent
-                for i, parent in enumerate(loop.parent_loops):
-                    parent_needle = parent_loops_to_needles[parent.loop_id]
+                for i, parent_id in enumerate(parent_ids):
+                    parent_needle = parent_loops_to_needles[parent_id]
                     if i == 0:  # first parent in stack
                         target_needle = parent_needle
                     loop_id_to_target_needle[loop_id] = target_needle
-                    offset = self._knit_graph.graph[parent.loop_id][loop_id]["parent_offset"]
+                    offset = stitches.offsets[first_edge + i]
                     # Note, if the offset is wrong, this code will not work. Validate in KnitGraph
-                    parents_to_offsets[parent.loop_id] = offset
-                    decrease_offsets[parent.loop_id] = offset
+                    parents_to_offsets[parent_id] = offset
+                    decrease_offsets[parent_id] = offset
 
         return loop_id_to_target_needle, parent_loops_to_needles, decrease_offsets, \
                front_cable_offsets, back_cable_offsets
@@ -0,0 +1,40 @@
+"""Tests of knit graphs with repeated blocks of courses"""
+from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+
+
+def _assert_same_graph(knit_graph, expected):
+    assert [*knit_graph.loops] == [*expected.loops]
+    for loop_id in expected.loops:
+        parent_ids = [*expected.graph.predecessors(loop_id)]
+        assert [*knit_graph.graph.predecessors(loop_id)] == parent_ids
+        for parent_id in parent_ids:
+            assert dict(knit_graph.graph[parent_id][loop_id]) == dict(expected.graph[parent_id][loop_id])
+    assert [*knit_graph.get_courses()[0].items()] == [*expected.get_courses()[0].items()]
+
+
+def test_compressed_stst():
+    pattern = "all rs rows k. all ws rows p."
+    compressed = Knitspeak_Compiler().compile_compressed(4, 2000, pattern)
+    assert len(compressed.prefix.loops) == 20 and compressed.stride == 8 and compressed.repeat_count == 998
+    assert len(compressed) == 4 * 2001 and compressed.parent_ids(8003) == [7996]
+    compressed = Knitspeak_Compiler().compile_compressed(4, 9, pattern)
+    assert compressed.tail_loop_count == 4
+    _assert_same_graph(compressed.expand(), Knitspeak_Compiler().compile(4, 9, pattern))
+
+
+def test_compressed_lace():
+    pattern = r"""
+        all rs rows k, k2tog, yo 2, sk2po, yo 2, skpo, k. 
+        all ws rows p 2, k, p 3, k, p 2.
+    """
+    compressed = Knitspeak_Compiler().compile_compressed(9, 10, pattern)
+    assert compressed.repeat_count == 3 and compressed.tail_loop_count == 0
+    expected = Knitspeak_Compiler().compile(9, 10, pattern)
+    assert [*compressed] == [*expected.loops]
+    assert all(compressed.parent_ids(loop_id) == [*expected.graph.predecessors(loop_id)] for loop_id in expected.loops)
+    _assert_same_graph(compressed.expand(), expected)
+
+
+if __name__ == "__main__":
+    test_compressed_stst()
+    test_compressed_lace()
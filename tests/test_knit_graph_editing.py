@@ -0,0 +1,53 @@
+"""Tests of removing loops and stitches from knit graphs and compacting their ids"""
+import os
+import tempfile
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Knit_Graph_File import read_knit_graph, write_knit_graph
+from knit_graphs.Wale_Index import NO_LOOP
+
+
+def _structure(knit_graph: Knit_Graph) -> str:
+    return knit_graph.structural_hash.hexdigest()
+
+
+def test_remove_course():
+    knit_graph = stockinette(4, 5)
+    knit_graph.remove_loops(knit_graph.course_index.course_loop_ids(2))
+    assert len(knit_graph.loops) == 16 and knit_graph.graph.number_of_edges() == 8
+    assert 9 not in knit_graph and [*knit_graph.yarns["yarn"]][4:9] == [4, 5, 6, 7, 12]
+    assert knit_graph[12].prior_loop_id(knit_graph) == 7 and knit_graph[7].next_loop_id(knit_graph) == 12
+    # knit the course above the removed course into the course below it
+    for child_id, parent_id in zip(range(12, 16), range(7, 3, -1)):
+        knit_graph.replace_parents(child_id, [parent_id])
+    assert knit_graph.course_index.course_count == 4
+    loop_remap = knit_graph.compact()
+    assert [*loop_remap[6:14]] == [6, 7, NO_LOOP, NO_LOOP, NO_LOOP, NO_LOOP, 8, 9]
+    assert [*knit_graph.loops] == [*range(0, 16)] and knit_graph.last_loop_id == 15
+    assert _structure(knit_graph) == _structure(stockinette(4, 4))
+
+
+def test_remove_stitch():
+    knit_graph = lace(4, 4)
+    fork = knit_graph.fork()
+    decrease = next(loop_id for loop_id in fork.loops if len(fork[loop_id].parent_loops) == 2)
+    bottom_parent, top_parent = fork[decrease].parent_loops
+    fork.remove_stitch(bottom_parent.loop_id, decrease)
+    assert [parent.loop_id for parent in fork[decrease].parent_loops] == [top_parent.loop_id]
+    assert fork.stitches.edge_stack_positions[fork.stitches.find_edge(top_parent.loop_id, decrease)] == 0
+    assert fork.graph.number_of_edges() == knit_graph.graph.number_of_edges() - 1
+    assert _structure(fork) != _structure(knit_graph)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "lace.kg")
+        write_knit_graph(fork, path)
+        loaded = read_knit_graph(path)
+        assert loaded.graph.number_of_edges() == fork.graph.number_of_edges()
+        assert _structure(loaded) == _structure(fork)
+    fork.compact()
+    assert _structure(fork) == _structure(loaded)
+    assert len(knit_graph[decrease].parent_loops) == 2
+
+
+if __name__ == "__main__":
+    test_remove_course()
+    test_remove_stitch()
@@ -0,0 +1,60 @@
+"""Tests of the binary knit graph file format"""
+import os
+import tempfile
+from typing import List
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Knit_Graph_File import read_knit_graph, write_knit_graph
+from knitting_machine.knitgraph_to_knitout import Knitout_Generator
+
+
+def _knitout(knit_graph: Knit_Graph) -> List[str]:
+    generator = Knitout_Generator(knit_graph)
+    generator.generate_instructions()
+    return generator._instructions
+
+
+def _assert_same_graph(knit_graph: Knit_Graph, expected: Knit_Graph):
+    assert [*knit_graph.loops] == [*expected.loops]
+    for loop_id in expected.loops:
+        assert knit_graph[loop_id].is_twisted == expected[loop_id].is_twisted
+        parent_ids = [*expected.graph.predecessors(loop_id)]
+        assert [*knit_graph.graph.predecessors(loop_id)] == parent_ids
+        assert [*knit_graph.graph.successors(loop_id)] == [*expected.graph.successors(loop_id)]
+        for parent_id in parent_ids:
+            assert dict(knit_graph.graph[parent_id][loop_id]) == dict(expected.graph[parent_id][loop_id])
+    assert [*knit_graph.get_courses()[0].items()] == [*expected.get_courses()[0].items()]
+    assert [*knit_graph.yarns] == [*expected.yarns]
+    for yarn_id, yarn in expected.yarns.items():
+        assert [*knit_graph.yarns[yarn_id]] == [*yarn]
+        assert knit_graph.yarns[yarn_id].carrier.carrier_id == yarn.carrier.carrier_id
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cables.kg")
+        for knit_graph in [lace(4, 4), twisted_stripes(4, 3), both_twists(height=4)]:
+            write_knit_graph(knit_graph, path)
+            for memory_map in [True, False]:
+                loaded = read_knit_graph(path, memory_map)
+                _assert_same_graph(loaded, knit_graph)
+                assert _knitout(loaded) == _knitout(knit_graph)
+
+
+def test_modify_loaded_graph():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stockinette.kg")
+        write_knit_graph(stockinette(4, 2), path)
+        knit_graph = read_knit_graph(path)
+        assert isinstance(knit_graph.stitches.edge_parents, memoryview)
+        # the first change copies the mapped columns, the file is unchanged
+        knit_graph.add_course([*reversed(range(4, 8))])
+        _assert_same_graph(knit_graph, stockinette(4, 3))
+        knit_graph[0].is_twisted = True
+        assert not read_knit_graph(path)[0].is_twisted
+        assert len(read_knit_graph(path).loops) == 8
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_modify_loaded_graph()
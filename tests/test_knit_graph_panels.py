@@ -0,0 +1,41 @@
+"""Tests of assembling knit graphs from panels"""
+from typing import List
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Knit_Graph_Panels import place_side_by_side, stack_panels
+from knitting_machine.knitgraph_to_knitout import Knitout_Generator
+
+
+def _knitout(knit_graph: Knit_Graph) -> List[str]:
+    generator = Knitout_Generator(knit_graph)
+    generator.generate_instructions()
+    return generator._instructions
+
+
+def test_stack_panels():
+    stacked = stack_panels([stockinette(4, 3), stockinette(4, 2)])
+    assert stacked.structural_hash.hexdigest() == stockinette(4, 4).structural_hash.hexdigest()
+    assert _knitout(stacked) == _knitout(stockinette(4, 4))
+    hem, body = rib(4, 3), lace(4, 5)
+    stacked = stack_panels([hem, body, seed(4, 3)])
+    assert stacked.course_index.course_count == 3 + 4 + 2
+    assert len(stacked.loops) == 4 * 9
+    # the first lace course is knit into the last course of the hem
+    assert sorted(stacked.course_stitches(3).parent_ids) == [*stacked.course_index.course_loop_ids(2)]
+    assert len(hem.loops) == 12 and len(body.loops) == 20
+    assert len(_knitout(stacked)) > 0
+
+
+def test_place_side_by_side():
+    joined = place_side_by_side([stockinette(3, 4), stockinette(5, 4)])
+    assert joined.structural_hash.hexdigest() == stockinette(8, 4).structural_hash.hexdigest()
+    assert _knitout(joined) == _knitout(stockinette(8, 4))
+    joined = place_side_by_side([rib(4, 4), lace(4, 4), seed(4, 4)])
+    assert joined.wale_index.course_columns(3) == [*range(11, -1, -1)]
+    assert joined.wale_index.course_columns(0) == [*range(0, 12)]
+    assert len(_knitout(joined)) > 0
+
+
+if __name__ == "__main__":
+    test_stack_panels()
+    test_place_side_by_side()
@@ -0,0 +1,49 @@
+"""Tests of the per-course stitch census of knit graphs"""
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Pull_Direction import Pull_Direction
+from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+
+
+def _assert_matches_graph(knit_graph: Knit_Graph):
+    statistics = knit_graph.statistics()
+    loop_ids_to_course, courses_to_loop_ids = knit_graph.get_courses()
+    assert statistics.course_count == len(courses_to_loop_ids)
+    for course, loop_ids in courses_to_loop_ids.items():
+        parents = {loop_id: [*knit_graph.graph.predecessors(loop_id)] for loop_id in loop_ids}
+        stitches = [knit_graph.graph[parent_ids[0]][loop_id] for loop_id, parent_ids in parents.items()
+                    if len(parent_ids) > 0]
+        assert statistics.loops[course] == len(loop_ids)
+        assert statistics.knits[course] == sum(stitch["pull_direction"] is Pull_Direction.BtF for stitch in stitches)
+        assert statistics.purls[course] == sum(stitch["pull_direction"] is Pull_Direction.FtB for stitch in stitches)
+        assert statistics.yarn_overs[course] == (0 if course == 0 else [*map(len, parents.values())].count(0))
+        assert statistics.twisted[course] == sum(knit_graph[loop_id].is_twisted for loop_id in loop_ids)
+        for arity, counts in statistics.decreases.items():
+            assert counts[course] == [*map(len, parents.values())].count(arity)
+        for depth, counts in statistics.cables.items():
+            assert counts[course] == sum(stitch["depth"] == depth for stitch in stitches)
+
+
+def test_statistics():
+    for knit_graph in [lace(6, 4), rib(4, 4), twisted_stripes(4, 3), both_twists(height=4)]:
+        _assert_matches_graph(knit_graph)
+    statistics = lace(6, 4).statistics()
+    assert [*statistics.yarn_overs] == [0, 2, 0, 2] and [*statistics.decreases[2]] == [0, 1, 0, 1]
+    assert statistics.totals()["knits"] == 14
+
+
+def test_compiled_statistics():
+    pattern = r"""
+        1st row k, lc2|2, k, rc2|2, [k] to end.
+        all ws rows p.
+        3rd row k 2, lc2|1, k, rc1|2, [k] to end.
+        5th row k, yo, k2tog, yo, sk2po, yo, [k] to end.
+    """
+    knit_graph = Knitspeak_Compiler().compile(12, 6, pattern)
+    _assert_matches_graph(knit_graph)
+    statistics = knit_graph.statistics()
+    assert sorted(statistics.cables) == [-1, 1] and sorted(statistics.decreases) == [2, 3]
+
+
+if __name__ == "__main__":
+    test_statistics()
+    test_compiled_statistics()
@@ -0,0 +1,144 @@
+"""Tests of the array-backed storage behind Knit_Graph"""
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Loop import Loop
+
+
+def test_stitch_edges():
+    knit_graph = lace(4, 4)
+    assert knit_graph.graph.number_of_nodes() == 16
+    assert knit_graph.graph.number_of_edges() == 12
+    decrease = [loop_id for loop_id in knit_graph.graph.nodes if len([*knit_graph.graph.predecessors(loop_id)]) == 2][0]
+    parent_ids = [*knit_graph.graph.predecessors(decrease)]
+    assert parent_ids == [parent.loop_id for parent in knit_graph[decrease].parent_loops]
+    assert knit_graph.graph[parent_ids[1]][decrease]["parent_offset"] == -1
+    assert knit_graph.graph[parent_ids[1]][decrease]["pull_direction"] is Pull_Direction.BtF
+    assert (parent_ids[0], decrease) in knit_graph.graph.edges
+
+
+def test_stack_position():
+    knit_graph = stockinette(3, 1)
+    yarn = knit_graph.yarns["yarn"]
+    child_id, child = yarn.add_loop_to_end()
+    knit_graph.add_loop(child)
+    knit_graph.connect_loops(0, child_id)
+    knit_graph.connect_loops(2, child_id)
+    knit_graph.connect_loops(1, child_id, stack_position=0)
+    assert [*knit_graph.graph.predecessors(child_id)] == [1, 0, 2]
+    assert [*knit_graph.graph.successors(1)] == [child_id]
+    stitches = knit_graph.stitches
+    assert [stitches.edge_stack_positions[edge_id] for edge_id in stitches.parent_edges(child_id)] == [0, 1, 2]
+
+
+def test_course_stitches():
+    knit_graph = lace(4, 4)
+    course = knit_graph.course_stitches(1)  # knit, yarn-over, decrease, knit
+    assert [*course.child_ids] == [4, 5, 6, 7] and [*course.child_starts] == [0, 1, 1, 3, 4]
+    assert [*course.parents_of(2)] == [1, 2] and course.parent_count(1) == 0
+    assert [*course.offsets] == [0, 0, -1, 0] and [*course.stack_positions] == [0, 0, 1, 0]
+    assert [*course.pull_directions] == [Pull_Direction.BtF.code] * 4 and [*course.depths] == [0] * 4
+
+
+def test_loop_table():
+    knit_graph = stockinette(2, 2)
+    yarn = knit_graph.yarns["yarn"]
+    loop_id, loop = yarn.add_loop_to_end(is_twisted=True)
+    knit_graph.add_loop(loop)
+    knit_graph.connect_loops(3, loop_id)
+    handle = knit_graph[loop_id]
+    assert handle == loop and handle.is_twisted and handle.yarn_id == "yarn"
+    handle.is_twisted = False
+    assert not loop.is_twisted
+    assert [parent.loop_id for parent in loop.parent_loops] == [3]
+    # parent stacks are views of the stitch storage
+    parent_loops = loop.parent_loops
+    knit_graph.connect_loops(2, loop_id, stack_position=0)
+    assert len(parent_loops) == 2 and parent_loops[0].loop_id == 2 and parent_loops[-1:] == [knit_graph[3]]
+    assert len(Loop(10, "yarn").parent_loops) == 0
+    assert [*knit_graph.loops] == [0, 1, 2, 3, 4] and len(knit_graph.loops) == 5
+
+
+def test_course_index():
+    knit_graph = lace(4, 4)
+    loop_ids_to_course, course_to_loop_ids = knit_graph.get_courses()
+    assert [*course_to_loop_ids[2]] == [8, 9, 10, 11]
+    assert loop_ids_to_course[13] == 3 and len(course_to_loop_ids) == 4
+    # a stitch into an earlier course is indexed by rebuilding the courses
+    yarn = knit_graph.yarns["yarn"]
+    loop_id, loop = yarn.add_loop_to_end()
+    knit_graph.add_loop(loop)
+    knit_graph.connect_loops(10, 12)
+    assert knit_graph.course_index.course_of(loop_id) == 3
+    assert [*course_to_loop_ids[3]] == [12, 13, 14, 15, 16]
+
+
+def test_wale_index():
+    knit_graph = lace(4, 4)
+    wale_index = knit_graph.wale_index
+    assert wale_index.course_columns(1) == [3, 2, 1, 0]
+    assert wale_index.wale(9) == [1, 6, 9, 14]  # the decrease ends the wale of loop 2
+    assert wale_index.wale_child(2) == -1 and wale_index.wale_parent(5) == -1
+    knit_graph = twisted_stripes(4, 3)
+    assert knit_graph.wale_index.wale(0) == [0, 7, 8]
+    assert knit_graph.wale_index.wale(1) == [1, 5, 10]  # the cable crosses the wale over a column
+
+
+def test_yarn_sequence():
+    knit_graph = stockinette(3, 2)
+    yarn = knit_graph.yarns["yarn"]
+    assert [*yarn] == [0, 1, 2, 3, 4, 5] and yarn.last_loop_id == 5
+    assert 4 in yarn and 6 not in yarn and yarn.position_of(4) == 4
+    assert [*yarn.yarn_graph.edges][:2] == [(0, 1), (1, 2)]
+    assert [*yarn.yarn_graph.successors(5)] == [] and [*yarn.yarn_graph.predecessors(5)] == [4]
+    assert yarn[3] == knit_graph[3]
+
+
+def test_add_course():
+    expected = lace(4, 4)
+    knit_graph = Knit_Graph()
+    knit_graph.add_yarn(Yarn("yarn", knit_graph))
+    prior_course = knit_graph.add_course([None] * 4)
+    for course in range(1, 4):
+        parents = [*reversed(prior_course)]
+        if course % 2 == 1:  # knit, yarn-over, decrease, knit
+            prior_course = knit_graph.add_course([parents[0], None, [parents[2], parents[1]], parents[3]],
+                                                 parent_offsets=[0, 0, [0, -1], 0])
+        else:
+            prior_course = knit_graph.add_course(parents)
+    assert [*knit_graph.loops] == [*expected.loops]
+    for loop_id in expected.loops:
+        parent_ids = [*expected.graph.predecessors(loop_id)]
+        assert [*knit_graph.graph.predecessors(loop_id)] == parent_ids
+        for parent_id in parent_ids:
+            assert dict(knit_graph.graph[parent_id][loop_id]) == dict(expected.graph[parent_id][loop_id])
+    assert [*knit_graph.get_courses()[0].items()] == [*expected.get_courses()[0].items()]
+    assert knit_graph.wale_index.loop_columns == expected.wale_index.loop_columns
+    assert [*knit_graph.yarns["yarn"]] == [*expected.yarns["yarn"]]
+
+
+
+def test_fork():
+    base = stockinette(4, 2)
+    variant = base.fork()
+    assert variant.stitches.edge_parents is base.stitches.edge_parents
+    # a decrease in the variant copies the storage it changes, the base graph is unchanged
+    variant.add_course([7, None, [5, 6], 4], parent_offsets=[0, 0, [0, 1], 0])
+    variant[0].is_twisted = True
+    assert variant.stitches.edge_parents is not base.stitches.edge_parents
+    assert len(base.loops) == 8 and len(base.stitches) == 4 and not base[0].is_twisted
+    assert base.get_courses()[1][1] == range(4, 8) and len(base.yarns["yarn"]) == 8
+    assert len(variant.loops) == 12 and [*variant.graph.predecessors(10)] == [5, 6]
+    assert variant.course_index.course_count == 3 and [*variant.yarns["yarn"]] == [*range(0, 12)]
+    # the base graph copies shared storage before it is modified
+    base.add_course([*reversed(range(4, 8))])
+    assert [*base.graph.predecessors(10)] == [5] and [*variant.graph.predecessors(10)] == [5, 6]
+
+if __name__ == "__main__":
+    test_stitch_edges()
+    test_stack_position()
+    test_course_stitches()
+    test_loop_table()
+    test_course_index()
+    test_wale_index()
+    test_yarn_sequence()
+    test_add_course()
+    test_fork()
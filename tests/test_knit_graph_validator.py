@@ -0,0 +1,54 @@
+"""Tests of the structural validation of knit graphs"""
+import pytest
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Knit_Graph_Validator import DANGLING_LOOP, Knit_Graph_Validator, MISALIGNED_PARENT, \
+    OFFSET_OUTSIDE_PRIOR_COURSE, OFFSET_WITHOUT_CABLE, PARENT_CONSUMED_TWICE
+from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+from knitting_machine.knitgraph_to_knitout import Knitout_Generator
+
+
+def _codes(diagnostics) -> list:
+    return [(diagnostic.code, diagnostic.loop_id) for diagnostic in diagnostics]
+
+
+def test_validate():
+    for knit_graph in [stockinette(4, 4), rib(4, 4, 2), seed(4, 4), lace(8, 6), both_twists(height=4)]:
+        assert knit_graph.validate() == []
+    # the last column of a lace swatch six loops wide has a yarn-over but no decrease, so loop 0 is never knit
+    assert _codes(lace(6, 4).validate()) == [(DANGLING_LOOP, 0)]
+    knit_graph = stockinette(4, 3)
+    knit_graph.replace_parents(5, [1], parent_offsets=1)
+    assert _codes(knit_graph.validate()) == [(PARENT_CONSUMED_TWICE, 1), (DANGLING_LOOP, 2), (OFFSET_WITHOUT_CABLE, 5)]
+    assert _codes(knit_graph.validate(range(2, 3))) == []
+    knit_graph.replace_parents(7, [0], parent_offsets=-2)
+    assert (OFFSET_OUTSIDE_PRIOR_COURSE, 7) in _codes(knit_graph.validate(range(1, 2)))
+    # the knitout generator only rejects invalid knit graphs when asked to validate them
+    Knitout_Generator(lace(6, 4)).generate_instructions()
+    with pytest.raises(AssertionError, match="Cannot knit an invalid knit graph"):
+        Knitout_Generator(lace(6, 4), validate=True).generate_instructions()
+
+
+def test_validate_new_courses():
+    knit_graph = stockinette(4, 2)
+    validator = Knit_Graph_Validator(knit_graph)
+    assert validator.validate_new_courses() == []
+    knit_graph.add_course([7, 6, [5, 4], None])
+    assert _codes(validator.validate_new_courses()) == [(MISALIGNED_PARENT, 10)]
+    knit_graph.add_course([11, None, 10, 9])
+    assert validator.validate_new_courses() == []
+    # loop 8 may still be slipped and knit, it is only reported once two courses are made above it
+    knit_graph.add_course([15, 14, 13, 12])
+    assert _codes(validator.validate_new_courses()) == [(DANGLING_LOOP, 8)]
+    pattern = r"""
+        all rs rows k, k2tog, yo 2, sk2po, yo 2, skpo, k.
+        all ws rows p 2, k, p 3, k, p 2.
+    """
+    with pytest.raises(AssertionError, match="Row 1 makes an invalid knit graph"):
+        Knitspeak_Compiler(validate=True).compile(9, 6, pattern)
+    assert Knitspeak_Compiler(validate=True).compile(4, 4, "all rs rows k. all ws rows p.").validate() == []
+
+
+if __name__ == "__main__":
+    test_validate()
+    test_validate_new_courses()
@@ -0,0 +1,48 @@
+"""Tests of read-only region views of knit graphs"""
+from typing import List
+
+from debugging_tools.simple_knitgraphs import *
+from knitting_machine.knitgraph_to_knitout import Knitout_Generator
+
+
+def _knitout(knit_graph) -> List[str]:
+    generator = Knitout_Generator(knit_graph)
+    generator.generate_instructions()
+    return generator._instructions
+
+
+def test_full_view():
+    knit_graph = lace(4, 4)
+    view = knit_graph.view()
+    assert [*view.loops] == [*knit_graph.loops]
+    assert view.get_courses() == knit_graph.get_courses()
+    assert view.external_references() == {}
+    assert _knitout(view) == _knitout(knit_graph)
+
+
+def test_region_view():
+    knit_graph = lace(6, 6)
+    view = knit_graph.view(courses=range(1, 4), wales=range(1, 4))
+    assert [*view.loops] == [8, 9, 10, 13, 14, 15, 20, 21, 22]
+    assert 7 not in view and 16 not in view and view[14].loop_id == 14
+    loop_ids_to_course, course_to_loop_ids = view.get_courses()
+    assert loop_ids_to_course[8] == 0 and [*course_to_loop_ids[2]] == [20, 21, 22]
+    # parents outside of the region are reported, not followed
+    assert view.external_references() == {8: [3, 4], 9: [2], 10: [1], 20: [16]}
+    for loop_id in view.loops:
+        parent_ids = [*view.graph.predecessors(loop_id)]
+        assert all(parent_id in view for parent_id in parent_ids)
+        assert sorted(parent_ids + view.external_parent_ids(loop_id)) == sorted(knit_graph.graph.predecessors(loop_id))
+        for parent_id in parent_ids:
+            assert dict(view.graph[parent_id][loop_id]) == dict(knit_graph.graph[parent_id][loop_id])
+    assert all(parent_id in view and child_id in view for parent_id, child_id in view.graph.edges)
+    assert view.graph.number_of_edges() == len([*view.graph.edges])
+    assert [*view.yarns["yarn"]] == [*view.loops]
+    yarn_graph = view.yarns["yarn"].yarn_graph
+    assert [*yarn_graph.successors(10)] == [] and [*yarn_graph.successors(13)] == [14]
+    assert len(_knitout(view)) > 0
+
+
+if __name__ == "__main__":
+    test_full_view()
+    test_region_view()
@@ -1,6 +1,15 @@
+import os
+import shutil
+import tempfile
+
 from debugging_tools.knit_graph_viz import visualize_knitGraph
 
+from knit_graphs.Knit_Graph import Pull_Direction
+from knitspeak_compiler.course_program import COURSE_CHECK, Course_Program, GUARD, GUARD_END, REPEAT, REPEAT_END, \
+    STITCH
 from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+from knitspeak_compiler.knitspeak_interpreter.knitspeak_interpreter import KNITSPEAK_GRAMMAR, load_grammar
+from knitspeak_compiler.knitspeak_interpreter.symbol_table import Symbol_Table
 
 
 def test_stst():
@@ -48,9 +57,63 @@ def test_write_slipped_rib():
     visualize_knitGraph(knit_graph, "slipped_rib.html")
 
 
+def test_shared_grammar():
+    rib_compiler = Knitspeak_Compiler()
+    stst_compiler = Knitspeak_Compiler()
+    assert rib_compiler._parser.parser.table is stst_compiler._parser.parser.table
+    rib = rib_compiler.compile(4, 4, "all rs rows k rib=1, p rib. all ws rows k rib, p rib.")
+    stst = stst_compiler.compile(4, 4, "all rs rows k. all ws rows p.")
+    assert "rib" in rib_compiler._parser.parser.symbolTable and "rib" not in stst_compiler._parser.parser.symbolTable
+    assert rib.statistics().purls[1] == 2 and stst.statistics().purls[1] == 0
+    with tempfile.TemporaryDirectory() as directory:
+        grammar_file = shutil.copy(KNITSPEAK_GRAMMAR, directory)
+        grammar, table = load_grammar(grammar_file)
+        assert load_grammar(grammar_file)[1] is table
+        modified = os.stat(grammar_file).st_mtime_ns + 10 ** 9
+        os.utime(grammar_file, ns=(modified, modified))
+        assert load_grammar(grammar_file)[1] is not table
+        assert os.path.exists(os.path.splitext(grammar_file)[0] + ".pgt")
+
+
+def test_symbol_table():
+    first_table, second_table = Symbol_Table(), Symbol_Table()
+    assert first_table["LC2|1P"] is second_table["lc2|1p"] and first_table["k2tog"] is second_table["K2tog"]
+    assert len(first_table["rc3p|3"]) == 6 and "rc4|1" not in first_table and "k4tog" not in first_table
+    first_table["Rib"] = 2
+    assert first_table["rib"] == 2 and "rib" not in second_table and second_table["current_row"] == 0
+
+
+def test_interned_definitions():
+    table = Symbol_Table()
+    assert table["k"].flipped is table["p"] and table["p"].flipped is table["k"]
+    assert table["k2tog"].flipped is table["sppo"] and table["s2kpo"].flipped.flipped is table["s2kpo"]
+    cable = table["lc2|1p"]
+    assert cable.flipped is table["rc1p|2"] and cable.stitch_definitions() is cable.stitch_definitions()
+    assert [stitch.offset_to_parent_loops for stitch in cable.stitch_definitions()] == [(-2,), (1,), (1,)]
+
+
+def test_course_program():
+    compiler = Knitspeak_Compiler()
+    compiler.compile(8, 4, "all rs rows k, [k2tog, yo] to last st, k. all ws rows p 2, rc1|1 2, p 2.")
+    rs_program = compiler._course_programs[(1, False)]
+    assert [*rs_program.opcodes] == [STITCH, COURSE_CHECK, GUARD, STITCH, STITCH, GUARD_END, COURSE_CHECK,
+                                     STITCH, COURSE_CHECK]
+    assert rs_program.operands[2] == (1, 5) and rs_program.operands[5] == 3
+    ws_program = Course_Program(compiler.course_ids_to_operations[2], wrong_side=True)
+    assert [*ws_program.opcodes] == [REPEAT, STITCH, REPEAT_END, COURSE_CHECK, REPEAT, STITCH, STITCH, REPEAT_END,
+                                     COURSE_CHECK, REPEAT, STITCH, REPEAT_END, COURSE_CHECK]
+    stitches = [operand for opcode, operand in zip(ws_program.opcodes, ws_program.operands) if opcode == STITCH]
+    assert all(stitch.pull_direction is Pull_Direction.BtF for stitch in stitches)
+    assert [stitch.cabling_depth for stitch in stitches] == [0, -1, 1, 0]
+
+
 if __name__ == "__main__":
     test_stst()
     test_rib()
     test_write_slipped_rib()
     test_cable()
     test_lace()
+    test_shared_grammar()
+    test_symbol_table()
+    test_interned_definitions()
+    test_course_program()
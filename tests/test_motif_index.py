@@ -0,0 +1,57 @@
+"""Tests of the index of decreases, cables, and yarn-overs in knit graphs"""
+import os
+import tempfile
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Knit_Graph_File import read_knit_graph, write_knit_graph
+from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+
+
+def _assert_matches_graph(knit_graph: Knit_Graph):
+    for course, loop_ids in knit_graph.get_courses()[1].items():
+        parents = {loop_id: [*knit_graph.graph.predecessors(loop_id)] for loop_id in loop_ids}
+        motifs = knit_graph.course_motifs(course)
+        yarn_overs = [] if course == 0 else [loop_id for loop_id in loop_ids if len(parents[loop_id]) == 0]
+        assert [*motifs.yarn_over_ids] == yarn_overs
+        assert [*motifs.decrease_ids] == [loop_id for loop_id in loop_ids if len(parents[loop_id]) > 1]
+        assert [*motifs.cable_ids] == [loop_id for loop_id in loop_ids if len(parents[loop_id]) == 1
+                                       and knit_graph.graph[parents[loop_id][0]][loop_id]["depth"] != 0]
+
+
+def test_course_motifs():
+    pattern = r"""
+        1st row k, lc2|2, k, rc2|2, [k] to end.
+        all ws rows p.
+        3rd row k, yo, k2tog, yo, sk2po, yo, [k] to end.
+    """
+    knit_graph = Knitspeak_Compiler().compile(12, 4, pattern)
+    for graph in [knit_graph, lace(6, 4), both_twists(height=4), stockinette(4, 4)]:
+        _assert_matches_graph(graph)
+    assert [knit_graph.course_motifs(course).is_plain for course in range(0, 4)] == [True, False, True, False]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cables.knitgraph")
+        write_knit_graph(knit_graph, path)
+        loaded = read_knit_graph(path, memory_map=False)
+        assert [*loaded.course_motifs(1).cable_ids] == [*knit_graph.course_motifs(1).cable_ids]
+        _assert_matches_graph(loaded)
+
+
+def test_edited_motifs():
+    knit_graph = lace(6, 4)
+    fork = knit_graph.fork()
+    decrease = fork.course_motifs(1).decrease_ids[0]
+    fork.replace_parents(decrease, [fork.stitches.parent_ids(decrease)[0]])
+    yarn_over = fork.course_motifs(3).yarn_over_ids[0]
+    fork.remove_loop(yarn_over)
+    _assert_matches_graph(fork)
+    assert decrease not in fork.course_motifs(1).decrease_ids and yarn_over not in fork.motif_index.yarn_over_ids
+    assert decrease in knit_graph.course_motifs(1).decrease_ids
+    fork.compact()
+    _assert_matches_graph(fork)
+    view = knit_graph.view(range(2, 4))
+    assert [*view.course_motifs(1).decrease_ids] == [*knit_graph.course_motifs(3).decrease_ids]
+
+
+if __name__ == "__main__":
+    test_course_motifs()
+    test_edited_motifs()
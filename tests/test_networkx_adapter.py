@@ -0,0 +1,40 @@
+"""Tests of the read-only networkx adapter over knit graphs"""
+import subprocess
+import sys
+
+from debugging_tools.simple_knitgraphs import *
+
+
+def test_networkx_is_imported_on_use():
+    code = "import sys; from debugging_tools.simple_knitgraphs import lace; knit_graph = lace(4, 4); " \
+           "assert 'networkx' not in sys.modules; knit_graph.as_networkx(); assert 'networkx' in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_networkx_algorithms():
+    import networkx
+    knit_graph = lace(6, 6)
+    graph = knit_graph.as_networkx()
+    assert isinstance(graph, networkx.DiGraph) and networkx.is_directed_acyclic_graph(graph)
+    assert graph.number_of_nodes() == 36 and graph.number_of_edges() == knit_graph.graph.number_of_edges()
+    assert [*graph.predecessors(8)] == [3, 4] and graph.in_degree(8) == 2
+    assert dict(graph[3][8]) == dict(knit_graph.graph[3][8]) and graph.pred[8][4]["parent_offset"] == knit_graph.graph[4][8]["parent_offset"]
+    assert networkx.shortest_path(graph, 5, 30) == [5, 6, 17, 18, 29, 30]
+    assert networkx.is_isomorphic(graph.copy(), graph)
+    assert sorted(graph.subgraph(range(6, 20)).edges()) == sorted(edge for edge in knit_graph.graph.edges
+                                                                 if 6 <= edge[0] < 20 and 6 <= edge[1] < 20)
+    region = knit_graph.view(range(1, 4), range(1, 4)).as_networkx()
+    assert sorted(region.edges()) == [(8, 15), (9, 14), (10, 13), (13, 22), (14, 21), (15, 20)]
+    # the adapter reads the storage on demand and cannot be modified
+    knit_graph.add_course([*reversed(range(30, 36))])
+    assert graph.number_of_nodes() == 42
+    try:
+        graph.add_edge(0, 1)
+        assert False, "The adapter should be frozen"
+    except networkx.NetworkXError:
+        pass
+
+
+if __name__ == "__main__":
+    test_networkx_is_imported_on_use()
+    test_networkx_algorithms()
@@ -0,0 +1,32 @@
+"""Tests of knit graphs published in shared memory"""
+import multiprocessing
+from typing import Tuple
+
+from debugging_tools.simple_knitgraphs import *
+from knit_graphs.Shared_Knit_Graph import Shared_Knit_Graph
+
+
+def _worker_summary(shared: Shared_Knit_Graph) -> Tuple[str, int, bool]:
+    knit_graph = shared.knit_graph
+    summary = knit_graph.structural_hash.hexdigest(), len(knit_graph.loops), \
+        isinstance(knit_graph.stitches.edge_parents, memoryview)
+    shared.close()
+    return summary
+
+
+def test_publish_and_attach():
+    knit_graph = lace(6, 6)
+    with Shared_Knit_Graph.publish(knit_graph) as shared:
+        attached = Shared_Knit_Graph.attach(shared.name)
+        assert attached.knit_graph.structural_hash.hexdigest() == knit_graph.structural_hash.hexdigest()
+        # changes copy the shared columns into the process, the block is unchanged
+        attached.knit_graph[0].is_twisted = True
+        assert not shared.knit_graph[0].is_twisted
+        attached.close()
+        with multiprocessing.Pool(2) as pool:
+            summaries = pool.map(_worker_summary, [shared, shared])
+    assert summaries == [(knit_graph.structural_hash.hexdigest(), 36, True)] * 2
+
+
+if __name__ == "__main__":
+    test_publish_and_attach()
@@ -22,9 +22,30 @@ def test_twisted_stripes():
 def test_lace():
     visualize_knitGraph(lace(4, 4))
 
+
+def test_swatch_structure():
+    # structural hashes of the swatches made by the builders that added one loop and stitch at a time
+    stitch_at_a_time_hashes = {
+        (stockinette, (5, 4)): "21e272894f893dfea7242b7e561cdef4f97ede0db807fecfc66fe4487a76ac63",
+        (rib, (5, 4, 1)): "259c909f0546a6c2059c5e91aa339c38ef11da68778ed5b239797e26d483d664",
+        (rib, (8, 5, 2)): "cdffa79c28075fdce3bc41f6e1cda6c7a0e892943434bd259fa970d2e3724d9f",
+        (seed, (4, 4)): "9b1be524937912495bc63b46b2ecde70afb389242942b5f2b3312a0e34f24542",
+        (seed, (5, 5)): "77e8e09b7d5f6b7cef5e81129df0530ab0480c550920ffc35fa3c9edd2a75ff1",
+        (twisted_stripes, (4, 5)): "2917ecff1010c12e4579443a60d35be8d06a450fb9a9bddb4b51a6d76502a55c",
+        (twisted_stripes, (8, 5, False)): "8488dfeaa6488cb7e682f7b7cf8be319c6eea3b631b37e1566f71a07c45d3021",
+        (lace, (4, 4)): "42071fce861f6d65b4ca7f9a7547d36084e8a882ec3e2f7bb9e53fb481fca7bf",
+        (lace, (8, 6)): "f315e60ccb1de4cd51883cc5f313faa32aa1fc1b0cd0ca5e8ba20abe2b2d704d",
+        (both_twists, (6,)): "0c5ecc97c4819463194a2b9841075e2fdcd17bf037fb66c955e12077fe728839",
+    }
+    for (builder, arguments), expected_hash in stitch_at_a_time_hashes.items():
+        assert builder(*arguments).structural_hash.hexdigest() == expected_hash, f"{builder.__name__}{arguments}"
+    assert len(stockinette(200, 200).loops) == 40000
+
+
 if __name__ == "__main__":
     test_stockinette()
     test_rib()
     test_seed()
     test_twisted_stripes()
     test_lace()
+    test_swatch_structure()
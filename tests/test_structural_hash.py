@@ -0,0 +1,31 @@
+"""Tests of the canonical structural hash of knit graphs"""
+from debugging_tools.simple_knitgraphs import *
+from knitspeak_compiler.knitspeak_compiler import Knitspeak_Compiler
+
+
+def test_same_fabric():
+    compiled = Knitspeak_Compiler().compile(4, 3, "all rs rows k. all ws rows p.")
+    assert compiled.structural_hash.hexdigest() == stockinette(4, 4).structural_hash.hexdigest()
+    hashes = {knit_graph.structural_hash.hexdigest()
+              for knit_graph in [stockinette(4, 4), stockinette(4, 5), rib(4, 4), seed(4, 4), lace(4, 4)]}
+    assert len(hashes) == 5
+
+
+def test_incremental_hash():
+    knit_graph = stockinette(4, 3)
+    knit_graph.structural_hash.hexdigest()
+    knit_graph.add_course([*reversed(range(8, 12))])
+    assert knit_graph.structural_hash.hexdigest() == stockinette(4, 4).structural_hash.hexdigest()
+    # changes to hashed loops restart the hash, forks keep their own
+    fork = knit_graph.fork()
+    fork[3].is_twisted = True
+    assert fork.structural_hash.hexdigest() != knit_graph.structural_hash.hexdigest()
+    fork[3].is_twisted = False
+    assert fork.structural_hash.hexdigest() == knit_graph.structural_hash.hexdigest()
+    fork.connect_loops(5, 9)
+    assert fork.structural_hash.hexdigest() != knit_graph.structural_hash.hexdigest()
+
+
+if __name__ == "__main__":
+    test_same_fabric()
+    test_incremental_hash()